@@ -1,13 +1,21 @@
 import os
+import json
+import time
+import uuid
+import asyncio
 import getpass
+import argparse
 import logging
-from typing import TypedDict, Optional, Dict
-from prompts import greet_prompt_template, resume_parser_prompt, tech_questions, Evaluator_prompt
-from langchain_groq import ChatGroq
-from langchain_core.prompts import PromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
-from langchain_community.document_loaders import PyMuPDFLoader
-from langgraph.graph import StateGraph, END
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from app.prompts import sendoff_node_prompt
+from app.resume_text import extract_resume_text
+from app.llm import LLM_BACKEND
+from app.llm_scheduler import Priority
+from app.chains import ChainRegistry
+from app.cache import content_hash
+from app.engine import HiringEngine, EngineState, chain_steps, open_engine, start_input, resume_input, answers_input
 
 logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
@@ -22,186 +30,214 @@ try:
 except ImportError:
     logger.warning("dotenv package not found. Skipping .env file load.")
 
+# Checkpoints of CLI sessions; pass --thread to pick an interrupted one back up
+ENGINE_DB = os.getenv("HIREBOT_CLI_ENGINE_DB", "data/cli_engine.sqlite3")
 
-if "GROQ_API_KEY" not in os.environ or not os.getenv("GROQ_API_KEY"):
-    os.environ["GROQ_API_KEY"] = getpass.getpass("Enter your Groq API key: ")
 
+def ensure_api_key() -> None:
+    """Ask for the Groq API key if it is not set (not needed by the fake backend)."""
+    if LLM_BACKEND != "fake" and not os.getenv("GROQ_API_KEY"):
+        os.environ["GROQ_API_KEY"] = getpass.getpass("Enter your Groq API key: ")
 
-try:
-    llm = ChatGroq(
-        model="llama-3.3-70b-versatile",
-        temperature=0.2,
-    )
-    logger.info("LLM loaded successfully")
-except Exception as e:
-    logger.error(f"Failed to load LLM: {e}")
-    raise
-
-# --- State Definition ---
-class Hirebot(TypedDict):
-    """Defines the state for the graph."""
-    user_name: Optional[str]
-    resume_path: Optional[str]
-    resume_parsed: Optional[str]
-    tech_questions: Optional[Dict[str, str]]
-    answers: Optional[Dict[str, str]]
-    results: Optional[str]
-
-# --- Node Functions ---
-def get_name(state: Hirebot) -> dict:
-    """Gets user's name from input and updates the state."""
-    logger.info('Node: get_name execution started')
+
+# --- Prompts (the graph nodes never read stdin) ---
+def ask_name() -> str:
     user_name = ''
     while not user_name:
-        user_name = input("Hi there! To get started, please enter your full name: ")
+        user_name = input("Hi there! To get started, please enter your full name: ").strip()
         if not user_name:
             print("Name cannot be empty. Please try again.")
-    logger.info(f'Node: Name captured: {user_name}')
-    return {"user_name": user_name}
+    logger.info(f'Name captured: {user_name}')
+    return user_name
 
-def greet_user(state: Hirebot) -> dict:
-    """Generates a greeting for the user and updates the state."""
-    logger.info('Node: greet_user execution started')
-    candidate_name = state["user_name"]
-    
-    prompt = PromptTemplate(
-        template=greet_prompt_template,
-        input_variables=["candidate_name", "agent_name", "hr_manager_name"],
-    )
-    
-    greeting = prompt.format(candidate_name=candidate_name, agent_name="Janus", hr_manager_name="Radhika")
-    print(greeting)
-    
+def ask_resume_path() -> str:
     while True:
-        path = input("Enter the path of you resume (PDF file): ")
+        path = input("Enter the path of you resume (PDF file): ").strip()
         if os.path.exists(path) and path.lower().endswith(".pdf"):
             logger.info(f" Resume path recieved and validated: {path}")
-            return {"resume_path": path}
-        else:
-            print("Invalid Path or not a PDF file. Please check the file path and try again.")
+            return path
+        print("Invalid Path or not a PDF file. Please check the file path and try again.")
 
 def resume_loader(path_to_resume):
     """Helper function to load and extract text from a PDF resume."""
-    loader = PyMuPDFLoader(path_to_resume)
-    documents = loader.load()
+    text = extract_resume_text(path_to_resume)
     logger.info(f"Sucessfully loaded {path_to_resume}")
-    return documents[0].page_content
-
-
-def Parse_resume(state: Hirebot) -> dict:
-    logger.info('Node: Make Question started')
-    resume_path = state["resume_path"]
-    data = resume_loader(resume_path)
-    parser = JsonOutputParser()
-    prompt = PromptTemplate(
-        template=(resume_parser_prompt),
-        input_variables=["RESUME"],
-        partial_variables={"format_instructions": parser.get_format_instructions()},
-
-    )
-
-    chain = prompt | llm | parser
-    logger.info("Invoking resume parsing chain...")
-    parsed_resume = chain.invoke({"RESUME": data})
-    logger.info("Resume parsed successfully.")
-    print("\n✅ Thanks! I've reviewed your resume. Now for a few technical questions.")
-    return {"resume_parsed": parsed_resume}
-
-def Tech_question(state: Hirebot) -> dict:
-    """Generates clarifying questions based on the initial query using an LLM."""
-    # logger.info("Node: make_question execution started.")
-    resume_data = state["resume_parsed"]
-    questions = {}
-    num = 3 # Number of questions to generate
-    parser = JsonOutputParser()
-    # Corrected Example Output to be valid JSON
-    prompt = PromptTemplate(
-        template=(tech_questions),
-        input_variables=["num", "tech_stack"],
-        partial_variables={"format_instructions": parser.get_format_instructions()},
-    )
-
-    chain = prompt | llm | parser
-    logger.info("Invoking tech question generation chain...")
-    questions = chain.invoke({"num": num, "tech_stack": resume_data})
-    return {"tech_questions": questions}
-
-def answers(state: Hirebot) -> dict:
-
-    questions = state["tech_questions"]
-    if questions is not None:
-        answers = {}
-        for key, question_text in questions.items():
-            answer = input(f"❓ {question_text}\n> ")
-            answers[question_text] = answer
-        print(answers)
-        return {"answers": answers}
-    else:
-        return {"answers": None}
-
-def Get_results(state: Hirebot) -> dict:
-    """Generates clarifying questions based on the initial query using an LLM."""
-    answers = state["answers"]
-    prompt = PromptTemplate(
-        template=(Evaluator_prompt),
-        input_variables=["qa"],
-    )
-
-    chain = prompt | llm 
-
-    results_message = chain.invoke({"qa": answers})
-    return {"results": results_message.content}
-
-def sendoff_node(state: Hirebot) -> None:
-    candidate_name = state["user_name"]
-    evaluation = state["results"]
+    return text
 
+def ask_answers(questions: Dict[str, str]) -> Dict[str, str]:
+    answers = {}
+    for key, question_text in questions.items():
+        answers[key] = input(f"❓ {question_text}\n> ")
+    return answers
+
+def sendoff(state: EngineState) -> None:
     print("\n" + "="*50)
     print("Evaluation Complete")
     print("="*50)
     print(f"\nHere is a summary of your technical screening:\n")
-    print(evaluation)
-    
-    message = f"""
-    Thank you for completing the initial steps of the hiring process, {candidate_name}. 🙌
-    Our team will carefully evaluate your responses and resume.
-    You will be notified via email or message if you are selected for the next round.
-    We appreciate your patience and interest in this opportunity!
+    print(state["results"])
+    print(sendoff_node_prompt.format(candidate_name=state["user_name"]))
+
+
+async def interview(engine: HiringEngine, thread_id: str) -> None:
+    """Drive one candidate through the graph, asking only for what the thread does not have yet."""
+    # Finishes a run the previous attempt was interrupted in
+    state = await engine.run(thread_id)
+    if not state.get("greeting"):
+        state = await engine.run(thread_id, start_input(ask_name()))
+        print(state["greeting"])
+    if not state.get("resume_parsed"):
+        text = await asyncio.to_thread(resume_loader, ask_resume_path())
+        logger.info("Parsing resume and generating questions...")
+        state = await engine.run(thread_id, resume_input(resume_text=text))
+        print("\n✅ Thanks! I've reviewed your resume. Now for a few technical questions.")
+    if not state.get("tech_questions"):
+        state = await engine.run(thread_id, {})
+    if state.get("results") is None:
+        state = await engine.run(thread_id, answers_input(ask_answers(state["tech_questions"])))
+    sendoff(state)
+
+
+async def run_interactive(thread_id: str) -> None:
+    ensure_api_key()
+    chains = ChainRegistry()
+    async with open_engine(chain_steps(chains), ENGINE_DB) as engine:
+        await interview(engine, thread_id)
+
+
+# --- Headless batch mode ---
+def find_resumes(directory: str) -> List[Path]:
+    return sorted(p for p in Path(directory).rglob("*") if p.is_file() and p.suffix.lower() == ".pdf")
+
+def load_answers(path: Optional[str]) -> Dict[str, Dict[str, Any]]:
+    """Pre-collected answers, one JSON object per line: {"file", "answers"[, "questions"]}."""
+    records = {}
+    if path:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    records[record["file"]] = record
+    return records
+
+def finished_keys(output: str) -> Set[str]:
+    """Keys of files already screened successfully in an earlier run's output."""
+    keys = set()
+    if os.path.exists(output):
+        with open(output, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # torn last line of an interrupted run
+                if record.get("status") == "ok":
+                    keys.add(record["key"])
+    return keys
+
+async def screen_resume(engine: HiringEngine, thread_id: str, path: Path,
+                        answers: Optional[Dict[str, Any]]) -> EngineState:
+    """Parse, question and (given answers) evaluate one resume, reusing whatever its thread already has."""
+    state = await engine.run(thread_id)
+    if not state.get("resume_parsed"):
+        text = await asyncio.to_thread(resume_loader, str(path))
+        state = await engine.run(thread_id, resume_input(resume_text=text))
+    elif not state.get("tech_questions") or not state.get("profile"):
+        state = await engine.run(thread_id, {})
+    if answers is not None and (state.get("results") is None or state.get("answers") != answers["answers"]):
+        state = await engine.run(
+            thread_id, answers_input(answers["answers"], tech_questions=answers.get("questions"))
+        )
+    return state
+
+async def run_batch(directory: str, output: str, answers_path: Optional[str], concurrency: int) -> int:
     """
+    Screen every PDF under `directory`, up to `concurrency` at once, appending one
+    JSON line per resume to `output` as it finishes. Each file has its own
+    checkpointed thread, so a rerun skips files already in `output` and resumes
+    interrupted ones without repeating finished stages. Returns the number of failures.
+    """
+    if LLM_BACKEND != "fake" and not os.getenv("GROQ_API_KEY"):
+        raise SystemExit("GROQ_API_KEY must be set for --batch")
+    files = find_resumes(directory)
+    answers = load_answers(answers_path)
+    done = finished_keys(output)
+    
+    jobs = []
+    for path in files:
+        name = path.relative_to(directory).as_posix()
+        thread_id = "batch:" + content_hash(name, path.read_bytes())[:32]
+        record = answers.get(name)
+        key = thread_id + (":" + content_hash(json.dumps(record["answers"], sort_keys=True))[:16] if record else "")
+        if key not in done:
+            jobs.append((name, path, thread_id, key, record))
+    logger.info(f"Batch: {len(files)} resumes, {len(files) - len(jobs)} already screened, {len(jobs)} to go")
+    
+    chains = ChainRegistry()
+    slots = asyncio.Semaphore(concurrency)
+    processed = failed = 0
+    start = time.perf_counter()
+    
+    def rate() -> float:
+        elapsed = time.perf_counter() - start
+        return (processed - failed) * 60 / elapsed if elapsed else 0.0
+    
+    async with open_engine(chain_steps(chains, priority=Priority.BATCH), ENGINE_DB) as engine:
+        async def screen(name: str, path: Path, thread_id: str, key: str, record: Optional[Dict]) -> Dict[str, Any]:
+            async with slots:
+                began = time.perf_counter()
+                result = {"file": name, "key": key, "thread_id": thread_id}
+                try:
+                    state = await screen_resume(engine, thread_id, path, record)
+                    profile = state.get("profile") or {}
+                    result.update(
+                        status="ok", name=profile.get("name"), profile=profile, resume=state["resume_parsed"],
+                        questions=state["tech_questions"], evaluation=state.get("results") if record else None,
+                        scores=state.get("scores") if record else None,
+                    )
+                except Exception as e:
+                    logger.error(f"Batch: failed to screen {name}: {e}")
+                    result.update(status="error", error=f"{type(e).__name__}: {e}")
+                result["seconds"] = round(time.perf_counter() - began, 2)
+                return result
+        
+        with open(output, "a", encoding="utf-8") as out:
+            for next_done in asyncio.as_completed([screen(*job) for job in jobs]):
+                result = await next_done
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                out.flush()
+                processed += 1
+                failed += result["status"] != "ok"
+                if processed % 10 == 0 or processed == len(jobs):
+                    logger.info(f"Batch: {processed}/{len(jobs)} screened, {failed} failed, {rate():.1f} resumes/min")
+    
+    elapsed = time.perf_counter() - start
+    print(f"Screened {processed - failed}/{len(jobs)} resumes ({failed} failed, "
+          f"{len(files) - len(jobs)} skipped) in {elapsed:.1f}s -> {rate():.1f} resumes/min; results in {output}")
+    return failed
 
-    print(message)
-
-graph_builder = StateGraph(Hirebot)
-
-# Add nodes
-graph_builder.add_node("get_name", get_name)
-graph_builder.add_node("greet", greet_user)
-graph_builder.add_node("parse_resume", Parse_resume)
-graph_builder.add_node("tech_questions", Tech_question)
-graph_builder.add_node("answers", answers)
-graph_builder.add_node("results", Get_results)
-graph_builder.add_node("sendoff", sendoff_node)
-
-# Set the entry point
-graph_builder.set_entry_point("get_name")
-
-# Add edges to define the flow
-graph_builder.add_edge("get_name", "greet")
-graph_builder.add_edge("greet", "parse_resume")
-graph_builder.add_edge("parse_resume", "tech_questions")
-graph_builder.add_edge("tech_questions", "answers")
-graph_builder.add_edge("answers", "results")
-graph_builder.add_edge("results", "sendoff")
-graph_builder.add_edge("sendoff", END)
-
-# Compile the graph
-hirebot_graph = graph_builder.compile()
-logger.info("Hirebot graph compiled successfully.")
 
 # --- Graph Execution ---
-if __name__ == "__main__":
+def main():
+    parser = argparse.ArgumentParser(description="Hirebot screening agent (CLI).")
+    parser.add_argument("--thread", help="Continue an interrupted session by its thread id")
+    parser.add_argument("--batch", metavar="DIR", help="Headless: screen every PDF resume under DIR")
+    parser.add_argument("--answers", metavar="JSONL",
+                        help='--batch: pre-collected answers, lines of {"file", "answers"[, "questions"]}')
+    parser.add_argument("--output", default="batch_results.jsonl", help="--batch: JSONL results (appended)")
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("HIREBOT_BATCH_LLM_CONCURRENCY", "8")),
+                        help="--batch: resumes in flight at once")
+    args = parser.parse_args()
+
+    if args.batch:
+        failed = asyncio.run(run_batch(args.batch, args.output, args.answers, args.concurrency))
+        raise SystemExit(1 if failed else 0)
+
+    thread_id = args.thread or str(uuid.uuid4())
     print("🚀 Starting Hirebot Agent...")
-    initial_state = {}
-    # Invoke the graph. The initial state is empty.
-    hirebot_graph.invoke(initial_state)
+    print(f"(session id {thread_id}; rerun with --thread {thread_id} if interrupted)")
+    asyncio.run(run_interactive(thread_id))
     print("✅ Hirebot session finished.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+import io
+import os
+import json
+import time
+import uuid
+import asyncio
+import logging
+import sqlite3
+import zipfile
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.resume_text import extract_resume_text
+from app.metrics import pdf_extract_seconds, stage_errors_total, upload_bytes
+
+logger = logging.getLogger(__name__)
+
+# (filename, pdf bytes)
+ResumeFile = Tuple[str, bytes]
+# Called once per extracted resume; returns the created session id
+ResumeHandler = Callable[[str, bytes, str], Awaitable[str]]
+
+# Minimum seconds between progress writes of a running job to the store
+PROGRESS_SAVE_INTERVAL = 1.0
+
+
+class BatchLimitError(ValueError):
+    """An upload exceeds the batch file-count or size limits."""
+
+
+def pdfs_from_zip(content: bytes, max_files: int, max_file_bytes: int, max_total_bytes: int) -> List[ResumeFile]:
+    """
+    Return the PDF members of a zip archive, skipping directories and macOS metadata.
+
+    Member count and uncompressed sizes are checked from the central directory
+    before anything is decompressed; a member never decompresses past its
+    declared size, so the limits also hold for archives that lie about it.
+    """
+    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+        members = []
+        total = 0
+        for info in archive.infolist():
+            name = os.path.basename(info.filename)
+            if info.is_dir() or name.startswith("._") or "__MACOSX" in info.filename:
+                continue
+            if not name.lower().endswith(".pdf"):
+                continue
+            if info.file_size > max_file_bytes:
+                raise BatchLimitError(f"{name} exceeds the {max_file_bytes // 1024} KB per-resume limit")
+            total += info.file_size
+            members.append((name, info))
+        if len(members) > max_files:
+            raise BatchLimitError(f"At most {max_files} more resumes allowed in this batch")
+        if total > max_total_bytes:
+            raise BatchLimitError(f"Archive expands past the {max_total_bytes // 1024} KB batch limit")
+        return [(name, archive.read(info)) for name, info in members]
+
+
+class BatchJob:
+    """Progress of one bulk ingestion run."""
+
+    def __init__(self, total: int):
+        self.job_id = str(uuid.uuid4())
+        self.status = "queued"
+        self.total = total
+        self.extracted = 0
+        self.parsed = 0
+        self.failed = 0
+        self.sessions: List[Dict[str, str]] = []
+        self.errors: List[Dict[str, str]] = []
+        self.created_at = datetime.now().isoformat()
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+        self._saved = 0.0
+
+    @property
+    def elapsed_seconds(self) -> float:
+        if self._started is None:
+            return 0.0
+        return (self._finished or time.perf_counter()) - self._started
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = self.elapsed_seconds
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "total": self.total,
+            "extracted": self.extracted,
+            "parsed": self.parsed,
+            "failed": self.failed,
+            "elapsed_seconds": round(elapsed, 2),
+            "resumes_per_minute": round(self.parsed * 60 / elapsed, 2) if elapsed else 0.0,
+            # Copies: snapshots are serialized off the event loop while the job runs
+            "sessions": list(self.sessions),
+            "errors": list(self.errors),
+            "created_at": self.created_at,
+        }
+
+
+class BatchJobStore:
+    """
+    Batch job progress in a SQLite database (WAL mode), so every API worker
+    process can report on a job, not only the one running it.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        # Created on first use, like the job queue sharing its database
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if not self._schema_ready:
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            with self._schema_lock:
+                if not self._schema_ready:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS batch_jobs ("
+                        " job_id TEXT PRIMARY KEY, data TEXT NOT NULL, status TEXT NOT NULL,"
+                        " updated_at REAL NOT NULL)"
+                    )
+                    self._schema_ready = True
+            self._local.conn = conn
+        return conn
+
+    def save(self, job: Dict[str, Any]) -> None:
+        self._connection().execute(
+            "INSERT OR REPLACE INTO batch_jobs (job_id, data, status, updated_at) VALUES (?, ?, ?, ?)",
+            (job["job_id"], json.dumps(job), job["status"], time.time()),
+        )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute("SELECT data FROM batch_jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def purge(self, older_than: float) -> int:
+        """Delete finished jobs last updated more than `older_than` seconds ago."""
+        cursor = self._connection().execute(
+            "DELETE FROM batch_jobs WHERE status != 'running' AND updated_at < ?", (time.time() - older_than,)
+        )
+        return cursor.rowcount
+
+
+class BatchIngestor:
+    """
+    Two-stage pipeline for bulk resume ingestion.
+
+    PDF text extraction runs in a process pool and feeds a bounded queue;
+    `concurrency` async workers drain it and call the handler (cache lookup,
+    LLM parse, session creation). Extraction of later files overlaps with the
+    LLM calls of earlier ones. Finished jobs are kept for `retention` seconds.
+
+    With a `store`, job progress is saved as it advances and finished jobs are
+    read back from it, so `get` works in any process sharing the database.
+    """
+
+    def __init__(self, handler: ResumeHandler, process_workers: int = 0, concurrency: int = 8,
+                 retention: float = 24 * 60 * 60, store: Optional[BatchJobStore] = None):
+        self.handler = handler
+        self.process_workers = process_workers or min(4, os.cpu_count() or 1)
+        self.concurrency = concurrency
+        self.retention = retention
+        self.store = store
+        self.jobs: Dict[str, BatchJob] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # Forking a multithreaded server process is unsafe; spawn fresh interpreters
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.process_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    def _prune(self) -> None:
+        """Forget jobs that finished more than `retention` seconds ago."""
+        now = time.perf_counter()
+        # Snapshot: also called from request threads
+        expired = [job_id for job_id, job in list(self.jobs.items())
+                   if job._finished is not None and now - job._finished > self.retention]
+        for job_id in expired:
+            self.jobs.pop(job_id, None)
+
+    def _save(self, job: BatchJob) -> None:
+        if self.store is not None:
+            job._saved = time.perf_counter()
+            self.store.save(job.to_dict())
+
+    async def _save_progress(self, job: BatchJob) -> None:
+        if self.store is not None and time.perf_counter() - job._saved >= PROGRESS_SAVE_INTERVAL:
+            job._saved = time.perf_counter()
+            await asyncio.to_thread(self.store.save, job.to_dict())
+
+    async def submit(self, files: List[ResumeFile]) -> BatchJob:
+        """Register a job and start processing it in the background."""
+        self._prune()
+        if self.store is not None:
+            await asyncio.to_thread(self.store.purge, self.retention)
+        job = BatchJob(total=len(files))
+        self.jobs[job.job_id] = job
+        await asyncio.to_thread(self._save, job)
+        task = asyncio.create_task(self._run(job, files))
+        self._tasks[job.job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.job_id, None))
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Status of a job run by this process, or (with a store) by any process."""
+        self._prune()
+        job = self.jobs.get(job_id)
+        if job is not None:
+            return job.to_dict()
+        return self.store.get(job_id) if self.store is not None else None
+
+    async def _extract(self, filename: str, content: bytes) -> Tuple[str, bytes, Optional[str], Optional[str]]:
+        """Extract text in the process pool; returns (filename, content, text, error)."""
+        loop = asyncio.get_running_loop()
+        upload_bytes.observe(len(content), kind="batch")
+        try:
+            with pdf_extract_seconds.time():
+                text = await loop.run_in_executor(self._executor(), extract_resume_text, content)
+            return filename, content, text, None
+        except Exception as e:
+            stage_errors_total.inc(stage="extract")
+            return filename, content, None, f"Extraction failed: {e}"
+
+    async def _run(self, job: BatchJob, files: List[ResumeFile]) -> None:
+        job.status = "running"
+        job._started = time.perf_counter()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+
+        async def produce():
+            pending = [self._extract(name, content) for name, content in files]
+            for future in asyncio.as_completed(pending):
+                filename, content, text, error = await future
+                if error:
+                    job.failed += 1
+                    job.errors.append({"filename": filename, "error": error})
+                    await self._save_progress(job)
+                    continue
+                job.extracted += 1
+                await queue.put((filename, content, text))
+            for _ in range(self.concurrency):
+                await queue.put(None)
+
+        async def consume():
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                filename, content, text = item
+                try:
+                    session_id = await self.handler(filename, content, text)
+                    job.parsed += 1
+                    job.sessions.append({"filename": filename, "session_id": session_id})
+                except Exception as e:
+                    job.failed += 1
+                    job.errors.append({"filename": filename, "error": str(e)})
+                    logger.error(f"Batch {job.job_id}: failed to ingest {filename}: {e}")
+                await self._save_progress(job)
+
+        try:
+            await asyncio.gather(produce(), *(consume() for _ in range(self.concurrency)))
+            job.status = "completed"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            raise
+        except Exception as e:
+            job.status = "failed"
+            logger.error(f"Batch {job.job_id} failed: {e}")
+        finally:
+            job._finished = time.perf_counter()
+            if job.status == "cancelled":
+                # Shutting down: the loop may not see a thread hand-off through
+                self._save(job)
+            else:
+                await asyncio.to_thread(self._save, job)
+            if self.store is not None:
+                # Served from the store from now on
+                self.jobs.pop(job.job_id, None)
+            stats = job.to_dict()
+            logger.info(
+                f"Batch {job.job_id}: {job.parsed}/{job.total} parsed, {job.failed} failed, "
+                f"{stats['resumes_per_minute']} resumes/min"
+            )
+
+    def shutdown(self) -> None:
+        for task in self._tasks.values():
+            task.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
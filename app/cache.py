@@ -0,0 +1,198 @@
+import json
+import time
+import sqlite3
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(*parts: Any) -> str:
+    """Stable SHA-256 hex digest over bytes/str parts."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        digest.update(part)
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class TieredCache:
+    """
+    Two-tier cache for JSON-serializable values.
+
+    Tier 1 is an in-process LRU bounded by item count. Tier 2 is an optional
+    SQLite table bounded by total payload bytes; least recently accessed rows
+    are evicted first. Disk hits are promoted back into memory. The tier's
+    size is tracked as a running total, re-read from the table every
+    `RESYNC_WRITES` writes to pick up rows written by other processes.
+    """
+
+    RESYNC_WRITES = 256
+
+    def __init__(self, name: str, memory_items: int = 256,
+                 db_path: Optional[str] = None, max_disk_bytes: int = 50 * 1024 * 1024):
+        self.name = name
+        self.memory_items = memory_items
+        self.max_disk_bytes = max_disk_bytes
+        # The disk tier is opened on first use, so constructing the cache touches no files
+        self.db_path = db_path
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disk_bytes = 0
+        self._writes_since_sync = 0
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        """The disk tier's connection, opened on first use; callers hold `_lock`."""
+        if self._conn is None:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+                " size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_cache_last_access ON cache_entries(last_access)"
+            )
+            conn.commit()
+            self._conn = conn
+            self._disk_bytes = self._disk_total()
+            logger.info(f"Cache '{self.name}' using on-disk tier at {self.db_path}")
+        return self._conn
+
+    # --- Memory tier ---
+    def _memory_get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+        return None
+
+    def _memory_set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+    # --- Disk tier ---
+    def _disk_get(self, key: str) -> Optional[Any]:
+        if not self.db_path:
+            return None
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT value FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE cache_entries SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def _disk_set(self, key: str, value: Any) -> None:
+        if not self.db_path:
+            return
+        payload = json.dumps(value)
+        size = len(payload.encode("utf-8"))
+        if size > self.max_disk_bytes:
+            return
+        with self._lock:
+            replaced = self._connection().execute(
+                "SELECT size FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, payload, size, time.time()),
+            )
+            self._writes_since_sync += 1
+            if self._writes_since_sync >= self.RESYNC_WRITES:
+                self._disk_bytes = self._disk_total()
+            else:
+                self._disk_bytes += size - (replaced[0] if replaced else 0)
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _disk_total(self) -> int:
+        """Payload bytes in the table (full scan; resets the write counter)."""
+        self._writes_since_sync = 0
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+
+    def _evict(self) -> None:
+        """Drop least recently accessed rows until the tier fits its byte budget."""
+        rows = self._conn.execute(
+            "SELECT key, size FROM cache_entries ORDER BY last_access ASC"
+        )
+        evicted = []
+        for key, size in rows:
+            if self._disk_bytes <= self.max_disk_bytes:
+                break
+            evicted.append((key,))
+            self._disk_bytes -= size
+        rows.close()
+        self._conn.executemany("DELETE FROM cache_entries WHERE key = ?", evicted)
+        logger.info(f"Cache '{self.name}' evicted {len(evicted)} entries from disk")
+
+    # --- Public API ---
+    def get(self, key: str) -> Optional[Any]:
+        value = self._memory_get(key)
+        if value is not None:
+            self.hits_memory += 1
+            return value
+        value = self._disk_get(key)
+        if value is not None:
+            self.hits_disk += 1
+            self._memory_set(key, value)
+            return value
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        self._memory_set(key, value)
+        self._disk_set(key, value)
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """Async lookup; only the disk tier is pushed off the event loop."""
+        value = self._memory_get(key)
+        if value is not None:
+            self.hits_memory += 1
+            return value
+        if not self.db_path:
+            self.misses += 1
+            return None
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: Any) -> None:
+        self._memory_set(key, value)
+        if self.db_path:
+            await asyncio.to_thread(self._disk_set, key, value)
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.hits_memory + self.hits_disk
+        lookups = hits + self.misses
+        stats = {
+            "hits_memory": self.hits_memory,
+            "hits_disk": self.hits_disk,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+        }
+        if self.db_path:
+            with self._lock:
+                count = self._connection().execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+            stats.update({"disk_entries": count, "disk_bytes": self._disk_bytes})
+        return stats
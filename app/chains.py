@@ -0,0 +1,225 @@
+import os
+import time
+import logging
+import threading
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Deque, Dict, NamedTuple, Optional
+
+from langchain_core.prompts import PromptTemplate
+from langchain_core.output_parsers import JsonOutputParser, StrOutputParser
+
+from app.prompts import (
+    greet_prompt_template, resume_parser_prompt, resume_parser_with_questions_prompt,
+    tech_questions, question_evaluator_prompt,
+)
+from app.llm import build_llm, run_chain, stream_chain, settle_tokens, LLM_MODEL, LLM_TEMPERATURE
+from app.llm_scheduler import Priority
+from app.resume_text import CHARS_PER_TOKEN
+from app.token_usage import TokenLedger, TokenUsageCallback
+from app.metrics import llm_stage_seconds, stage_errors_total
+
+logger = logging.getLogger(__name__)
+
+# "fused" = parse + questions in one call (the graph's parse step with HIREBOT_FUSED_PARSE=1)
+LLM_STAGES = ("parse", "questions", "fused", "evaluation")
+STAGES = LLM_STAGES + ("greeting",)
+
+# Typical completion size per stage, reserved against the tokens/min limit
+EXPECTED_COMPLETION_TOKENS = {"parse": 600, "questions": 150, "fused": 800, "evaluation": 80}
+
+
+class StageConfig(NamedTuple):
+    model: str
+    temperature: float
+
+
+def stage_config(stage: str) -> StageConfig:
+    """
+    Model routing for a stage, e.g. HIREBOT_MODEL_PARSE=llama-3.1-8b-instant.
+    Unset stages fall back to HIREBOT_LLM_MODEL / HIREBOT_LLM_TEMPERATURE.
+    """
+    key = stage.upper()
+    return StageConfig(
+        model=os.getenv(f"HIREBOT_MODEL_{key}", LLM_MODEL),
+        temperature=float(os.getenv(f"HIREBOT_TEMPERATURE_{key}", str(LLM_TEMPERATURE))),
+    )
+
+
+class StageLatency:
+    """Rolling latency samples for one stage."""
+
+    def __init__(self, window: int = 1000):
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.calls = 0
+        self.errors = 0
+
+    def record(self, seconds: float, ok: bool = True) -> None:
+        self.calls += 1
+        if ok:
+            self.samples.append(seconds)
+        else:
+            self.errors += 1
+
+    def summary(self) -> Dict[str, Any]:
+        ordered = sorted(self.samples)
+
+        def pct(p: float) -> float:
+            if not ordered:
+                return 0.0
+            return round(ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1000, 1)
+
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "avg_ms": round(sum(ordered) / len(ordered) * 1000, 1) if ordered else 0.0,
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+        }
+
+
+class ChainRegistry:
+    """
+    Prompts, models and chains for every pipeline stage, built once.
+
+    Each stage is routed to its own model/temperature (see `stage_config`);
+    stages sharing a configuration share one LLM instance. `run` and `stream`
+    record per-stage latency and prompt/completion tokens per stage and,
+    when a `session_id` is given, per session.
+
+    Chains are built on first use (or by an explicit `build`, e.g. from a
+    startup hook), so importing and constructing the registry stays cheap.
+    """
+
+    def __init__(self, llm_factory: Callable[..., Any] = build_llm):
+        self.llm_factory = llm_factory
+        self.configs: Dict[str, StageConfig] = {stage: stage_config(stage) for stage in STAGES}
+        self.prompts: Dict[str, PromptTemplate] = {}
+        self.parsers: Dict[str, Any] = {}
+        self.chains: Dict[str, Any] = {}
+        self.stream_chains: Dict[str, Any] = {}
+        self.latency: Dict[str, StageLatency] = {stage: StageLatency() for stage in STAGES}
+        self.tokens = TokenLedger()
+        self.built = False
+        self._build_lock = threading.Lock()
+
+    def build(self) -> "ChainRegistry":
+        """Build prompts, models and chains once; safe to call from several threads."""
+        if not self.built:
+            with self._build_lock:
+                if not self.built:
+                    start = time.perf_counter()
+                    self._build()
+                    self.built = True
+                    logger.info(f"Chains built in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return self
+
+    def _build(self) -> None:
+        json_parser = JsonOutputParser()
+        format_instructions = json_parser.get_format_instructions()
+        self.prompts = {
+            "parse": PromptTemplate(
+                template=resume_parser_prompt,
+                input_variables=["RESUME"],
+                partial_variables={"format_instructions": format_instructions},
+            ),
+            "questions": PromptTemplate(
+                template=tech_questions,
+                input_variables=["num", "tech_stack"],
+                partial_variables={"format_instructions": format_instructions},
+            ),
+            "fused": PromptTemplate(
+                template=resume_parser_with_questions_prompt,
+                input_variables=["RESUME", "num"],
+            ),
+            # Evaluation runs once per question; reports are merged locally
+            "evaluation": PromptTemplate(
+                template=question_evaluator_prompt,
+                input_variables=["question", "answer"],
+            ),
+            # Greeting is a pure template; it never reaches a model
+            "greeting": PromptTemplate(
+                template=greet_prompt_template,
+                input_variables=["candidate_name", "agent_name", "hr_manager_name"],
+            ),
+        }
+        self.parsers = {
+            "parse": json_parser,
+            "questions": json_parser,
+            "fused": json_parser,
+            "evaluation": StrOutputParser(),
+        }
+
+        llms: Dict[StageConfig, Any] = {}
+        for stage, parser in self.parsers.items():
+            config = self.configs[stage]
+            if config not in llms:
+                llms[config] = self.llm_factory(model=config.model, temperature=config.temperature)
+            self.stream_chains[stage] = self.prompts[stage] | llms[config]
+            self.chains[stage] = self.stream_chains[stage] | parser
+            logger.info(f"Stage '{stage}' routed to {config.model} (temperature={config.temperature})")
+
+    def model_for(self, stage: str) -> str:
+        return self.configs[stage].model
+
+    def parser(self, stage: str) -> Any:
+        return self.build().parsers[stage]
+
+    def format_greeting(self, **kwargs: Any) -> str:
+        return self.build().prompts["greeting"].format(**kwargs)
+
+    def estimate_tokens(self, stage: str, inputs: Dict[str, Any]) -> int:
+        """Rough prompt + completion tokens for admission against the tokens/min limit."""
+        chars = len(self.build().prompts[stage].template) + sum(len(str(v)) for v in inputs.values())
+        return chars // CHARS_PER_TOKEN + EXPECTED_COMPLETION_TOKENS.get(stage, 0)
+
+    def _record(self, stage: str, seconds: float, ok: bool = True) -> None:
+        self.latency[stage].record(seconds, ok=ok)
+        llm_stage_seconds.observe(seconds, stage=stage)
+        if not ok:
+            stage_errors_total.inc(stage=stage)
+
+    async def run(self, stage: str, inputs: Dict[str, Any], session_id: Optional[str] = None,
+                  priority: Priority = Priority.INTERACTIVE, usage: Optional[TokenUsageCallback] = None) -> Any:
+        """Invoke a stage's full chain (prompt | llm | parser); pass `usage` to read the call's token counts."""
+        usage = usage or TokenUsageCallback()
+        estimate = self.estimate_tokens(stage, inputs)
+        start = time.perf_counter()
+        try:
+            result = await run_chain(self.chains[stage], inputs, config={"callbacks": [usage]},
+                                     priority=priority, tokens=estimate)
+        except Exception:
+            self._record(stage, time.perf_counter() - start, ok=False)
+            raise
+        finally:
+            self.tokens.record(stage, usage, session_id)
+            settle_tokens(estimate, usage.prompt_tokens + usage.completion_tokens)
+        self._record(stage, time.perf_counter() - start)
+        return result
+
+    async def stream(self, stage: str, inputs: Dict[str, Any], session_id: Optional[str] = None,
+                     priority: Priority = Priority.INTERACTIVE,
+                     usage: Optional[TokenUsageCallback] = None) -> AsyncIterator[str]:
+        """Stream raw text tokens for a stage (prompt | llm, no parser); `usage` as for `run`."""
+        usage = usage or TokenUsageCallback()
+        estimate = self.estimate_tokens(stage, inputs)
+        start = time.perf_counter()
+        ok = False
+        try:
+            async for token in stream_chain(self.stream_chains[stage], inputs, config={"callbacks": [usage]},
+                                            priority=priority, tokens=estimate):
+                yield token
+            ok = True
+        finally:
+            self._record(stage, time.perf_counter() - start, ok=ok)
+            self.tokens.record(stage, usage, session_id)
+            settle_tokens(estimate, usage.prompt_tokens + usage.completion_tokens)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            stage: {
+                "model": self.configs[stage].model,
+                **self.latency[stage].summary(),
+                **self.tokens.stage(stage),
+            }
+            for stage in LLM_STAGES
+        }
@@ -0,0 +1,362 @@
+"""
+The hiring pipeline as a checkpointed LangGraph state machine, shared by the
+CLI (`app.agent_logic`) and every API step, streaming endpoints included.
+
+Nodes are pure state transitions: they read the state, call an injected
+stage function (`EngineSteps`) and return an update. They never prompt or
+touch the session store. Every caller step starts a run on the candidate's
+thread from its last checkpoint (SQLite), and the entry router picks the work
+that step made due:
+
+    start_input    -> greet
+    resume_input   -> parse_resume -> generate_questions | summarize_resume
+    questions_input -> generate_questions
+    answers_input  -> collect_answers -> evaluate_answer (one per question) -> complete
+
+Branches separated by `|` run in parallel, as do the per-question evaluations.
+With a fused `parse_with_questions` step, parse_resume also produces the
+questions and only summarize_resume follows. `defer_questions` holds question
+generation back until a later `questions_input` (batch ingestion, or the API
+with pre-generation off).
+Checkpoints are written after every superstep, so a run cut short by a crash
+is resumed by the thread's next `advance` without redoing finished nodes.
+
+`advance(..., stream_tokens=True)` also yields the model tokens of the stages
+that stream (see `TokenSink`) as `(TOKEN_EVENT, {"stage", "text", ...})`;
+evaluation tokens also carry their "question", as the branches run at once.
+"""
+import asyncio
+import logging
+import aiosqlite
+from pathlib import Path
+from contextlib import asynccontextmanager
+from typing import (
+    Annotated, Any, AsyncIterator, Awaitable, Callable, Dict, List, NamedTuple, Optional, Set, Tuple, TypedDict,
+)
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.config import get_stream_writer
+from langgraph.graph import StateGraph, START, END
+from langgraph.types import Send
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+from app.evaluation import (
+    QuestionEvaluation, match_answers, merge_evaluations, parse_question_evaluation, score_card, unanswered_evaluation,
+)
+from app.projections import resume_profile, tech_stack_prompt_input
+from app.llm_scheduler import Priority
+
+logger = logging.getLogger(__name__)
+
+# Called with each model token of a streaming stage
+TokenSink = Callable[[str], None]
+# Node name under which `advance` yields streamed tokens
+TOKEN_EVENT = "token"
+
+
+def _merge_evaluations(current: Optional[Dict], update: Optional[Dict]) -> Dict:
+    """Reducer for the parallel evaluation branches; an explicit None clears a previous submission's results."""
+    if update is None:
+        return {}
+    return {**(current or {}), **update}
+
+
+class EngineState(TypedDict, total=False):
+    """Checkpointed state of one candidate's thread."""
+    user_name: str
+    greeting: Optional[str]
+    resume_text: Optional[str]
+    resume_parsed: Optional[Dict]
+    profile: Optional[Dict]
+    defer_questions: bool
+    tech_questions: Optional[Dict[str, str]]
+    answers: Optional[Dict[str, str]]
+    regrade: bool
+    qa: Optional[Dict[str, str]]
+    # question text -> {"analysis", "scores"}
+    evaluations: Annotated[Dict[str, Dict], _merge_evaluations]
+    results: Optional[str]
+    scores: Optional[Dict]
+
+
+class EngineSteps(NamedTuple):
+    """
+    Stage functions called by the nodes; the API passes its cache-aware versions.
+    `priority` is the run's scheduling priority; `on_token` is None unless the
+    caller streams tokens.
+    """
+    greet: Callable[[str], str]
+    # (resume text, thread id, priority) -> parsed resume
+    parse: Callable[[str, str, Priority], Awaitable[Dict]]
+    # (parsed resume, thread id, priority, on_token) -> {id: question}
+    questions: Callable[[Dict, str, Priority, Optional[TokenSink]], Awaitable[Dict[str, str]]]
+    # (question, answer, thread id, regrade, on_token) -> evaluation
+    evaluate: Callable[[str, str, str, bool, Optional[TokenSink]], Awaitable[QuestionEvaluation]]
+    # Fused mode: (resume text, thread id, priority) -> (parsed resume, {id: question}) in one call
+    parse_with_questions: Optional[Callable[[str, str, Priority], Awaitable[Tuple[Dict, Dict[str, str]]]]] = None
+
+
+def chain_steps(chains: Any, num_questions: int = 3, priority: Priority = Priority.INTERACTIVE) -> EngineSteps:
+    """
+    Stage functions backed directly by a `ChainRegistry` (no caches), scheduled
+    at `priority` whatever the run asks for.
+    """
+    def greet(user_name: str) -> str:
+        return chains.format_greeting(candidate_name=user_name, agent_name="Janus", hr_manager_name="Radhika")
+
+    async def parse(resume_text: str, thread_id: str, _priority: Priority) -> Dict:
+        return await chains.run("parse", {"RESUME": resume_text}, session_id=thread_id, priority=priority)
+
+    async def questions(resume_parsed: Dict, thread_id: str, _priority: Priority,
+                        on_token: Optional[TokenSink] = None) -> Dict[str, str]:
+        inputs = {"num": num_questions, "tech_stack": tech_stack_prompt_input(resume_parsed)}
+        return await chains.run("questions", inputs, session_id=thread_id, priority=priority)
+
+    async def evaluate(question: str, answer: str, thread_id: str, regrade: bool,
+                       on_token: Optional[TokenSink] = None) -> QuestionEvaluation:
+        inputs = {"question": question, "answer": answer}
+        text = await chains.run("evaluation", inputs, session_id=thread_id, priority=priority)
+        return parse_question_evaluation(text)
+
+    return EngineSteps(greet=greet, parse=parse, questions=questions, evaluate=evaluate)
+
+
+# --- Step inputs ---
+
+def start_input(user_name: str) -> Dict[str, Any]:
+    return {"user_name": user_name, "greeting": None}
+
+
+def resume_input(resume_text: Optional[str] = None, resume_parsed: Optional[Dict] = None,
+                 defer_questions: bool = False) -> Dict[str, Any]:
+    """
+    A new resume (text to parse, or an already parsed one); clears everything
+    derived from the previous one. With `defer_questions`, questions wait for
+    a `questions_input`.
+    """
+    return {
+        "resume_text": resume_text,
+        "resume_parsed": resume_parsed,
+        "profile": None,
+        "defer_questions": defer_questions,
+        "tech_questions": None,
+        **answers_input(None),
+    }
+
+
+def questions_input(resume_parsed: Dict) -> Dict[str, Any]:
+    """Ask for questions now; carries the parsed resume for threads that never saw it."""
+    return {"resume_parsed": resume_parsed, "defer_questions": False}
+
+
+def answers_input(answers: Optional[Dict[str, str]], regrade: bool = False,
+                  tech_questions: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Submitted answers (keyed by question id or text); `tech_questions` pins the questions they answer."""
+    values = {"answers": answers, "regrade": regrade, "qa": None, "evaluations": None, "results": None, "scores": None}
+    if tech_questions:
+        values["tech_questions"] = tech_questions
+    return values
+
+
+def ordered_evaluations(state: EngineState) -> List[QuestionEvaluation]:
+    """Per-question evaluations in question order."""
+    evaluations = state.get("evaluations") or {}
+    return [QuestionEvaluation(**evaluations[question]) for question in state.get("qa") or {}]
+
+
+# --- Graph ---
+
+def _thread_id(config: RunnableConfig) -> str:
+    return config["configurable"]["thread_id"]
+
+
+def _priority(config: RunnableConfig) -> Priority:
+    return config["configurable"].get("priority", Priority.INTERACTIVE)
+
+
+def _token_sink(config: RunnableConfig, stage: str, **labels: Any) -> Optional[TokenSink]:
+    """Forwards a stage's tokens to `advance` when the run streams them, tagged with `labels`."""
+    if not config["configurable"].get("stream_tokens"):
+        return None
+    writer = get_stream_writer()
+    return lambda text: writer({"stage": stage, "text": text, **labels})
+
+
+def _resume_work(state: EngineState) -> List[str]:
+    """Branches still due for a parsed resume."""
+    due = []
+    if state.get("tech_questions") is None and not state.get("defer_questions"):
+        due.append("generate_questions")
+    if state.get("profile") is None:
+        due.append("summarize_resume")
+    return due
+
+
+def route_step(state: EngineState) -> Any:
+    """Entry router: the work the latest input made due (nothing if the thread is up to date)."""
+    if state.get("answers") is not None and state.get("results") is None and state.get("tech_questions"):
+        return "collect_answers"
+    if state.get("resume_text") and state.get("resume_parsed") is None:
+        return "parse_resume"
+    if state.get("resume_parsed") is not None:
+        due = _resume_work(state)
+        if due:
+            return due
+    if state.get("user_name") and state.get("greeting") is None:
+        return "greet"
+    return END
+
+
+def route_parsed(state: EngineState) -> Any:
+    """After parse_resume: the branches it did not already cover (a fused parse brings the questions)."""
+    return _resume_work(state) or END
+
+
+def fan_out_evaluations(state: EngineState) -> Any:
+    """One evaluation branch per question."""
+    sends = [
+        Send("evaluate_answer", {"question": question, "answer": answer, "regrade": state.get("regrade", False)})
+        for question, answer in state["qa"].items()
+    ]
+    return sends or "complete"
+
+
+def build_graph(steps: EngineSteps) -> StateGraph:
+    async def greet(state: EngineState) -> Dict:
+        return {"greeting": steps.greet(state["user_name"])}
+
+    async def parse_resume(state: EngineState, config: RunnableConfig) -> Dict:
+        if steps.parse_with_questions is not None and not state.get("defer_questions"):
+            parsed, questions = await steps.parse_with_questions(
+                state["resume_text"], _thread_id(config), _priority(config)
+            )
+            return {"resume_parsed": parsed, "tech_questions": questions}
+        return {"resume_parsed": await steps.parse(state["resume_text"], _thread_id(config), _priority(config))}
+
+    async def generate_questions(state: EngineState, config: RunnableConfig) -> Dict:
+        questions = await steps.questions(
+            state["resume_parsed"], _thread_id(config), _priority(config), _token_sink(config, "questions")
+        )
+        return {"tech_questions": questions}
+
+    async def summarize_resume(state: EngineState) -> Dict:
+        return {"profile": resume_profile(state["resume_parsed"])}
+
+    async def collect_answers(state: EngineState) -> Dict:
+        return {"qa": match_answers(state["tech_questions"], state["answers"])}
+
+    async def evaluate_answer(branch: Dict, config: RunnableConfig) -> Dict:
+        question, answer = branch["question"], branch["answer"]
+        if answer:
+            evaluation = await steps.evaluate(
+                question, answer, _thread_id(config), branch["regrade"],
+                _token_sink(config, "evaluation", question=question),
+            )
+        else:
+            evaluation = unanswered_evaluation()
+        return {"evaluations": {question: evaluation._asdict()}}
+
+    async def complete(state: EngineState) -> Dict:
+        evaluations = ordered_evaluations(state)
+        return {"results": merge_evaluations(evaluations), "scores": score_card(evaluations)}
+
+    graph = StateGraph(EngineState)
+    for node in (greet, parse_resume, generate_questions, summarize_resume, collect_answers, evaluate_answer, complete):
+        graph.add_node(node.__name__, node)
+    graph.add_conditional_edges(
+        START, route_step,
+        ["greet", "parse_resume", "generate_questions", "summarize_resume", "collect_answers", END],
+    )
+    graph.add_edge("greet", END)
+    graph.add_conditional_edges("parse_resume", route_parsed, ["generate_questions", "summarize_resume", END])
+    graph.add_edge("generate_questions", END)
+    graph.add_edge("summarize_resume", END)
+    graph.add_conditional_edges("collect_answers", fan_out_evaluations, ["evaluate_answer", "complete"])
+    graph.add_edge("evaluate_answer", "complete")
+    graph.add_edge("complete", END)
+    return graph
+
+
+class HiringEngine:
+    """
+    The compiled pipeline graph with its checkpointer; one thread per candidate
+    (the API uses the session id).
+    """
+
+    def __init__(self, steps: EngineSteps, checkpointer: Any):
+        self.checkpointer = checkpointer
+        self.graph = build_graph(steps).compile(checkpointer=checkpointer)
+        self.runs = 0
+        self.resumed = 0
+        self._cleanup: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def _config(thread_id: str, **options: Any) -> RunnableConfig:
+        return {"configurable": {"thread_id": thread_id, **options}}
+
+    async def advance(self, thread_id: str, values: Optional[Dict[str, Any]] = None, resume: bool = True,
+                      priority: Priority = Priority.INTERACTIVE,
+                      stream_tokens: bool = False) -> AsyncIterator[Tuple[str, Dict]]:
+        """
+        Finish any run the thread was interrupted in (unless `resume` is False, e.g.
+        `values` supersede it), then apply `values` and run the step they make
+        due, yielding `(node, update)` as each node completes. With
+        `stream_tokens`, streaming stages' tokens come in between as
+        `(TOKEN_EVENT, payload)`.
+        """
+        config = self._config(thread_id, priority=priority, stream_tokens=stream_tokens)
+        stream_mode = ["updates", "custom"] if stream_tokens else ["updates"]
+        inputs = []
+        snapshot = await self.graph.aget_state(config)
+        if snapshot.next and resume:
+            logger.info(f"Resuming thread {thread_id} at {', '.join(snapshot.next)}")
+            self.resumed += 1
+            inputs.append(None)
+        if values is not None:
+            inputs.append(values)
+        for run_input in inputs:
+            self.runs += 1
+            async for mode, chunk in self.graph.astream(run_input, config, stream_mode=stream_mode):
+                if mode == "custom":
+                    yield TOKEN_EVENT, chunk
+                    continue
+                for node, update in chunk.items():
+                    yield node, update or {}
+
+    async def run(self, thread_id: str, values: Optional[Dict[str, Any]] = None, **options: Any) -> EngineState:
+        """`advance` to completion (same options); returns the thread's state."""
+        async for _ in self.advance(thread_id, values, **options):
+            pass
+        return await self.state(thread_id)
+
+    async def state(self, thread_id: str) -> EngineState:
+        snapshot = await self.graph.aget_state(self._config(thread_id))
+        return snapshot.values
+
+    def forget(self, thread_id: str) -> None:
+        """Drop a thread's checkpoints in the background (for sync cleanup hooks running on the event loop)."""
+        task = asyncio.get_running_loop().create_task(self.checkpointer.adelete_thread(thread_id))
+        self._cleanup.add(task)
+
+        def _done(finished: asyncio.Task) -> None:
+            self._cleanup.discard(finished)
+            if not finished.cancelled() and finished.exception() is not None:
+                logger.warning(f"Failed to delete checkpoints of thread {thread_id}: {finished.exception()}")
+
+        task.add_done_callback(_done)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"runs": self.runs, "resumed": self.resumed}
+
+
+@asynccontextmanager
+async def open_engine(steps: EngineSteps, db_path: str) -> AsyncIterator[HiringEngine]:
+    """A `HiringEngine` checkpointing to the SQLite database at `db_path` (WAL mode), open for the block."""
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    async with aiosqlite.connect(db_path, timeout=30) as conn:
+        # Same durability trade-off as the other stores: WAL without an fsync per checkpoint
+        await conn.execute("PRAGMA journal_mode=WAL")
+        await conn.execute("PRAGMA synchronous=NORMAL")
+        await conn.execute("PRAGMA busy_timeout=30000")
+        logger.info(f"Graph engine checkpoints at {db_path}")
+        yield HiringEngine(steps, AsyncSqliteSaver(conn))
@@ -0,0 +1,143 @@
+import re
+import unicodedata
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+SCORE_DIMENSIONS = ("TC", "AC", "DC")
+MAX_SCORE_PER_DIMENSION = 5
+
+_SCORE_RE = {dim: re.compile(rf"\b{dim}\s*=\s*(\d+)") for dim in SCORE_DIMENSIONS}
+_SCORES_LINE_RE = re.compile(r"^\s*\**Scores?\**\s*:.*$", re.IGNORECASE | re.MULTILINE)
+_ANALYSIS_PREFIX_RE = re.compile(r"^\s*\**Analysis\**\s*:\s*", re.IGNORECASE)
+
+
+class QuestionEvaluation(NamedTuple):
+    """Evaluator output for one question."""
+    analysis: str
+    scores: Dict[str, int]
+
+    @property
+    def total(self) -> int:
+        return sum(self.scores.values())
+
+
+def normalize_qa_text(text: str) -> str:
+    """Canonical form of a question or answer for exact-match caching (Unicode NFC, collapsed whitespace)."""
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+
+def match_answers(questions: Dict[str, str], answers: Dict[str, str]) -> Dict[str, str]:
+    """Pair each question text with the candidate's answer (keyed by question id or text)."""
+    return {
+        question: (answers.get(key) or answers.get(question) or "").strip()
+        for key, question in questions.items()
+    }
+
+
+def unanswered_evaluation() -> QuestionEvaluation:
+    """Result for a question left blank; scored zero without an LLM call."""
+    return QuestionEvaluation(analysis="No answer was provided.", scores={dim: 0 for dim in SCORE_DIMENSIONS})
+
+
+def parse_question_evaluation(text: str) -> QuestionEvaluation:
+    """Split a per-question completion into its analysis and TC/AC/DC scores (missing scores count as 0)."""
+    scores = {}
+    for dim, pattern in _SCORE_RE.items():
+        match = pattern.search(text)
+        value = int(match.group(1)) if match else 0
+        scores[dim] = max(0, min(MAX_SCORE_PER_DIMENSION, value))
+    analysis = _SCORES_LINE_RE.sub("", text)
+    analysis = " ".join(_ANALYSIS_PREFIX_RE.sub("", analysis).split())
+    return QuestionEvaluation(analysis=analysis, scores=scores)
+
+
+def format_question_evaluation(evaluation: QuestionEvaluation) -> str:
+    """A per-question result in the evaluator's own two-line reply format."""
+    scores = ", ".join(f"{dim}={evaluation.scores[dim]}" for dim in SCORE_DIMENSIONS)
+    return f"Analysis: {evaluation.analysis}\nScores: {scores}"
+
+
+class OrderedEvaluationStream:
+    """
+    Serializes the token streams of concurrently evaluated questions into one
+    readable report. The first unfinished question streams live; tokens of
+    later ones are held until it finishes. Questions that produced no tokens
+    (cached, unanswered) contribute their formatted result instead.
+
+    `token` and `finish` return the `(question index, text)` chunks that are
+    now due, in question order.
+    """
+
+    def __init__(self, questions: List[str]):
+        self.questions = list(questions)
+        self._held: Dict[str, List[str]] = {question: [] for question in self.questions}
+        self._streamed = set()
+        self._finished: Dict[str, QuestionEvaluation] = {}
+        self._live = 0
+        self._opened = False
+
+    def token(self, question: str, text: str) -> List[Tuple[int, str]]:
+        self._held[question].append(text)
+        return self._release()
+
+    def finish(self, question: str, evaluation: QuestionEvaluation) -> List[Tuple[int, str]]:
+        self._finished[question] = evaluation
+        return self._release()
+
+    def _release(self) -> List[Tuple[int, str]]:
+        chunks = []
+        while self._live < len(self.questions):
+            question = self.questions[self._live]
+            if not self._opened:
+                chunks.append((self._live, f"**Q{self._live + 1}**\n\n"))
+                self._opened = True
+            held = self._held[question]
+            if held:
+                chunks.append((self._live, "".join(held)))
+                held.clear()
+                self._streamed.add(question)
+            if question not in self._finished:
+                break
+            if question not in self._streamed:
+                chunks.append((self._live, format_question_evaluation(self._finished[question])))
+            chunks.append((self._live, "\n\n"))
+            self._live += 1
+            self._opened = False
+        return chunks
+
+
+def _summary(evaluations: List[QuestionEvaluation], total: int, max_total: int) -> str:
+    if not evaluations:
+        return "No answers were evaluated."
+    percent = round(100 * total / max_total) if max_total else 0
+    totals = [e.total for e in evaluations]
+    best = totals.index(max(totals)) + 1
+    worst = totals.index(min(totals)) + 1
+    summary = f"Scored {total} of {max_total} ({percent}%)."
+    if len(evaluations) > 1 and best != worst:
+        summary += f" Strongest answer: Q{best}; weakest answer: Q{worst}."
+    return summary
+
+
+def score_card(evaluations: List[QuestionEvaluation]) -> Dict[str, Any]:
+    """Per-question TC/AC/DC scores plus totals, in the shape stored on the session."""
+    return {
+        "questions": [{dim: e.scores[dim] for dim in SCORE_DIMENSIONS} for e in evaluations],
+        "total": sum(e.total for e in evaluations),
+        "max_total": len(evaluations) * len(SCORE_DIMENSIONS) * MAX_SCORE_PER_DIMENSION,
+    }
+
+
+def merge_evaluations(evaluations: List[QuestionEvaluation]) -> str:
+    """Assemble per-question results into one report: analyses, a summary, then per-question and total scores."""
+    total = sum(e.total for e in evaluations)
+    max_total = len(evaluations) * len(SCORE_DIMENSIONS) * MAX_SCORE_PER_DIMENSION
+
+    lines = ["### Analysis"]
+    lines += [f"Q{i}: {e.analysis}" for i, e in enumerate(evaluations, 1)]
+    lines += [f"Summary: {_summary(evaluations, total, max_total)}", "", "### Scores"]
+    lines += [
+        f"Q{i}: " + ", ".join(f"{dim}={e.scores[dim]}" for dim in SCORE_DIMENSIONS)
+        for i, e in enumerate(evaluations, 1)
+    ]
+    lines.append(f"Total Score: {total} out of {max_total}")
+    return "\n".join(lines)
@@ -0,0 +1,220 @@
+import re
+import json
+import random
+import asyncio
+import hashlib
+import time
+import threading
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+# Technologies the fake "recognizes" in resume text
+KNOWN_SKILLS = (
+    "Python", "Java", "JavaScript", "TypeScript", "Go", "Rust", "C++", "SQL", "PostgreSQL",
+    "MongoDB", "Redis", "Django", "Flask", "FastAPI", "React", "Node.js", "Docker",
+    "Kubernetes", "AWS", "GCP", "Azure", "PyTorch", "TensorFlow", "scikit-learn",
+    "Pandas", "NumPy", "Spark", "Airflow", "Kafka", "LangChain", "Git", "Linux",
+)
+DEFAULT_SKILLS = ["Python", "SQL", "Docker"]
+
+
+class FakeLLMError(RuntimeError):
+    """Injected failure from the fake backend, shaped like a transient provider 5xx."""
+    status_code = 503
+
+
+class FakeRateLimitError(FakeLLMError):
+    """Injected 429, shaped like a provider rate-limit error (status code + Retry-After)."""
+    status_code = 429
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"rate limit exceeded, retry after {retry_after:.2f}s")
+        self.retry_after = retry_after
+
+
+class _RequestWindow:
+    """Requests seen in the last 60 seconds, shared by every fake instance (like a per-key API limit)."""
+
+    def __init__(self):
+        self.times: Deque[float] = deque()
+        self.lock = threading.Lock()
+
+    def admit(self, limit: int) -> Optional[float]:
+        """Record a request; return seconds to wait instead if `limit` per minute is reached."""
+        now = time.monotonic()
+        with self.lock:
+            while self.times and now - self.times[0] >= 60:
+                self.times.popleft()
+            if len(self.times) >= limit:
+                return 60 - (now - self.times[0])
+            self.times.append(now)
+            return None
+
+
+_window = _RequestWindow()
+
+
+def _seed(text: str) -> int:
+    return int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+
+
+def _section(prompt: str, marker: str) -> str:
+    index = prompt.rfind(marker)
+    return prompt[index + len(marker):] if index >= 0 else prompt
+
+
+def _skills_in(text: str) -> List[str]:
+    found = [s for s in KNOWN_SKILLS if re.search(rf"(?<![\w+]){re.escape(s)}(?![\w+])", text, re.IGNORECASE)]
+    return found or list(DEFAULT_SKILLS)
+
+
+def _resume(text: str) -> Dict[str, Any]:
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    email = re.search(r"[\w.+-]+@[\w-]+\.[\w.]+", text)
+    skills = _skills_in(text)
+    return {
+        "full_name": lines[0][:60] if lines else "",
+        "email": email.group(0) if email else "",
+        "phone": "",
+        "linkedin": "",
+        "github": "",
+        "portfolio_website": "",
+        "location": "",
+        "education": [],
+        "work_experience": [],
+        "skills": skills,
+        "certifications": [],
+        "projects": [{"name": "Project", "description": "", "technologies": skills[:2]}],
+        "languages": ["English"],
+    }
+
+
+def _questions(tech_text: str, num: int) -> Dict[str, str]:
+    skills = _skills_in(tech_text)
+    templates = (
+        "What is a common performance pitfall in {} and how do you avoid it?",
+        "Explain a core concept of {} in one or two sentences.",
+        "How would you debug a production issue in a {} service?",
+        "When would you choose {} over an alternative?",
+    )
+    return {
+        f"q{i + 1}": templates[i % len(templates)].format(skills[i % len(skills)])
+        for i in range(num)
+    }
+
+
+def _evaluation(question: str, answer: str) -> str:
+    words = len(answer.split())
+    rng = random.Random(_seed(question + answer))
+    if words == 0:
+        scores = (0, 0, 0)
+    else:
+        base = min(5, 1 + words // 8)
+        scores = tuple(max(0, min(5, base + rng.randint(-1, 1))) for _ in range(3))
+    return (
+        f"Analysis: {'Detailed' if words > 20 else 'Brief'} answer of {words} words.\n"
+        f"Scores: TC={scores[0]}, AC={scores[1]}, DC={scores[2]}"
+    )
+
+
+def fake_completion(prompt: str) -> str:
+    """Deterministic, schema-valid completion for each Hirebot prompt."""
+    num_match = re.search(r"exactly (\d+)", prompt)
+    num = int(num_match.group(1)) if num_match else 3
+    if "resume parser and technical interviewer" in prompt:
+        resume = _resume(_section(prompt, "Resume Content:"))
+        return json.dumps({"resume": resume, "questions": _questions(json.dumps(resume), num)})
+    if "resume parser" in prompt:
+        return json.dumps(_resume(_section(prompt, "Resume Content:").split("IMPORTANT:")[0]))
+    if "technical questions" in prompt:
+        return json.dumps(_questions(_section(prompt, "Resume tech stack:").split("\n")[0], num))
+    if "QUESTION:" in prompt and "ANSWER:" in prompt:
+        question = _section(prompt, "QUESTION:").split("ANSWER:")[0].strip()
+        return _evaluation(question, _section(prompt, "ANSWER:").strip())
+    raise ValueError(f"No fake completion for prompt: {prompt[:80]!r}")
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Offline stand-in for ChatGroq, for load tests and local development.
+
+    Completions are a deterministic function of the prompt. Latency is drawn
+    from a log-normal distribution around `latency_ms`, and `failure_rate`
+    of calls raise `FakeLLMError` after the simulated latency. Rate limiting
+    is simulated with `rpm_limit` (a shared 60 s window) and `rate_limit_rate`
+    (random 429s); both raise `FakeRateLimitError` immediately.
+    """
+
+    model: str = "fake"
+    latency_ms: float = 200.0
+    latency_sigma: float = 0.5
+    failure_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    rpm_limit: int = 0
+    seed: Optional[int] = None
+    rng: Any = None
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.rng = random.Random(self.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        return "hirebot-fake"
+
+    def _delay(self) -> float:
+        if self.latency_ms <= 0:
+            return 0.0
+        return self.rng.lognormvariate(0, self.latency_sigma) * self.latency_ms / 1000
+
+    def _check_rate_limit(self) -> None:
+        if self.rpm_limit:
+            wait = _window.admit(self.rpm_limit)
+            if wait is not None:
+                raise FakeRateLimitError(wait)
+        if self.rate_limit_rate and self.rng.random() < self.rate_limit_rate:
+            raise FakeRateLimitError(round(self.rng.uniform(0.1, 1.0), 2))
+
+    def _complete(self, messages: List[BaseMessage]) -> str:
+        if self.failure_rate and self.rng.random() < self.failure_rate:
+            raise FakeLLMError("injected fake LLM failure")
+        return fake_completion("\n".join(str(m.content) for m in messages))
+
+    def _result(self, text: str, messages: List[BaseMessage]) -> ChatResult:
+        prompt_chars = sum(len(str(m.content)) for m in messages)
+        usage = {
+            "input_tokens": prompt_chars // 4,
+            "output_tokens": len(text) // 4,
+            "total_tokens": (prompt_chars + len(text)) // 4,
+        }
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text, usage_metadata=usage))])
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        self._check_rate_limit()
+        time.sleep(self._delay())
+        return self._result(self._complete(messages), messages)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        self._check_rate_limit()
+        await asyncio.sleep(self._delay())
+        return self._result(self._complete(messages), messages)
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Any = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        self._check_rate_limit()
+        time.sleep(self._delay())
+        for piece in re.split(r"(?<=\s)", self._complete(messages)):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=piece))
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager: Any = None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        self._check_rate_limit()
+        await asyncio.sleep(self._delay())
+        for piece in re.split(r"(?<=\s)", self._complete(messages)):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=piece))
@@ -1,28 +1,51 @@
 import os
+import json
+import time
 import uuid
 import asyncio
 from datetime import datetime
-from typing import TypedDict, Optional, Dict, List
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import TYPE_CHECKING, Callable, TypedDict, Optional, Dict, List, Tuple, Union
 from pathlib import Path
 import logging
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, status
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, UploadFile, File, Header, status
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
-from app.prompts import greet_prompt_template, resume_parser_prompt, tech_questions, Evaluator_prompt
-from langchain_groq import ChatGroq
-from langchain_core.prompts import PromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
-from langchain_community.document_loaders import PyMuPDFLoader
-from langgraph.graph import StateGraph, END
+from app.prompts import resume_parser_prompt, question_evaluator_prompt
+from app import llm
+from app.llm import close_http_client, LLM_BACKEND, LLM_MAX_CONCURRENCY
+from app.llm_scheduler import Priority
+from app.chains import ChainRegistry
+from app.token_usage import TokenUsageCallback
+from app.cache import TieredCache, content_hash
+from app.session_store import InMemorySessionStore, SessionStore, create_session_store
+from app.janitor import SessionJanitor, parse_step_ttls
+from app.resume_text import EXTRACTOR_VERSION, effective_char_budget, extract_resume_text
+from app.batch import BatchIngestor, BatchJobStore, BatchLimitError, pdfs_from_zip
+from app.question_bank import QuestionBank, skill_signature
+from app.evaluation import (
+    OrderedEvaluationStream, QuestionEvaluation, match_answers, normalize_qa_text, parse_question_evaluation,
+    merge_evaluations, score_card, unanswered_evaluation,
+)
+from app.leaderboard import Leaderboard, entry_for
+from app.projections import tech_stack_prompt_input
+from app import metrics
+from app.uploads import UploadSizeLimitMiddleware, read_upload
+from app.singleflight import SingleFlight
+from app.job_queue import JobQueue
+from app.worker import JobWorker
+
+if TYPE_CHECKING:
+    from app.engine import HiringEngine
 
-# Configure logging
+# Configure logging (the log file is opened by the first record, not at import)
 logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     level=logging.INFO,
-    handlers=[logging.FileHandler("hirebot_api.log"), logging.StreamHandler()]
+    handlers=[logging.FileHandler("hirebot_api.log", delay=True), logging.StreamHandler()]
 )
 logger = logging.getLogger(__name__)
 
@@ -33,11 +56,39 @@ try:
 except ImportError:
     logger.warning("dotenv package not found. Skipping .env file load.")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup/shutdown hooks."""
+    logger.info(f"LLM configured (backend: {LLM_BACKEND}, max concurrent calls: {LLM_MAX_CONCURRENCY})")
+    resources = AsyncExitStack()
+    await resources.enter_async_context(engine_lifetime())
+    # Build the LLM chains off the event loop; requests arriving first build them on demand
+    warmup = asyncio.create_task(asyncio.to_thread(chains.build))
+    warmup.add_done_callback(
+        lambda task: task.cancelled() or task.exception() is None
+        or logger.error(f"Failed to build LLM chains: {task.exception()}")
+    )
+    # Score index from persisted sessions, kept in sync while the app runs
+    await resources.enter_async_context(leaderboard_refresh())
+    periodic = [asyncio.create_task(janitor.run_forever())]
+    worker_task = asyncio.create_task(job_worker.run_forever()) if JOB_INLINE else None
+    yield
+    # The job worker drains on stop(); the periodic loops only end when cancelled
+    job_worker.stop()
+    for task in periodic:
+        task.cancel()
+    await asyncio.gather(*periodic, *([worker_task] if worker_task else []), return_exceptions=True)
+    batch_ingestor.shutdown()
+    await resources.aclose()
+    # Release pooled LLM connections
+    await close_http_client()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Hirebot API",
     description="AI-powered hiring assistant API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -49,16 +100,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize LLM
+# Per-resume upload cap; larger requests are rejected before their body is read
+MAX_RESUME_BYTES = int(os.getenv("HIREBOT_MAX_RESUME_BYTES", str(10 * 1024 * 1024)))
+app.add_middleware(UploadSizeLimitMiddleware, max_bytes=MAX_RESUME_BYTES, path_suffixes=("/upload-resume",))
+# Cap on one bulk upload request, and on the PDFs it expands to once zips are unpacked
+BATCH_MAX_BYTES = int(os.getenv("HIREBOT_BATCH_MAX_BYTES", str(200 * 1024 * 1024)))
+app.add_middleware(UploadSizeLimitMiddleware, max_bytes=BATCH_MAX_BYTES, path_suffixes=("/batches/resumes",))
+# Outermost, so rejected requests are counted too
+app.add_middleware(metrics.MetricsMiddleware)
+
+# LLM chains (one per stage), built by the startup hook rather than at import
 try:
-    if not os.getenv("GROQ_API_KEY"):
+    if LLM_BACKEND != "fake" and not os.getenv("GROQ_API_KEY"):
         raise ValueError("GROQ_API_KEY environment variable is required")
     
-    llm = ChatGroq(
-        model="llama-3.3-70b-versatile",
-        temperature=0.2,
-    )
-    logger.info("LLM loaded successfully")
+    chains = ChainRegistry()
 except Exception as e:
     logger.error(f"Failed to load LLM: {e}")
     raise
@@ -81,20 +137,73 @@ class TechQuestionsResponse(BaseModel):
     session_id: str
     questions: Dict[str, str]
 
+class FusedParseOutput(BaseModel):
+    """Single-call output of the fused parse + questions stage."""
+    resume: Dict
+    questions: Dict[str, str]
+
 class AnswerSubmissionRequest(BaseModel):
     session_id: str
     answers: Dict[str, str]
+    regrade: bool = False  # bypass the evaluation cache and stored results
 
 class EvaluationResponse(BaseModel):
     session_id: str
     evaluation: str
     completion_message: str
 
+class QuestionScores(BaseModel):
+    TC: int
+    AC: int
+    DC: int
+
+class CandidateScores(BaseModel):
+    """Structured scores extracted at evaluation time."""
+    questions: List[QuestionScores]
+    total: int
+    max_total: int
+    evaluated_at: str
+
+class LeaderboardEntryResponse(BaseModel):
+    rank: int
+    session_id: str
+    user_name: Optional[str] = None
+    current_step: str
+    total: int
+    max_total: int
+    completed_at: str
+
+class BatchJobStatus(BaseModel):
+    job_id: str
+    status: str
+    total: int
+    extracted: int
+    parsed: int
+    failed: int
+    elapsed_seconds: float
+    resumes_per_minute: float
+    sessions: List[Dict[str, str]]
+    errors: List[Dict[str, str]]
+    created_at: str
+
+class JobStatus(BaseModel):
+    job_id: str
+    kind: str
+    session_id: Optional[str] = None
+    status: str
+    attempts: int
+    result: Optional[Dict] = None
+    error: Optional[str] = None
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
 class SessionStatus(BaseModel):
     session_id: str
     status: str
     current_step: str
     user_name: Optional[str] = None
+    token_usage: Optional[Dict] = None
 
 # --- State Definition ---
 class Hirebot(TypedDict):
@@ -106,149 +215,549 @@ class Hirebot(TypedDict):
     tech_questions: Optional[Dict[str, str]]
     answers: Optional[Dict[str, str]]
     results: Optional[str]
+    scores: Optional[Dict]
+    submission_key: Optional[str]
+    questions_pending_until: Optional[float]
     current_step: str
     created_at: str
 
-# In-memory session storage (use Redis/database in production)
-sessions: Dict[str, Hirebot] = {}
+# Session storage, selected by HIREBOT_SESSION_STORE (memory | sqlite)
+sessions: SessionStore = create_session_store()
+
+metrics.registry.register(metrics.Gauge(
+    "hirebot_sessions", "Stored sessions by current step.", ["step"],
+    collect=lambda: {(step,): count for step, count in sessions.count_by_step().items()},
+))
 
-# Directory for uploaded files
+# Scored sessions ordered by total score, kept in sync on evaluation/deletion
+leaderboard = Leaderboard()
+LEADERBOARD_MAX_TOP = 1000
+# Incremental re-sync (sessions updated since the last one) and full re-sync (also drops deleted sessions)
+LEADERBOARD_REFRESH = float(os.getenv("HIREBOT_LEADERBOARD_REFRESH", "30"))
+LEADERBOARD_FULL_REFRESH = float(os.getenv("HIREBOT_LEADERBOARD_FULL_REFRESH", "600"))
+# Re-read window behind each sync's start, for writes committed while it ran
+LEADERBOARD_SYNC_OVERLAP = 5.0
+
+# Directory for uploaded files, created by the first stored upload
 UPLOAD_DIR = Path("uploads")
-UPLOAD_DIR.mkdir(exist_ok=True)
+
+# Keep uploaded PDFs on disk (text is always extracted from memory)
+PERSIST_UPLOADS = os.getenv("HIREBOT_PERSIST_UPLOADS", "1") == "1"
+
+# Parsed-resume cache, keyed by PDF content + extractor/budget and parser prompt/model version
+RESUME_PARSER_VERSION = content_hash(
+    EXTRACTOR_VERSION, str(effective_char_budget()),
+    resume_parser_prompt, chains.model_for("parse"), str(chains.configs["parse"].temperature)
+)[:16]
+resume_cache = TieredCache(
+    "resume_parse",
+    memory_items=int(os.getenv("HIREBOT_RESUME_CACHE_ITEMS", "256")),
+    db_path=os.getenv("HIREBOT_RESUME_CACHE_DB", "cache/resume_cache.sqlite3") or None,
+    max_disk_bytes=int(os.getenv("HIREBOT_RESUME_CACHE_MAX_BYTES", str(50 * 1024 * 1024))),
+)
+
+# Per-question evaluation cache, keyed by normalized Q/A text + evaluator prompt/model version
+EVALUATION_VERSION = content_hash(
+    question_evaluator_prompt, chains.model_for("evaluation"), str(chains.configs["evaluation"].temperature)
+)[:16]
+evaluation_cache = TieredCache(
+    "evaluation",
+    memory_items=int(os.getenv("HIREBOT_EVAL_CACHE_ITEMS", "2048")),
+    db_path=os.getenv("HIREBOT_EVAL_CACHE_DB", "cache/evaluation_cache.sqlite3") or None,
+    max_disk_bytes=int(os.getenv("HIREBOT_EVAL_CACHE_MAX_BYTES", str(20 * 1024 * 1024))),
+)
+
+# Background expiry of abandoned sessions and their uploads
+janitor = SessionJanitor(
+    sessions,
+    UPLOAD_DIR,
+    step_ttls=parse_step_ttls(os.getenv("HIREBOT_SESSION_TTLS", "")),
+    default_ttl=float(os.getenv("HIREBOT_SESSION_TTL", str(24 * 60 * 60))),
+    interval=float(os.getenv("HIREBOT_JANITOR_INTERVAL", "60")),
+    batch_size=int(os.getenv("HIREBOT_JANITOR_BATCH", "100")),
+    max_sessions=int(os.getenv("HIREBOT_MAX_SESSIONS", "10000")),
+    max_upload_bytes=int(os.getenv("HIREBOT_MAX_UPLOAD_BYTES", str(1024 * 1024 * 1024))),
+    on_delete=lambda session_id: forget_session(session_id),
+)
+
+BATCH_MAX_FILES = int(os.getenv("HIREBOT_BATCH_MAX_FILES", "500"))
+
+# Question pools shared by candidates with the same skill signature
+NUM_TECH_QUESTIONS = 3
+question_bank = QuestionBank(
+    max_signatures=int(os.getenv("HIREBOT_QUESTION_BANK_SIGNATURES", "1000")),
+    ttl=float(os.getenv("HIREBOT_QUESTION_BANK_TTL", str(7 * 24 * 60 * 60))),
+    min_pool=int(os.getenv("HIREBOT_QUESTION_BANK_MIN_POOL", "9")),
+    max_stalled_fills=int(os.getenv("HIREBOT_QUESTION_BANK_MAX_STALLED", "2")),
+)
+
+# Parse the resume and generate questions in one LLM call
+FUSED_PARSE = os.getenv("HIREBOT_FUSED_PARSE", "0") == "1"
+
+# Start question generation in the background as soon as a resume is parsed
+PREGENERATE_QUESTIONS = os.getenv("HIREBOT_PREGENERATE_QUESTIONS", "1") == "1"
+question_tasks: Dict[str, asyncio.Task] = {}
+# Workers that cannot see a session's in-flight generation (another process) wait up to this long for it
+QUESTION_LEASE = float(os.getenv("HIREBOT_QUESTION_LEASE", "60"))
+# The wait polls the store, doubling the interval between reads up to the maximum
+QUESTION_POLL_INTERVAL = 0.1
+QUESTION_POLL_MAX_INTERVAL = 2.0
+
+# Durable queue for the 202 job endpoints; consumed in-process unless HIREBOT_JOB_INLINE=0
+job_queue = JobQueue(
+    os.getenv("HIREBOT_JOB_DB", "data/jobs.sqlite3"),
+    lease_seconds=float(os.getenv("HIREBOT_JOB_LEASE", "120")),
+    max_attempts=int(os.getenv("HIREBOT_JOB_MAX_ATTEMPTS", "3")),
+)
+JOB_INLINE = os.getenv("HIREBOT_JOB_INLINE", "1") == "1"
+JOB_CONCURRENCY = int(os.getenv("HIREBOT_JOB_CONCURRENCY", "16"))
+JOB_POLL_INTERVAL = float(os.getenv("HIREBOT_JOB_POLL_INTERVAL", "0.5"))
+JOB_RETENTION = float(os.getenv("HIREBOT_JOB_RETENTION", str(24 * 60 * 60)))
+
+# Checkpointed LangGraph pipeline (app.engine) that runs every session step, opened by the lifespan
+ENGINE_DB = os.getenv("HIREBOT_ENGINE_DB", "data/engine.sqlite3")
+engine: Optional["HiringEngine"] = None
+
+# Concurrent duplicate requests (reruns, double clicks, client retries) share one in-flight LLM call
+question_flights = SingleFlight("tech_questions")
+submission_flights = SingleFlight("submit_answers")
 
 # --- Helper Functions ---
-def resume_loader(path_to_resume: str) -> str:
-    """Helper function to load and extract text from a PDF resume."""
-    loader = PyMuPDFLoader(path_to_resume)
-    documents = loader.load()
-    logger.info(f"Successfully loaded {path_to_resume}")
-    return documents[0].page_content
+def resume_loader(source: Union[str, bytes]) -> str:
+    """Helper function to extract text from a PDF resume (file path or in-memory bytes)."""
+    try:
+        with metrics.pdf_extract_seconds.time():
+            text = extract_resume_text(source)
+    except Exception:
+        metrics.stage_errors_total.inc(stage="extract")
+        raise
+    logger.info(f"Successfully extracted {len(text)} chars of resume text")
+    return text
+
+def store_upload(file_path: Path, content: bytes) -> None:
+    """Write an uploaded PDF to the upload directory (blocking)."""
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_bytes(content)
+
+def resume_cache_key(content: bytes) -> str:
+    """Cache key for a resume: hash of the PDF bytes plus the extraction and parser version."""
+    return f"{content_hash(content)}:{RESUME_PARSER_VERSION}"
+
+def evaluation_cache_key(question: str, answer: str) -> str:
+    """Cache key for one evaluation: hash of the normalized question and answer plus the evaluator version."""
+    return f"{content_hash(normalize_qa_text(question), normalize_qa_text(answer))}:{EVALUATION_VERSION}"
 
 def generate_greeting(candidate_name: str) -> str:
     """Generate greeting for the user."""
-    prompt = PromptTemplate(
-        template=greet_prompt_template,
-        input_variables=["candidate_name", "agent_name", "hr_manager_name"],
-    )
-    return prompt.format(
+    return chains.format_greeting(
         candidate_name=candidate_name, 
         agent_name="Janus", 
         hr_manager_name="Radhika"
     )
 
-async def parse_resume_async(resume_path: str) -> Dict:
-    """Parse resume asynchronously."""
+def new_session(session_id: str, user_name: str) -> Hirebot:
+    """Initial state for a new hiring session."""
+    return {
+        "session_id": session_id,
+        "user_name": user_name,
+        "resume_path": None,
+        "resume_parsed": None,
+        "tech_questions": None,
+        "answers": None,
+        "results": None,
+        "scores": None,
+        "submission_key": None,
+        "questions_pending_until": None,
+        "current_step": "resume_upload",
+        "created_at": datetime.now().isoformat()
+    }
+
+def forget_session(session_id: str) -> None:
+    """Stop a removed session's speculative work and drop it from the in-memory indexes derived from it."""
+    task = question_tasks.pop(session_id, None)
+    if task is not None:
+        task.cancel()
+    leaderboard.discard(session_id)
+    chains.tokens.discard(session_id)
+    if engine is not None:
+        engine.forget(session_id)
+
+async def parse_resume_text_async(data: str, session_id: Optional[str] = None,
+                                  priority: Priority = Priority.INTERACTIVE) -> Dict:
+    """Parse already-extracted resume text asynchronously."""
     try:
-        data = resume_loader(resume_path)
-        parser = JsonOutputParser()
-        prompt = PromptTemplate(
-            template=resume_parser_prompt,
-            input_variables=["RESUME"],
-            partial_variables={"format_instructions": parser.get_format_instructions()},
-        )
-        
-        chain = prompt | llm | parser
-        parsed_resume = await asyncio.to_thread(chain.invoke, {"RESUME": data})
+        parsed_resume = await chains.run("parse", {"RESUME": data}, session_id=session_id, priority=priority)
         logger.info("Resume parsed successfully.")
         return parsed_resume
     except Exception as e:
         logger.error(f"Error parsing resume: {e}")
         raise HTTPException(status_code=500, detail=f"Error parsing resume: {str(e)}")
 
-async def generate_tech_questions_async(resume_data: Dict) -> Dict[str, str]:
-    """Generate technical questions asynchronously."""
+async def parse_resume_with_questions_async(data: str, session_id: Optional[str] = None,
+                                            priority: Priority = Priority.INTERACTIVE) -> Tuple[Dict, Dict[str, str]]:
+    """Fused mode: parse the resume and generate questions with a single LLM call."""
     try:
-        num = 3
-        parser = JsonOutputParser()
-        prompt = PromptTemplate(
-            template=tech_questions,
-            input_variables=["num", "tech_stack"],
-            partial_variables={"format_instructions": parser.get_format_instructions()},
-        )
+        inputs = {"RESUME": data, "num": NUM_TECH_QUESTIONS}
+        result = await chains.run("fused", inputs, session_id=session_id, priority=priority)
+        output = FusedParseOutput.model_validate(result)
+        if not output.questions:
+            raise ValueError("model returned no questions")
+        signature = skill_signature(output.resume)
+        if signature:
+            question_bank.add(signature, output.questions.values())
+        logger.info("Resume parsed and tech questions generated in one call.")
+        return output.resume, output.questions
+    except Exception as e:
+        logger.error(f"Error in fused resume parsing: {e}")
+        raise HTTPException(status_code=500, detail=f"Error parsing resume: {str(e)}")
+
+def completion_message_for(user_name: str) -> str:
+    """Closing message shown to the candidate once evaluation is done."""
+    completion_message = f"""
+Thank you for completing the initial steps of the hiring process, {user_name}. 🙌
+Our team will carefully evaluate your responses and resume.
+You will be notified via email or message if you are selected for the next round.
+We appreciate your patience and interest in this opportunity!
+        """
+    return completion_message.strip()
+
+def sse_event(event: str, data: Dict) -> str:
+    """Format a server-sent event frame."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def generate_tech_questions_async(resume_data: Dict, session_id: Optional[str] = None,
+                                        priority: Priority = Priority.INTERACTIVE,
+                                        on_token: Optional[Callable[[str], None]] = None) -> Dict[str, str]:
+    """
+    Generate technical questions asynchronously (question bank first, LLM on a
+    miss), passing the model's tokens to `on_token` as they arrive if given.
+    """
+    try:
+        num = NUM_TECH_QUESTIONS
+        signature = skill_signature(resume_data)
+        if signature:
+            questions = question_bank.sample(signature, num)
+            if questions:
+                logger.info("Tech questions served from question bank.")
+                return questions
         
-        chain = prompt | llm | parser
-        questions = await asyncio.to_thread(chain.invoke, {"num": num, "tech_stack": resume_data})
+        inputs = {"num": num, "tech_stack": tech_stack_prompt_input(resume_data)}
+        if on_token is None:
+            questions = await chains.run("questions", inputs, session_id=session_id, priority=priority)
+        else:
+            chunks = []
+            async for token in chains.stream("questions", inputs, session_id=session_id, priority=priority):
+                chunks.append(token)
+                on_token(token)
+            questions = chains.parser("questions").parse("".join(chunks))
+        if signature:
+            question_bank.add(signature, questions.values())
         logger.info("Tech questions generated successfully.")
         return questions
     except Exception as e:
         logger.error(f"Error generating tech questions: {e}")
         raise HTTPException(status_code=500, detail=f"Error generating questions: {str(e)}")
 
-async def evaluate_answers_async(answers: Dict[str, str]) -> str:
-    """Evaluate answers asynchronously."""
+async def evaluate_question_async(question: str, answer: str, session_id: Optional[str] = None,
+                                  regrade: bool = False,
+                                  on_token: Optional[Callable[[str], None]] = None) -> QuestionEvaluation:
+    """
+    Evaluate a single question/answer pair; unanswered questions score zero
+    without an LLM call. `on_token` receives the model's tokens (not cache hits).
+    """
+    if not answer:
+        return unanswered_evaluation()
+    
+    # Identical pairs (pooled questions, test accounts, re-submissions) are graded once unless re-grading
+    cache_key = evaluation_cache_key(question, answer)
+    if regrade:
+        metrics.evaluation_cache_total.inc(outcome="bypass")
+    else:
+        cached = await evaluation_cache.aget(cache_key)
+        if cached is not None:
+            metrics.evaluation_cache_total.inc(outcome="hit")
+            metrics.evaluation_cache_tokens_saved_total.inc(cached["tokens"])
+            return QuestionEvaluation(analysis=cached["analysis"], scores=cached["scores"])
+        metrics.evaluation_cache_total.inc(outcome="miss")
+    
+    usage = TokenUsageCallback()
+    inputs = {"question": question, "answer": answer}
+    if on_token is None:
+        text = await chains.run("evaluation", inputs, session_id=session_id, usage=usage)
+    else:
+        chunks = []
+        async for token in chains.stream("evaluation", inputs, session_id=session_id, usage=usage):
+            chunks.append(token)
+            on_token(token)
+        text = "".join(chunks)
+    evaluation = parse_question_evaluation(text)
+    await evaluation_cache.aset(cache_key, {
+        "analysis": evaluation.analysis,
+        "scores": evaluation.scores,
+        "tokens": usage.prompt_tokens + usage.completion_tokens,
+    })
+    return evaluation
+
+async def complete_evaluation(session_id: str, evaluations: List[QuestionEvaluation],
+                              submission_key: Optional[str] = None) -> str:
+    """Store the merged report and typed scores, complete the session and index it."""
+    evaluation = merge_evaluations(evaluations)
+    scores = CandidateScores(**score_card(evaluations), evaluated_at=datetime.now().isoformat())
+    session = await sessions.aupdate(
+        session_id, results=evaluation, scores=scores.model_dump(),
+        submission_key=submission_key, current_step="completed"
+    )
+    entry = entry_for(session) if session else None
+    if entry is not None:
+        leaderboard.upsert(entry)
+    logger.info(f"Session completed for: {session_id} (score {scores.total}/{scores.max_total})")
+    return evaluation
+
+def stored_submission(session: Hirebot, idempotency_key: Optional[str], qa: Dict[str, str]) -> Optional[str]:
+    """Stored evaluation when an Idempotency-Key is replayed; 422 if it was used with other answers."""
+    if not idempotency_key or session.get("submission_key") != idempotency_key:
+        return None
+    if session["answers"] != qa:
+        raise HTTPException(status_code=422, detail="Idempotency-Key was already used with different answers")
+    return session["results"]
+
+def submission_flight_key(session_id: str, qa: Dict[str, str], idempotency_key: Optional[str],
+                          regrade: bool = False) -> Tuple[str, str]:
+    """Identical submissions for a session (same answers, key and regrade flag) share one evaluation."""
+    return session_id, content_hash(json.dumps(qa, sort_keys=True), idempotency_key or "", str(regrade))
+
+async def evaluate_submission(session_id: str, qa: Dict[str, str], idempotency_key: Optional[str] = None,
+                              regrade: bool = False) -> str:
+    """Record the answers, evaluate them (one graph branch per question) and complete the session."""
+    from app.engine import ordered_evaluations
+    session = await sessions.aupdate(session_id, answers=qa, current_step="evaluation")
     try:
-        prompt = PromptTemplate(
-            template=Evaluator_prompt,
-            input_variables=["qa"],
-        )
-        
-        chain = prompt | llm
-        results_message = await asyncio.to_thread(chain.invoke, {"qa": answers})
-        logger.info("Answers evaluated successfully.")
-        return results_message.content
+        # New answers supersede an evaluation the thread was interrupted in
+        state = await engine.run(session_id, submission_input(session, qa, regrade), resume=False)
     except Exception as e:
         logger.error(f"Error evaluating answers: {e}")
         raise HTTPException(status_code=500, detail=f"Error evaluating answers: {str(e)}")
+    logger.info("Answers evaluated successfully.")
+    return await complete_evaluation(session_id, ordered_evaluations(state), idempotency_key)
 
-# --- API Endpoints ---
+def submission_input(session: Hirebot, qa: Dict[str, str], regrade: bool) -> Dict:
+    """Graph input for submitted answers, pinned to the questions the candidate was shown."""
+    from app.engine import answers_input
+    # The session's questions are what was served (first writer wins), whichever run produced them
+    return answers_input(qa, regrade, tech_questions=session["tech_questions"])
 
-@app.get("/")
-async def root():
-    return {"message": "Welcome to Hirebot API", "status": "active"}
+async def ingest_batch_resume(filename: str, content: bytes, text: str) -> str:
+    """Batch pipeline stage: parse one extracted resume and open a session for it."""
+    from app.engine import resume_input
+    session_id = str(uuid.uuid4())
+    cache_key = resume_cache_key(content)
+    parsed_resume = await resume_cache.aget(cache_key)
+    # Questions wait until the candidate's session asks for them
+    values = resume_input(
+        resume_text=text if parsed_resume is None else None, resume_parsed=parsed_resume, defer_questions=True
+    )
+    state = await engine.run(session_id, values, priority=Priority.BATCH)
+    if parsed_resume is None:
+        parsed_resume = state["resume_parsed"]
+        await resume_cache.aset(cache_key, parsed_resume)
+    
+    resume_path = None
+    if PERSIST_UPLOADS:
+        file_path = UPLOAD_DIR / f"{session_id}_{Path(filename).name}"
+        await asyncio.to_thread(store_upload, file_path, content)
+        resume_path = str(file_path)
+    
+    user_name = parsed_resume.get("full_name") or Path(filename).stem
+    session = new_session(session_id, user_name)
+    session.update(resume_path=resume_path, resume_parsed=parsed_resume, current_step="tech_questions")
+    await sessions.acreate(session)
+    return session_id
 
-@app.post("/sessions/start", response_model=SessionStartResponse)
-async def start_session(request: SessionStartRequest):
-    """Start a new hiring session."""
+async def commit_tech_questions(session_id: str, questions: Dict[str, str]) -> Dict[str, str]:
+    """Store questions (first writer wins) and advance a session that was waiting on them."""
+    def apply(current: Hirebot) -> Dict:
+        changes = {}
+        if not current["tech_questions"]:
+            changes["tech_questions"] = questions
+        if current["current_step"] == "tech_questions":
+            changes["current_step"] = "answering_questions"
+        return changes
+    
+    session = await sessions.amutate(session_id, apply)
+    return session["tech_questions"] if session else questions
+
+def track_question_task(session_id: str, coroutine) -> asyncio.Task:
+    """Run background question generation for a session, replacing any previous one."""
+    previous = question_tasks.pop(session_id, None)
+    if previous is not None:
+        previous.cancel()
+    
+    async def leased():
+        # Lets other worker processes wait for the result instead of generating their own
+        await sessions.aupdate(session_id, questions_pending_until=time.time() + QUESTION_LEASE)
+        try:
+            return await coroutine
+        finally:
+            # Released unless superseded or forgotten (cancelled and no longer tracked)
+            if question_tasks.get(session_id) is task:
+                await sessions.aupdate(session_id, questions_pending_until=None)
+    
+    task = asyncio.create_task(leased())
+    question_tasks[session_id] = task
+    
+    def _done(finished: asyncio.Task) -> None:
+        coroutine.close()  # never started if the task was cancelled before its first step
+        if question_tasks.get(session_id) is finished:
+            del question_tasks[session_id]
+        if not finished.cancelled() and finished.exception() is not None:
+            logger.warning(f"Question pre-generation failed for {session_id}: {finished.exception()}")
+    
+    task.add_done_callback(_done)
+    return task
+
+async def resolve_tech_questions(session_id: str, resume_parsed: Dict) -> Dict[str, str]:
+    """Pre-generated questions if there are any, otherwise generate them now; then store them."""
+    from app.engine import questions_input
+    questions = await pregenerated_questions(session_id)
+    if not questions:
+        # Re-enter the graph: resumes an interrupted branch or runs the missing (or deferred) one
+        questions = (await engine.run(session_id, questions_input(resume_parsed))).get("tech_questions")
+    if not questions:
+        raise RuntimeError("graph engine finished without tech questions")
+    return await commit_tech_questions(session_id, questions)
+
+async def run_engine_resume(session_id: str, resume_text: Optional[str] = None,
+                            resume_parsed: Optional[Dict] = None) -> Dict:
+    """
+    Advance the session's thread with a new resume and return the parsed resume
+    as soon as it is available. Question pre-generation (unless turned off) and
+    the profile branch finish in the background; fused parsing brings the
+    questions along with the parse.
+    """
+    from app.engine import resume_input
+    parsed = asyncio.get_running_loop().create_future()
+    if resume_parsed is not None:
+        parsed.set_result(resume_parsed)
+    values = resume_input(resume_text, resume_parsed, defer_questions=not PREGENERATE_QUESTIONS)
+    
+    async def drive() -> Optional[Dict[str, str]]:
+        questions = None
+        # A new resume supersedes whatever the thread was doing for the previous one
+        async for node, update in engine.advance(session_id, values, resume=False):
+            if node == "parse_resume" and not parsed.done():
+                parsed.set_result(update["resume_parsed"])
+            if update.get("tech_questions"):
+                questions = update["tech_questions"]
+                await sessions.amutate(
+                    session_id,
+                    lambda current: None if current["tech_questions"] else {"tech_questions": questions}
+                )
+                logger.info(f"Tech questions pre-generated for session: {session_id}")
+        return questions
+    
+    task = track_question_task(session_id, drive())
+    await asyncio.wait({parsed, task}, return_when=asyncio.FIRST_COMPLETED)
+    if parsed.done():
+        return parsed.result()
+    task.result()  # re-raises the parse failure
+    raise RuntimeError("graph engine finished without parsing the resume")
+
+@asynccontextmanager
+async def engine_lifetime():
+    """Open the graph engine for the block, wired to the cache-aware stages."""
+    global engine
+    from app.engine import EngineSteps, open_engine
+    steps = EngineSteps(
+        greet=generate_greeting,
+        parse=parse_resume_text_async,
+        questions=generate_tech_questions_async,
+        evaluate=evaluate_question_async,
+        parse_with_questions=parse_resume_with_questions_async if FUSED_PARSE else None,
+    )
+    async with open_engine(steps, ENGINE_DB) as opened:
+        engine = opened
+        try:
+            yield
+        finally:
+            engine = None
+
+async def pregenerated_questions(session_id: str) -> Optional[Dict[str, str]]:
+    """Await in-flight pre-generation; None if nothing was pre-generated or it failed."""
+    task = question_tasks.get(session_id)
+    if task is None:
+        # The task may have finished since the caller read the session, or run in another worker
+        return await questions_from_store(session_id)
     try:
-        session_id = str(uuid.uuid4())
-        greeting = generate_greeting(request.user_name)
-        
-        sessions[session_id] = {
-            "session_id": session_id,
-            "user_name": request.user_name,
-            "resume_path": None,
-            "resume_parsed": None,
-            "tech_questions": None,
-            "answers": None,
-            "results": None,
-            "current_step": "resume_upload",
-            "created_at": datetime.now().isoformat()
-        }
-        
-        logger.info(f"Session started for user: {request.user_name}, session_id: {session_id}")
-        
-        return SessionStartResponse(
-            session_id=session_id,
-            greeting=greeting,
-            message="Session started successfully. Please upload your resume next."
-        )
-    except Exception as e:
-        logger.error(f"Error starting session: {e}")
-        raise HTTPException(status_code=500, detail=f"Error starting session: {str(e)}")
+        # Shield so a disconnecting client does not cancel the shared task
+        return await asyncio.shield(task)
+    except asyncio.CancelledError:
+        if not task.cancelled():
+            raise
+        return None
+    except Exception:
+        return None
 
-@app.post("/sessions/{session_id}/upload-resume", response_model=ResumeUploadResponse)
-async def upload_resume(session_id: str, file: UploadFile = File(...)):
-    """Upload and parse resume for a session."""
-    if session_id not in sessions:
+async def questions_from_store(session_id: str) -> Optional[Dict[str, str]]:
+    """Stored questions, polling for them while another process holds the session's generation lease."""
+    delay = QUESTION_POLL_INTERVAL
+    while True:
+        session = await sessions.aget(session_id)
+        if session is None:
+            return None
+        pending = session.get("questions_pending_until")
+        if session["tech_questions"] or not pending or pending < time.time():
+            return session["tech_questions"]
+        # Back off, but look again as soon as the lease runs out
+        await asyncio.sleep(min(delay, max(0.0, pending - time.time())))
+        delay = min(delay * 2, QUESTION_POLL_MAX_INTERVAL)
+
+# --- Request handlers (shared by the endpoints and job workers) ---
+async def receive_resume(session_id: str, file: UploadFile) -> bytearray:
+    """Validate a resume upload and read it into memory."""
+    if not await sessions.acontains(session_id):
         raise HTTPException(status_code=404, detail="Session not found")
     
     if not file.filename.lower().endswith('.pdf'):
         raise HTTPException(status_code=400, detail="Only PDF files are allowed")
     
+    # Read in chunks with a hard size cap
+    content = await read_upload(file, MAX_RESUME_BYTES)
+    metrics.upload_bytes.observe(len(content), kind="resume")
+    return content
+
+async def handle_resume_upload(session_id: str, filename: str, content: bytes) -> ResumeUploadResponse:
+    """Persist an uploaded resume and run it through the graph (parse now, questions in the background)."""
+    # Re-checked: a queued upload may outlive its session
+    if not await sessions.acontains(session_id):
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    persist = None
     try:
-        # Save uploaded file
-        file_path = UPLOAD_DIR / f"{session_id}_{file.filename}"
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
+        # Save uploaded file off the event loop, overlapping with parsing
+        resume_path = None
+        if PERSIST_UPLOADS:
+            file_path = UPLOAD_DIR / f"{session_id}_{Path(filename).name}"
+            resume_path = str(file_path)
+            persist = asyncio.create_task(asyncio.to_thread(store_upload, file_path, content))
         
-        # Parse resume
-        parsed_resume = await parse_resume_async(str(file_path))
+        # Parse resume from memory (re-uploads of the same PDF are served from cache)
+        cache_key = resume_cache_key(content)
+        parsed_resume = await resume_cache.aget(cache_key)
+        if parsed_resume is None:
+            data = await asyncio.to_thread(resume_loader, content)
+            parsed_resume = await run_engine_resume(session_id, resume_text=data)
+            await resume_cache.aset(cache_key, parsed_resume)
+        else:
+            logger.info(f"Resume parse cache hit for session: {session_id}")
+            await run_engine_resume(session_id, resume_parsed=parsed_resume)
+        
+        if persist is not None:
+            await persist
         
         # Update session
-        sessions[session_id]["resume_path"] = str(file_path)
-        sessions[session_id]["resume_parsed"] = parsed_resume
-        sessions[session_id]["current_step"] = "tech_questions"
+        await sessions.aupdate(
+            session_id, resume_path=resume_path, resume_parsed=parsed_resume, current_step="tech_questions"
+        )
         
         logger.info(f"Resume uploaded and parsed for session: {session_id}")
         
@@ -260,85 +769,415 @@ async def upload_resume(session_id: str, file: UploadFile = File(...)):
     except Exception as e:
         logger.error(f"Error uploading resume: {e}")
         raise HTTPException(status_code=500, detail=f"Error processing resume: {str(e)}")
+    finally:
+        if persist is not None and not persist.done():
+            persist.cancel()
 
-@app.get("/sessions/{session_id}/tech-questions", response_model=TechQuestionsResponse)
-async def get_tech_questions(session_id: str):
-    """Generate and return technical questions for a session."""
-    if session_id not in sessions:
+async def handle_tech_questions(session_id: str) -> TechQuestionsResponse:
+    """Stored or pre-generated questions for a session, generating them (once) if needed."""
+    session = await sessions.aget(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    session = sessions[session_id]
     if not session["resume_parsed"]:
         raise HTTPException(status_code=400, detail="Resume must be uploaded first")
     
     try:
-        # Generate questions if not already generated
-        if not session["tech_questions"]:
-            questions = await generate_tech_questions_async(session["resume_parsed"])
-            sessions[session_id]["tech_questions"] = questions
-            sessions[session_id]["current_step"] = "answering_questions"
+        # Use stored or pre-generated questions, or generate them now (once per session)
+        if session["tech_questions"]:
+            questions = await commit_tech_questions(session_id, session["tech_questions"])
+        else:
+            questions = await question_flights.do(
+                session_id, lambda: resolve_tech_questions(session_id, session["resume_parsed"])
+            )
         
         return TechQuestionsResponse(
             session_id=session_id,
-            questions=sessions[session_id]["tech_questions"]
+            questions=questions
         )
     except Exception as e:
         logger.error(f"Error generating tech questions: {e}")
         raise HTTPException(status_code=500, detail=f"Error generating questions: {str(e)}")
 
-@app.post("/sessions/{session_id}/submit-answers", response_model=EvaluationResponse)
-async def submit_answers(session_id: str, request: AnswerSubmissionRequest):
-    """Submit answers and get evaluation."""
-    if session_id not in sessions:
+async def handle_submit_answers(session_id: str, request: AnswerSubmissionRequest,
+                                idempotency_key: Optional[str] = None) -> EvaluationResponse:
+    """Evaluate submitted answers and complete the session."""
+    session = await sessions.aget(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    session = sessions[session_id]
     if not session["tech_questions"]:
         raise HTTPException(status_code=400, detail="Technical questions not generated yet")
     
+    qa = match_answers(session["tech_questions"], request.answers)
+    evaluation = None if request.regrade else stored_submission(session, idempotency_key, qa)
     try:
-        # source_dict = {'a': 'value1', 'b': 'value2', 'c': 'value3'}
-        request.answers = {value: None for value in session['tech_questions'].values()} # Assign None or any desired default value
-
-        sessions[session_id]["answers"] = request.answers
-        sessions[session_id]["current_step"] = "evaluation"
-        
-        # Evaluate answers
-        evaluation = await evaluate_answers_async(request.answers)
-        sessions[session_id]["results"] = evaluation
-        sessions[session_id]["current_step"] = "completed"
-        
-        user_name = session["user_name"]
-        completion_message = f"""
-Thank you for completing the initial steps of the hiring process, {user_name}. 🙌
-Our team will carefully evaluate your responses and resume.
-You will be notified via email or message if you are selected for the next round.
-We appreciate your patience and interest in this opportunity!
-        """
-        
-        logger.info(f"Session completed for: {session_id}")
+        if evaluation is None:
+            # Evaluate answers (concurrent duplicates await the same evaluation)
+            evaluation = await submission_flights.do(
+                submission_flight_key(session_id, qa, idempotency_key, request.regrade),
+                lambda: evaluate_submission(session_id, qa, idempotency_key, request.regrade)
+            )
+        else:
+            logger.info(f"Idempotent replay of submission for session: {session_id}")
         
         return EvaluationResponse(
             session_id=session_id,
             evaluation=evaluation,
-            completion_message=completion_message.strip()
+            completion_message=completion_message_for(session["user_name"])
         )
     except Exception as e:
         logger.error(f"Error evaluating answers: {e}")
         raise HTTPException(status_code=500, detail=f"Error processing answers: {str(e)}")
 
+async def run_upload_job(job: Dict) -> Dict:
+    response = await handle_resume_upload(job["session_id"], job["payload"]["filename"], job["data"])
+    return response.model_dump()
+
+async def run_tech_questions_job(job: Dict) -> Dict:
+    response = await handle_tech_questions(job["session_id"])
+    return response.model_dump()
+
+async def run_submit_answers_job(job: Dict) -> Dict:
+    payload = job["payload"]
+    request = AnswerSubmissionRequest(**payload["request"])
+    response = await handle_submit_answers(job["session_id"], request, payload.get("idempotency_key"))
+    return response.model_dump()
+
+job_handlers = {
+    "upload_resume": run_upload_job,
+    "tech_questions": run_tech_questions_job,
+    "submit_answers": run_submit_answers_job,
+}
+job_worker = JobWorker(job_queue, job_handlers, concurrency=JOB_CONCURRENCY,
+                       poll_interval=JOB_POLL_INTERVAL, retention=JOB_RETENTION)
+
+async def enqueue_job(kind: str, session_id: str, payload: Dict, data: Optional[bytes] = None) -> JobStatus:
+    """Queue LLM-bound work for a worker and describe the accepted job."""
+    # Off the event loop: the insert carries the upload and may wait on the database lock
+    job = await asyncio.to_thread(job_queue.enqueue, kind, payload, session_id=session_id, data=data)
+    job_worker.notify()
+    logger.info(f"Job {job['job_id']} ({kind}) queued for session: {session_id}")
+    return JobStatus(**job)
+
+def sync_leaderboard(since: Optional[float] = None) -> float:
+    """
+    Re-sync the score index from the session store: in full if `since` is None,
+    otherwise only sessions updated after it. Blocking (store scan and JSON
+    decoding), so run it in a thread. Returns the cursor for the next sync.
+    """
+    started = time.time()
+    if since is None:
+        indexed = leaderboard.rebuild(sessions.list())
+        logger.info(f"Leaderboard rebuilt with {indexed} scored sessions")
+    else:
+        leaderboard.sync(sessions.list_updated_since(since))
+    return started - LEADERBOARD_SYNC_OVERLAP
+
+async def refresh_leaderboard_forever(cursor: float, interval: float, full_interval: float) -> None:
+    """Periodically re-sync the score index with sessions scored or deleted by other processes."""
+    last_full = time.monotonic()
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            full = time.monotonic() - last_full >= full_interval
+            cursor = await asyncio.to_thread(sync_leaderboard, None if full else cursor)
+            if full:
+                last_full = time.monotonic()
+        except Exception as e:
+            logger.error(f"Leaderboard refresh failed: {e}")
+
+@asynccontextmanager
+async def leaderboard_refresh():
+    """Load the score index, then keep re-syncing it for the block if other processes can change scores."""
+    cursor = await asyncio.to_thread(sync_leaderboard)
+    task = None
+    if not JOB_INLINE or not isinstance(sessions, InMemorySessionStore):
+        task = asyncio.create_task(
+            refresh_leaderboard_forever(cursor, LEADERBOARD_REFRESH, LEADERBOARD_FULL_REFRESH)
+        )
+    try:
+        yield
+    finally:
+        # The loop never ends on its own; without this, shutdown waits on it forever
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+batch_ingestor = BatchIngestor(
+    ingest_batch_resume,
+    process_workers=int(os.getenv("HIREBOT_BATCH_PROCESS_WORKERS", "0")),
+    concurrency=int(os.getenv("HIREBOT_BATCH_LLM_CONCURRENCY", "8")),
+    retention=float(os.getenv("HIREBOT_BATCH_RETENTION", str(24 * 60 * 60))),
+    # Progress shared with the other API workers through the job database
+    store=BatchJobStore(job_queue.db_path),
+)
+
+# --- API Endpoints ---
+
+@app.get("/")
+async def root():
+    return {"message": "Welcome to Hirebot API", "status": "active"}
+
+@app.post("/sessions/start", response_model=SessionStartResponse)
+async def start_session(request: SessionStartRequest):
+    """Start a new hiring session."""
+    try:
+        from app.engine import start_input
+        session_id = str(uuid.uuid4())
+        greeting = (await engine.run(session_id, start_input(request.user_name)))["greeting"]
+        
+        await sessions.acreate(new_session(session_id, request.user_name))
+        
+        logger.info(f"Session started for user: {request.user_name}, session_id: {session_id}")
+        
+        return SessionStartResponse(
+            session_id=session_id,
+            greeting=greeting,
+            message="Session started successfully. Please upload your resume next."
+        )
+    except Exception as e:
+        logger.error(f"Error starting session: {e}")
+        raise HTTPException(status_code=500, detail=f"Error starting session: {str(e)}")
+
+@app.post("/sessions/{session_id}/upload-resume", response_model=ResumeUploadResponse)
+async def upload_resume(session_id: str, file: UploadFile = File(...)):
+    """Upload and parse resume for a session."""
+    content = await receive_resume(session_id, file)
+    return await handle_resume_upload(session_id, file.filename, content)
+
+@app.get("/sessions/{session_id}/tech-questions", response_model=TechQuestionsResponse)
+async def get_tech_questions(session_id: str):
+    """Generate and return technical questions for a session."""
+    return await handle_tech_questions(session_id)
+
+@app.get("/sessions/{session_id}/tech-questions/stream")
+async def stream_tech_questions(session_id: str):
+    """Generate technical questions, streaming model tokens as server-sent events."""
+    session = await sessions.aget(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    if not session["resume_parsed"]:
+        raise HTTPException(status_code=400, detail="Resume must be uploaded first")
+    
+    async def event_stream():
+        from app.engine import TOKEN_EVENT, questions_input
+        try:
+            questions = session["tech_questions"] or await pregenerated_questions(session_id)
+            if not questions and question_flights.running(session_id):
+                # Another request is already generating them; wait for its result
+                questions = await question_flights.do(
+                    session_id, lambda: resolve_tech_questions(session_id, session["resume_parsed"])
+                )
+            if not questions:
+                with question_flights.lead(session_id) as flight:
+                    # Same graph step as the non-streaming endpoint; a question bank hit streams no tokens
+                    values = questions_input(session["resume_parsed"])
+                    async for node, update in engine.advance(session_id, values, stream_tokens=True):
+                        if node == TOKEN_EVENT:
+                            yield sse_event("token", {"text": update["text"]})
+                        elif update.get("tech_questions"):
+                            questions = update["tech_questions"]
+                    questions = questions or (await engine.state(session_id)).get("tech_questions")
+                    if not questions:
+                        raise RuntimeError("graph engine finished without tech questions")
+                    questions = await commit_tech_questions(session_id, questions)
+                    flight.set_result(questions)
+            questions = await commit_tech_questions(session_id, questions)
+            
+            response = TechQuestionsResponse(
+                session_id=session_id,
+                questions=questions
+            )
+            yield sse_event("done", response.model_dump())
+        except Exception as e:
+            logger.error(f"Error streaming tech questions: {e}")
+            yield sse_event("error", {"detail": f"Error generating questions: {str(e)}"})
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+@app.post("/sessions/{session_id}/submit-answers", response_model=EvaluationResponse)
+async def submit_answers(session_id: str, request: AnswerSubmissionRequest,
+                         idempotency_key: Optional[str] = Header(None)):
+    """Submit answers and get evaluation (replays of the same Idempotency-Key return the stored result)."""
+    return await handle_submit_answers(session_id, request, idempotency_key)
+
+@app.post("/sessions/{session_id}/submit-answers/stream")
+async def stream_submit_answers(session_id: str, request: AnswerSubmissionRequest,
+                                idempotency_key: Optional[str] = Header(None)):
+    """
+    Submit answers and stream the evaluation as server-sent events: "token"
+    events carry the evaluator's output in question order ({"text", "question"}),
+    then "done" the stored report.
+    """
+    session = await sessions.aget(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    if not session["tech_questions"]:
+        raise HTTPException(status_code=400, detail="Technical questions not generated yet")
+    
+    qa = match_answers(session["tech_questions"], request.answers)
+    stored = None if request.regrade else stored_submission(session, idempotency_key, qa)
+    flight_key = submission_flight_key(session_id, qa, idempotency_key, request.regrade)
+    
+    def done_event(evaluation: str) -> str:
+        response = EvaluationResponse(
+            session_id=session_id,
+            evaluation=evaluation,
+            completion_message=completion_message_for(session["user_name"])
+        )
+        return sse_event("done", response.model_dump())
+    
+    async def event_stream():
+        if stored is not None or submission_flights.running(flight_key):
+            # Replayed or duplicate submission: no per-question tokens, just the shared result
+            try:
+                evaluation = stored or await submission_flights.do(
+                    flight_key, lambda: evaluate_submission(session_id, qa, idempotency_key, request.regrade)
+                )
+                yield done_event(evaluation)
+            except Exception as e:
+                logger.error(f"Error streaming evaluation: {e}")
+                yield sse_event("error", {"detail": f"Error processing answers: {str(e)}"})
+            return
+        
+        from app.engine import TOKEN_EVENT, ordered_evaluations
+        try:
+            with submission_flights.lead(flight_key) as flight:
+                # Same session bookkeeping and graph step as submit_answers
+                current = await sessions.aupdate(session_id, answers=qa, current_step="evaluation")
+                # Questions are graded concurrently; their tokens are relayed one question at a time
+                report = OrderedEvaluationStream(list(qa))
+                values = submission_input(current, qa, request.regrade)
+                async for node, update in engine.advance(session_id, values, resume=False, stream_tokens=True):
+                    if node == TOKEN_EVENT:
+                        chunks = report.token(update["question"], update["text"])
+                    elif node == "evaluate_answer":
+                        chunks = [
+                            chunk for question, result in update["evaluations"].items()
+                            for chunk in report.finish(question, QuestionEvaluation(**result))
+                        ]
+                    else:
+                        continue
+                    for index, text in chunks:
+                        yield sse_event("token", {"text": text, "question": index + 1})
+                
+                state = await engine.state(session_id)
+                evaluation = await complete_evaluation(session_id, ordered_evaluations(state), idempotency_key)
+                flight.set_result(evaluation)
+            yield done_event(evaluation)
+        except Exception as e:
+            logger.error(f"Error streaming evaluation: {e}")
+            yield sse_event("error", {"detail": f"Error processing answers: {str(e)}"})
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+@app.post("/sessions/{session_id}/jobs/upload-resume", response_model=JobStatus,
+          status_code=status.HTTP_202_ACCEPTED)
+async def queue_upload_resume(session_id: str, file: UploadFile = File(...)):
+    """Accept a resume and parse it in the background; poll GET /jobs/{job_id} for the result."""
+    content = await receive_resume(session_id, file)
+    return await enqueue_job("upload_resume", session_id, {"filename": Path(file.filename).name}, data=content)
+
+@app.post("/sessions/{session_id}/jobs/tech-questions", response_model=JobStatus,
+          status_code=status.HTTP_202_ACCEPTED)
+async def queue_tech_questions(session_id: str):
+    """Generate technical questions in the background."""
+    if not await sessions.acontains(session_id):
+        raise HTTPException(status_code=404, detail="Session not found")
+    return await enqueue_job("tech_questions", session_id, {})
+
+@app.post("/sessions/{session_id}/jobs/submit-answers", response_model=JobStatus,
+          status_code=status.HTTP_202_ACCEPTED)
+async def queue_submit_answers(session_id: str, request: AnswerSubmissionRequest,
+                               idempotency_key: Optional[str] = Header(None)):
+    """Evaluate answers in the background."""
+    if not await sessions.acontains(session_id):
+        raise HTTPException(status_code=404, detail="Session not found")
+    payload = {"request": request.model_dump(), "idempotency_key": idempotency_key}
+    return await enqueue_job("submit_answers", session_id, payload)
+
+@app.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str):
+    """Status of a queued job, with its result (the synchronous endpoint's response) once it succeeded."""
+    job = await asyncio.to_thread(job_queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JobStatus(**job)
+
+@app.post("/batches/resumes", response_model=BatchJobStatus, status_code=status.HTTP_202_ACCEPTED)
+async def upload_resume_batch(files: List[UploadFile] = File(...)):
+    """Bulk-ingest resumes (PDFs and/or zip archives of PDFs), one session per resume."""
+    resumes = []
+    received = expanded = 0
+    for file in files:
+        name = file.filename or ""
+        is_zip = name.lower().endswith(".zip")
+        if not is_zip and not name.lower().endswith(".pdf"):
+            raise HTTPException(status_code=400, detail=f"Only PDF or zip files are allowed: {name}")
+        
+        # Every part counts against the batch cap; a plain PDF also against the per-resume cap
+        remaining = BATCH_MAX_BYTES - received
+        content = await read_upload(file, remaining if is_zip else min(MAX_RESUME_BYTES, remaining))
+        received += len(content)
+        if is_zip:
+            try:
+                members = await asyncio.to_thread(
+                    pdfs_from_zip, content, BATCH_MAX_FILES - len(resumes), MAX_RESUME_BYTES,
+                    BATCH_MAX_BYTES - expanded
+                )
+            except BatchLimitError as e:
+                raise HTTPException(status_code=413, detail=str(e))
+            except Exception as e:
+                raise HTTPException(status_code=400, detail=f"Invalid zip archive {name}: {str(e)}")
+            resumes.extend(members)
+            expanded += sum(len(member) for _, member in members)
+        else:
+            resumes.append((name, content))
+            expanded += len(content)
+        if len(resumes) > BATCH_MAX_FILES:
+            raise HTTPException(status_code=413, detail=f"At most {BATCH_MAX_FILES} resumes per batch")
+    
+    if not resumes:
+        raise HTTPException(status_code=400, detail="No PDF resumes found in upload")
+    
+    job = await batch_ingestor.submit(resumes)
+    logger.info(f"Batch {job.job_id} accepted with {job.total} resumes")
+    return BatchJobStatus(**job.to_dict())
+
+@app.get("/batches/{job_id}", response_model=BatchJobStatus)
+async def get_batch_status(job_id: str):
+    """Progress and throughput of a bulk ingestion job."""
+    job = await asyncio.to_thread(batch_ingestor.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+    return BatchJobStatus(**job)
+
+@app.get("/leaderboard", response_model=List[LeaderboardEntryResponse])
+async def get_leaderboard(top: int = 10, step: Optional[str] = None):
+    """Top candidates by total evaluation score, optionally filtered by current step."""
+    if not 1 <= top <= LEADERBOARD_MAX_TOP:
+        raise HTTPException(status_code=400, detail=f"top must be between 1 and {LEADERBOARD_MAX_TOP}")
+    return [
+        LeaderboardEntryResponse(rank=rank, **entry._asdict())
+        for rank, entry in enumerate(leaderboard.top(top, step), 1)
+    ]
+
 @app.get("/sessions/{session_id}/status", response_model=SessionStatus)
 async def get_session_status(session_id: str):
     """Get the current status of a session."""
-    if session_id not in sessions:
+    session = await sessions.aget(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    session = sessions[session_id]
     return SessionStatus(
         session_id=session_id,
         status="active" if session["current_step"] != "completed" else "completed",
         current_step=session["current_step"],
-        user_name=session["user_name"]
+        user_name=session["user_name"],
+        token_usage=chains.tokens.session(session_id)
     )
 
 @app.get("/sessions", response_model=List[SessionStatus])
@@ -346,43 +1185,72 @@ async def list_sessions():
     """List all sessions (for admin purposes)."""
     return [
         SessionStatus(
-            session_id=session_id,
+            session_id=session["session_id"],
             status="active" if session["current_step"] != "completed" else "completed",
             current_step=session["current_step"],
             user_name=session["user_name"]
         )
-        for session_id, session in sessions.items()
+        for session in await sessions.alist()
     ]
 
 @app.delete("/sessions/{session_id}")
 async def delete_session(session_id: str):
     """Delete a session and its associated files."""
-    if session_id not in sessions:
+    if not await sessions.acontains(session_id):
         raise HTTPException(status_code=404, detail="Session not found")
     
     try:
-        session = sessions[session_id]
+        # Remove session from the store, its background work and the indexes derived from it
+        session = await sessions.adelete(session_id)
+        forget_session(session_id)
         
         # Delete uploaded file if exists
-        if session["resume_path"] and os.path.exists(session["resume_path"]):
+        if session and session["resume_path"] and os.path.exists(session["resume_path"]):
             os.remove(session["resume_path"])
         
-        # Remove session from memory
-        del sessions[session_id]
-        
         logger.info(f"Session deleted: {session_id}")
         return {"message": "Session deleted successfully"}
     except Exception as e:
         logger.error(f"Error deleting session: {e}")
         raise HTTPException(status_code=500, detail=f"Error deleting session: {str(e)}")
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus text exposition of in-process metrics."""
+    body = await asyncio.to_thread(metrics.registry.render)
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
+    # The supervisor gates on this endpoint; database reads must not hold up the event loop
+    active_sessions, resume_cache_stats, evaluation_cache_stats, job_stats = await asyncio.gather(
+        sessions.acount(),
+        asyncio.to_thread(resume_cache.stats),
+        asyncio.to_thread(evaluation_cache.stats),
+        asyncio.to_thread(job_queue.stats),
+    )
     return {
         "status": "healthy",
+        "llm_ready": chains.built,
         "timestamp": datetime.now().isoformat(),
-        "active_sessions": len(sessions)
+        "active_sessions": active_sessions,
+        "resume_cache": resume_cache_stats,
+        "evaluation_cache": {
+            **evaluation_cache_stats,
+            "bypassed": int(metrics.evaluation_cache_total.value(outcome="bypass")),
+            "tokens_saved": int(metrics.evaluation_cache_tokens_saved_total.value()),
+        },
+        "janitor": janitor.stats(),
+        "stages": chains.stats(),
+        "question_bank": question_bank.stats(),
+        "leaderboard": leaderboard.stats(),
+        "single_flight": {
+            flight.name: flight.stats() for flight in (question_flights, submission_flights)
+        },
+        "llm_scheduler": llm.scheduler.stats(),
+        "jobs": {**job_stats, "inline_worker": job_worker.stats() if JOB_INLINE else None},
+        "graph_engine": engine.stats() if engine is not None else None
     }
 
 if __name__ == "__main__":
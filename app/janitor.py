@@ -0,0 +1,217 @@
+import os
+import time
+import asyncio
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from app.session_store import SessionStore
+
+logger = logging.getLogger(__name__)
+
+# Idle time (seconds) after which a session in a given step is expired
+DEFAULT_STEP_TTLS: Dict[str, float] = {
+    "resume_upload": 60 * 60,
+    "tech_questions": 2 * 60 * 60,
+    "answering_questions": 2 * 60 * 60,
+    "evaluation": 60 * 60,
+    "completed": 7 * 24 * 60 * 60,
+}
+
+
+def parse_step_ttls(spec: str) -> Dict[str, float]:
+    """Parse 'resume_upload=3600,completed=604800' into a TTL-per-step mapping."""
+    ttls = dict(DEFAULT_STEP_TTLS)
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        step, _, seconds = item.partition("=")
+        ttls[step.strip()] = float(seconds)
+    return ttls
+
+
+def _directory_size(directory: Path) -> int:
+    if not directory.is_dir():
+        return 0  # created by the first stored upload
+    return sum(f.stat().st_size for f in directory.iterdir() if f.is_file())
+
+
+def _unlink(path: str) -> bool:
+    try:
+        os.remove(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+class SessionJanitor:
+    """
+    Background sweeper that expires idle sessions and their uploaded PDFs.
+
+    A session expires once it has been idle longer than the TTL of its
+    `current_step`. If the store holds more than `max_sessions` unscored
+    sessions, or the upload directory grows past `max_upload_bytes`, the least
+    recently active sessions are evicted early until usage drops below the
+    low-water mark. Scored sessions are never evicted early, only their upload
+    is removed under disk pressure; they stay on the leaderboard until their
+    `completed` TTL runs out.
+    Deletions happen in batches off the event loop and only remove a session
+    that is still as idle as when it was selected; `on_delete` is called (on
+    the loop) with each removed session id so derived indexes can drop it too.
+    """
+
+    def __init__(self, store: SessionStore, upload_dir: Path,
+                 step_ttls: Optional[Dict[str, float]] = None,
+                 default_ttl: float = 24 * 60 * 60,
+                 interval: float = 60.0,
+                 batch_size: int = 100,
+                 max_sessions: int = 10_000,
+                 max_upload_bytes: int = 1024 * 1024 * 1024,
+                 low_water_ratio: float = 0.9,
+                 on_delete: Optional[Callable[[str], None]] = None):
+        self.store = store
+        self.upload_dir = upload_dir
+        self.step_ttls = step_ttls or dict(DEFAULT_STEP_TTLS)
+        self.default_ttl = default_ttl
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_sessions = max_sessions
+        self.max_upload_bytes = max_upload_bytes
+        self.low_water_ratio = low_water_ratio
+        self.on_delete = on_delete
+
+        self.runs = 0
+        self.errors = 0
+        self.last_run_at: Optional[str] = None
+        self.last_run_ms = 0.0
+        self.expired_total = 0
+        self.evicted_memory_total = 0
+        self.evicted_disk_total = 0
+        self.files_unlinked_total = 0
+        self.orphans_removed_total = 0
+        self.skipped_active_total = 0
+        self.uploads_trimmed_total = 0
+
+    def ttl_for(self, step: str) -> float:
+        return self.step_ttls.get(step, self.default_ttl)
+
+    def _select(self, idle: List[tuple], upload_bytes: int, now: float) -> Dict[str, str]:
+        """Pick sessions to remove; returns {session_id: reason}."""
+        selected: Dict[str, str] = {}
+        for last_activity, session in idle:
+            if now - last_activity > self.ttl_for(session.get("current_step", "")):
+                selected[session["session_id"]] = "expired"
+
+        # Memory high-water mark: evict least recently active sessions. Scored sessions
+        # back the leaderboard, so they neither count towards nor fall to this limit
+        evictable = [session["session_id"] for _, session in idle
+                     if not session.get("scores") and session["session_id"] not in selected]
+        if len(evictable) > self.max_sessions:
+            target = int(self.max_sessions * self.low_water_ratio)
+            for session_id in evictable[:len(evictable) - target]:
+                selected[session_id] = "memory"
+
+        # Disk high-water mark: evict sessions holding uploads, oldest first (scored ones only lose the upload)
+        if upload_bytes > self.max_upload_bytes:
+            target = int(self.max_upload_bytes * self.low_water_ratio)
+            for _, session in idle:
+                if upload_bytes <= target:
+                    break
+                path = session.get("resume_path")
+                if not path or not os.path.exists(path):
+                    continue
+                if session["session_id"] not in selected:
+                    selected[session["session_id"]] = "upload" if session.get("scores") else "disk"
+                upload_bytes -= os.path.getsize(path)
+        return selected
+
+    def _delete_batch(self, batch: List[str], activity: Dict[str, float]) -> Tuple[List[str], int]:
+        """Delete the sessions of one batch not touched since selection; returns (removed ids, files unlinked)."""
+        removed = []
+        unlinked = 0
+        for session_id in batch:
+            session = self.store.delete_if_idle(session_id, activity[session_id])
+            if session is None:
+                continue
+            removed.append(session_id)
+            if session.get("resume_path"):
+                unlinked += _unlink(session["resume_path"])
+        return removed, unlinked
+
+    def _remove_orphans(self, live_ids: Set[str], now: float) -> int:
+        """Unlink uploads whose session no longer exists (e.g. failed uploads)."""
+        removed = 0
+        if not self.upload_dir.is_dir():
+            return removed
+        for path in self.upload_dir.iterdir():
+            session_id = path.name.split("_", 1)[0]
+            if session_id in live_ids or now - path.stat().st_mtime < self.default_ttl:
+                continue
+            if _unlink(str(path)):
+                removed += 1
+        return removed
+
+    async def sweep(self) -> int:
+        """Run one expiry pass; returns the number of sessions removed."""
+        start = time.perf_counter()
+        now = time.time()
+        idle = await asyncio.to_thread(self.store.list_idle)
+        upload_bytes = await asyncio.to_thread(_directory_size, self.upload_dir)
+        selected = await asyncio.to_thread(self._select, idle, upload_bytes, now)
+
+        # Selection worked on a snapshot; a session updated since then is kept
+        activity = {session["session_id"]: last_activity for last_activity, session in idle}
+        ids = [session_id for session_id, reason in selected.items() if reason != "upload"]
+        trimmed = [session["resume_path"] for _, session in idle if selected.get(session["session_id"]) == "upload"]
+        if trimmed:
+            unlinked = await asyncio.to_thread(lambda: sum(_unlink(path) for path in trimmed))
+            self.files_unlinked_total += unlinked
+            self.uploads_trimmed_total += unlinked
+        removed: List[str] = []
+        for i in range(0, len(ids), self.batch_size):
+            batch, unlinked = await asyncio.to_thread(self._delete_batch, ids[i:i + self.batch_size], activity)
+            self.files_unlinked_total += unlinked
+            if self.on_delete is not None:
+                for session_id in batch:
+                    self.on_delete(session_id)
+            removed.extend(batch)
+
+        reasons = [selected[session_id] for session_id in removed]
+        self.expired_total += reasons.count("expired")
+        self.evicted_memory_total += reasons.count("memory")
+        self.evicted_disk_total += reasons.count("disk")
+        self.skipped_active_total += len(ids) - len(removed)
+
+        live_ids = set(activity) - set(removed)
+        self.orphans_removed_total += await asyncio.to_thread(self._remove_orphans, live_ids, now)
+
+        self.runs += 1
+        self.last_run_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self.last_run_ms = round((time.perf_counter() - start) * 1000, 2)
+        if removed:
+            logger.info(f"Janitor removed {len(removed)} sessions in {self.last_run_ms} ms")
+        return len(removed)
+
+    async def run_forever(self) -> None:
+        while True:
+            try:
+                await self.sweep()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Janitor sweep failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "runs": self.runs,
+            "errors": self.errors,
+            "last_run_at": self.last_run_at,
+            "last_run_ms": self.last_run_ms,
+            "expired": self.expired_total,
+            "evicted_memory": self.evicted_memory_total,
+            "evicted_disk": self.evicted_disk_total,
+            "files_unlinked": self.files_unlinked_total,
+            "orphans_removed": self.orphans_removed_total,
+            "skipped_active": self.skipped_active_total,
+            "uploads_trimmed": self.uploads_trimmed_total,
+        }
@@ -0,0 +1,191 @@
+import json
+import time
+import uuid
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+
+_COLUMNS = (
+    "job_id, kind, session_id, payload, status, result, error, attempts,"
+    " created_at, started_at, finished_at, worker"
+)
+
+
+def _timestamp(value: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(value).isoformat() if value else None
+
+
+class JobQueue:
+    """
+    Durable FIFO of LLM-bound work in a SQLite database (WAL mode), shared by
+    the API process and any number of worker processes.
+
+    A claimed job is leased to its worker for `lease_seconds` and the worker
+    renews the lease while it runs. If the worker dies, the lease runs out and
+    the job is handed to another worker, up to `max_attempts` claims in
+    total. Finished jobs keep their result until `purge` removes them.
+    """
+
+    def __init__(self, db_path: str, lease_seconds: float = 120.0, max_attempts: int = 3):
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+        # The database is created on first use, so constructing the queue touches no files
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " job_id TEXT PRIMARY KEY, kind TEXT NOT NULL, session_id TEXT,"
+            " payload TEXT NOT NULL, data BLOB, status TEXT NOT NULL,"
+            " result TEXT, error TEXT, attempts INTEGER NOT NULL DEFAULT 0,"
+            " created_at REAL NOT NULL, started_at REAL, finished_at REAL,"
+            " lease_until REAL, worker TEXT)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs(status, created_at)")
+        logger.info(f"Job queue at {self.db_path}")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if not self._schema_ready:
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            # isolation_level=None: transactions are managed explicitly
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            with self._schema_lock:
+                if not self._schema_ready:
+                    self._create_schema(conn)
+                    self._schema_ready = True
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _to_dict(row: tuple) -> Dict[str, Any]:
+        job_id, kind, session_id, payload, status, result, error, attempts, created, started, finished, worker = row
+        return {
+            "job_id": job_id,
+            "kind": kind,
+            "session_id": session_id,
+            "payload": json.loads(payload),
+            "status": status,
+            "result": json.loads(result) if result else None,
+            "error": error,
+            "attempts": attempts,
+            "created_at": _timestamp(created),
+            "started_at": _timestamp(started),
+            "finished_at": _timestamp(finished),
+            "worker": worker,
+        }
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], session_id: Optional[str] = None,
+                data: Optional[bytes] = None) -> Dict[str, Any]:
+        """Add a job; `data` carries binary input (e.g. an uploaded PDF) alongside the JSON payload."""
+        job_id = str(uuid.uuid4())
+        self._connection().execute(
+            "INSERT INTO jobs (job_id, kind, session_id, payload, data, status, created_at)"
+            " VALUES (?, ?, ?, ?, ?, 'queued', ?)",
+            (job_id, kind, session_id, json.dumps(payload), data, time.time()),
+        )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute(
+            f"SELECT {_COLUMNS} FROM jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+        return self._to_dict(row) if row else None
+
+    def data(self, job_id: str) -> Optional[bytes]:
+        row = self._connection().execute("SELECT data FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return row[0] if row else None
+
+    def claim(self, worker: str) -> Optional[Dict[str, Any]]:
+        """Lease the oldest queued job (or one whose worker's lease expired) to `worker`."""
+        conn = self._connection()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Jobs abandoned by a dead worker too many times are failed, not retried forever
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = 'worker lease expired too many times',"
+                " finished_at = ? WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+                (now, now, self.max_attempts),
+            )
+            row = conn.execute(
+                "SELECT job_id FROM jobs WHERE status = 'queued'"
+                " OR (status = 'running' AND lease_until < ?) ORDER BY created_at LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, started_at = ?,"
+                " lease_until = ?, worker = ? WHERE job_id = ?",
+                (now, now + self.lease_seconds, worker, row[0]),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        job = self.get(row[0])
+        job["data"] = self.data(row[0])
+        return job
+
+    def renew(self, job_id: str, worker: str) -> bool:
+        """Extend a running job's lease; False if the job is no longer leased to `worker`."""
+        cursor = self._connection().execute(
+            "UPDATE jobs SET lease_until = ? WHERE job_id = ? AND worker = ? AND status = 'running'",
+            (time.time() + self.lease_seconds, job_id, worker),
+        )
+        return cursor.rowcount == 1
+
+    def _finish(self, job_id: str, worker: str, status: str, result: Any = None, error: Optional[str] = None) -> None:
+        self._connection().execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, lease_until = NULL, data = NULL"
+            " WHERE job_id = ? AND worker = ? AND status = 'running'",
+            (status, json.dumps(result) if result is not None else None, error, time.time(), job_id, worker),
+        )
+
+    def requeue(self, job_id: str, worker: str) -> None:
+        """Hand an unfinished job back to the queue (e.g. its worker is shutting down)."""
+        self._connection().execute(
+            "UPDATE jobs SET status = 'queued', attempts = MAX(attempts - 1, 0), lease_until = NULL, worker = NULL"
+            " WHERE job_id = ? AND worker = ? AND status = 'running'",
+            (job_id, worker),
+        )
+
+    def complete(self, job_id: str, worker: str, result: Any) -> None:
+        self._finish(job_id, worker, "succeeded", result=result)
+
+    def fail(self, job_id: str, worker: str, error: str) -> None:
+        self._finish(job_id, worker, "failed", error=error)
+
+    def purge(self, older_than: float) -> int:
+        """Delete finished jobs older than `older_than` seconds; returns the number removed."""
+        cursor = self._connection().execute(
+            "DELETE FROM jobs WHERE status IN ('succeeded', 'failed') AND finished_at < ?",
+            (time.time() - older_than,),
+        )
+        return cursor.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        rows = self._connection().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {status: 0 for status in JOB_STATUSES}
+        counts.update({status: count for status, count in rows})
+        oldest = self._connection().execute(
+            "SELECT MIN(created_at) FROM jobs WHERE status = 'queued'"
+        ).fetchone()[0]
+        counts["oldest_queued_age_s"] = round(time.time() - oldest, 1) if oldest else 0.0
+        return counts
@@ -0,0 +1,127 @@
+import threading
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from sortedcontainers import SortedList
+
+
+class LeaderboardEntry(NamedTuple):
+    session_id: str
+    user_name: Optional[str]
+    current_step: str
+    total: int
+    max_total: int
+    completed_at: str
+
+    @property
+    def sort_key(self):
+        # Highest total first; earlier completion wins ties
+        return (-self.total, self.completed_at, self.session_id)
+
+
+def entry_for(session: Dict) -> Optional[LeaderboardEntry]:
+    """Leaderboard entry for a session with stored scores; None if it has not been scored."""
+    scores = session.get("scores")
+    if not scores:
+        return None
+    return LeaderboardEntry(
+        session_id=session["session_id"],
+        user_name=session.get("user_name"),
+        current_step=session.get("current_step", ""),
+        total=scores["total"],
+        max_total=scores["max_total"],
+        completed_at=scores.get("evaluated_at") or session.get("created_at", ""),
+    )
+
+
+class Leaderboard:
+    """
+    Scored sessions ordered by total score.
+
+    Entries live in one sorted list for all sessions plus one per
+    `current_step`, so a top-k query is a slice of an already ordered
+    container (O(log n + k)) rather than a scan of every session.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, LeaderboardEntry] = {}
+        self._all = SortedList(key=lambda entry: entry.sort_key)
+        self._by_step: Dict[str, SortedList] = {}
+        self._lock = threading.Lock()
+
+    def _step_index(self, step: str) -> SortedList:
+        index = self._by_step.get(step)
+        if index is None:
+            index = self._by_step[step] = SortedList(key=lambda entry: entry.sort_key)
+        return index
+
+    def _remove(self, session_id: str) -> None:
+        entry = self._entries.pop(session_id, None)
+        if entry is None:
+            return
+        self._all.remove(entry)
+        index = self._by_step[entry.current_step]
+        index.remove(entry)
+        if not index:
+            del self._by_step[entry.current_step]
+
+    def upsert(self, entry: LeaderboardEntry) -> None:
+        with self._lock:
+            self._remove(entry.session_id)
+            self._entries[entry.session_id] = entry
+            self._all.add(entry)
+            self._step_index(entry.current_step).add(entry)
+
+    def discard(self, session_id: str) -> None:
+        with self._lock:
+            self._remove(session_id)
+
+    def top(self, k: int, step: Optional[str] = None) -> List[LeaderboardEntry]:
+        """Best `k` entries, optionally restricted to sessions in `step`."""
+        with self._lock:
+            index = self._all if step is None else self._by_step.get(step)
+            if not index:
+                return []
+            return list(index.islice(0, k))
+
+    def replace(self, entries: Iterable[LeaderboardEntry]) -> int:
+        """
+        Swap in an index built from `entries`; the new containers are filled
+        before the lock is taken, so readers see the old or the new ranking,
+        never an empty or partial one. Returns the entry count.
+        """
+        by_id = {entry.session_id: entry for entry in entries}
+        all_entries = SortedList(by_id.values(), key=lambda entry: entry.sort_key)
+        by_step: Dict[str, SortedList] = {}
+        for entry in by_id.values():
+            by_step.setdefault(entry.current_step, []).append(entry)
+        by_step = {step: SortedList(items, key=lambda entry: entry.sort_key) for step, items in by_step.items()}
+        with self._lock:
+            self._entries, self._all, self._by_step = by_id, all_entries, by_step
+        return len(by_id)
+
+    def rebuild(self, sessions: Iterable[Dict]) -> int:
+        """Reload the index from all stored sessions (e.g. at startup); returns the entry count."""
+        return self.replace(entry for entry in map(entry_for, sessions) if entry is not None)
+
+    def sync(self, sessions: Iterable[Dict]) -> int:
+        """Apply changed sessions: index scored ones, drop ones without scores; returns the number applied."""
+        applied = 0
+        for session in sessions:
+            entry = entry_for(session)
+            if entry is not None:
+                self.upsert(entry)
+            else:
+                self.discard(session["session_id"])
+            applied += 1
+        return applied
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "by_step": {step: len(index) for step, index in self._by_step.items()},
+            }
+
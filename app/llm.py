@@ -0,0 +1,135 @@
+import os
+import logging
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+from app.metrics import registry, Gauge, llm_in_flight
+from app.llm_scheduler import LLMScheduler, Priority
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration ---
+# "groq" (default) or "fake" (offline deterministic model, see app/fake_llm.py)
+LLM_BACKEND = os.getenv("HIREBOT_LLM_BACKEND", "groq").lower()
+LLM_MODEL = os.getenv("HIREBOT_LLM_MODEL", "llama-3.3-70b-versatile")
+LLM_TEMPERATURE = float(os.getenv("HIREBOT_LLM_TEMPERATURE", "0.2"))
+# Global cap on outbound LLM calls in flight from this process
+LLM_MAX_CONCURRENCY = int(os.getenv("HIREBOT_LLM_MAX_CONCURRENCY", "64"))
+# Provider rate limits for this process (0 = unlimited) and retry policy
+LLM_RPM = float(os.getenv("HIREBOT_LLM_RPM", "0"))
+LLM_TPM = float(os.getenv("HIREBOT_LLM_TPM", "0"))
+LLM_MAX_RETRIES = int(os.getenv("HIREBOT_LLM_MAX_RETRIES", "4"))
+LLM_RETRY_BASE_DELAY = float(os.getenv("HIREBOT_LLM_RETRY_BASE_DELAY", "0.5"))
+LLM_RETRY_MAX_DELAY = float(os.getenv("HIREBOT_LLM_RETRY_MAX_DELAY", "30"))
+# Connection pool for the shared HTTP client (keep >= LLM_MAX_CONCURRENCY)
+LLM_MAX_CONNECTIONS = int(os.getenv("HIREBOT_LLM_MAX_CONNECTIONS", "100"))
+LLM_TIMEOUT = float(os.getenv("HIREBOT_LLM_TIMEOUT", "120"))
+
+
+def create_scheduler() -> LLMScheduler:
+    return LLMScheduler(
+        max_concurrency=LLM_MAX_CONCURRENCY,
+        rpm=LLM_RPM,
+        tpm=LLM_TPM,
+        max_retries=LLM_MAX_RETRIES,
+        base_delay=LLM_RETRY_BASE_DELAY,
+        max_delay=LLM_RETRY_MAX_DELAY,
+    )
+
+
+# Every outbound LLM call goes through this scheduler
+scheduler = create_scheduler()
+registry.register(Gauge(
+    "hirebot_llm_queue_depth", "LLM calls waiting for admission by priority.", ["priority"],
+    collect=lambda: {(priority,): depth for priority, depth in scheduler.queue_depth().items()},
+))
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide pooled HTTP client used for async LLM calls."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_MAX_CONNECTIONS,
+            ),
+            timeout=httpx.Timeout(LLM_TIMEOUT),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client (called on application shutdown)."""
+    global _http_client
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+    _http_client = None
+
+
+def build_fake_llm(model: str = LLM_MODEL):
+    """Offline model configured by HIREBOT_FAKE_LATENCY_MS / _LATENCY_SIGMA / _FAILURE_RATE / _SEED."""
+    from app.fake_llm import FakeChatModel
+    seed = os.getenv("HIREBOT_FAKE_SEED")
+    return FakeChatModel(
+        model=model,
+        latency_ms=float(os.getenv("HIREBOT_FAKE_LATENCY_MS", "200")),
+        latency_sigma=float(os.getenv("HIREBOT_FAKE_LATENCY_SIGMA", "0.5")),
+        failure_rate=float(os.getenv("HIREBOT_FAKE_FAILURE_RATE", "0")),
+        rate_limit_rate=float(os.getenv("HIREBOT_FAKE_429_RATE", "0")),
+        rpm_limit=int(os.getenv("HIREBOT_FAKE_RPM_LIMIT", "0")),
+        seed=int(seed) if seed else None,
+    )
+
+
+def build_llm(model: str = LLM_MODEL, temperature: float = LLM_TEMPERATURE):
+    """Create the chat model for the configured backend (ChatGroq on the pooled client, or the fake)."""
+    if LLM_BACKEND == "fake":
+        return build_fake_llm(model)
+    # Imported on first use: the Groq SDK is the slowest import in the app
+    from langchain_groq import ChatGroq
+    return ChatGroq(
+        model=model,
+        temperature=temperature,
+        http_async_client=get_http_client(),
+        # Retries are owned by the scheduler
+        max_retries=0,
+    )
+
+
+def settle_tokens(estimated: float, actual: float) -> None:
+    """Report a finished call's real token usage to the tokens/min limiter."""
+    scheduler.settle(estimated, actual)
+
+
+async def run_chain(chain: Any, inputs: Dict[str, Any], config: Optional[Dict[str, Any]] = None,
+                    priority: Priority = Priority.INTERACTIVE, tokens: float = 0) -> Any:
+    """Invoke a chain natively async through the scheduler (priority, rate limits, retries)."""
+    async def call():
+        llm_in_flight.inc()
+        try:
+            return await chain.ainvoke(inputs, config=config)
+        finally:
+            llm_in_flight.dec()
+
+    return await scheduler.run(call, priority=priority, tokens=tokens)
+
+
+async def stream_chain(chain: Any, inputs: Dict[str, Any], config: Optional[Dict[str, Any]] = None,
+                       priority: Priority = Priority.INTERACTIVE, tokens: float = 0) -> AsyncIterator[str]:
+    """Stream text chunks from a `prompt | llm` chain through the scheduler."""
+    async def call():
+        llm_in_flight.inc()
+        try:
+            async for chunk in chain.astream(inputs, config=config):
+                text = getattr(chunk, "content", chunk)
+                if text:
+                    yield text
+        finally:
+            llm_in_flight.dec()
+
+    async for text in scheduler.stream(call, priority=priority, tokens=tokens):
+        yield text
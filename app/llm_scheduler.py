@@ -0,0 +1,249 @@
+import time
+import heapq
+import random
+import asyncio
+import logging
+import itertools
+from collections import deque
+from enum import IntEnum
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from app.metrics import llm_queue_wait_seconds, llm_retries_total
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Scheduling class of an LLM call; lower values are served first."""
+    INTERACTIVE = 0  # a candidate is (or is about to be) waiting on the response
+    BATCH = 1        # bulk ingestion
+
+
+class TokenBucket:
+    """Refills `rate_per_minute` units per minute up to `capacity`; a rate of 0 means unlimited."""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def time_until(self, amount: float) -> float:
+        """Seconds until `amount` (capped at capacity) can be taken."""
+        if not self.rate:
+            return 0.0
+        self._refill()
+        needed = min(amount, self.capacity) - self.level
+        return max(0.0, needed / self.rate)
+
+    def consume(self, amount: float) -> None:
+        """Take `amount`; the level may go negative (debt) for oversized requests."""
+        if self.rate:
+            self._refill()
+            self.level -= amount
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Seconds from a Retry-After header (or attribute) on a provider error."""
+    value = getattr(error, "retry_after", None)
+    response = getattr(error, "response", None)
+    if value is None and response is not None:
+        value = getattr(response, "headers", {}).get("retry-after")
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def status_code(error: BaseException) -> Optional[int]:
+    code = getattr(error, "status_code", None)
+    if code is None:
+        code = getattr(getattr(error, "response", None), "status_code", None)
+    return code if isinstance(code, int) else None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Rate limits, server errors, timeouts and dropped connections are worth retrying."""
+    code = status_code(error)
+    if code is not None:
+        return code == 429 or code == 408 or code >= 500
+    return isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError)) or \
+        type(error).__name__ in {"APIConnectionError", "APITimeoutError", "ConnectTimeout",
+                                 "ReadTimeout", "RemoteProtocolError", "ConnectError"}
+
+
+class LLMScheduler:
+    """
+    Admission control for outbound LLM calls.
+
+    Calls wait in a priority queue (FIFO within a class) until a concurrency
+    slot is free and both the requests/min and tokens/min buckets can cover
+    them. Retryable failures back off exponentially with full jitter, or for
+    the provider's Retry-After; a 429 also pauses dispatch for everyone so the
+    queue does not keep hammering a saturated API.
+    """
+
+    def __init__(self, max_concurrency: int = 64, rpm: float = 0, tpm: float = 0,
+                 burst_seconds: float = 10.0, max_retries: int = 4,
+                 base_delay: float = 0.5, max_delay: float = 30.0):
+        self.max_concurrency = max_concurrency
+        self.requests = TokenBucket(rpm, max(1.0, rpm * burst_seconds / 60)) if rpm else TokenBucket(0)
+        self.tokens = TokenBucket(tpm, max(1.0, tpm * burst_seconds / 60)) if tpm else TokenBucket(0)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._queue: List[Tuple[int, int, float, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        self.waits: Dict[Priority, Deque[float]] = {p: deque(maxlen=1000) for p in Priority}
+        self.calls = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.failures = 0
+
+    # --- Admission ---
+
+    def _dispatch(self) -> None:
+        self._timer = None
+        while self._queue and self._in_flight < self.max_concurrency:
+            _, _, tokens, waiter = self._queue[0]
+            if waiter.done():  # cancelled while queued
+                heapq.heappop(self._queue)
+                continue
+            delay = max(
+                self._paused_until - time.monotonic(),
+                self.requests.time_until(1),
+                self.tokens.time_until(tokens),
+            )
+            if delay > 0:
+                self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+                return
+            heapq.heappop(self._queue)
+            self.requests.consume(1)
+            self.tokens.consume(tokens)
+            self._in_flight += 1
+            waiter.set_result(None)
+
+    async def _acquire(self, priority: Priority, tokens: float) -> None:
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (int(priority), next(self._seq), tokens, waiter))
+        start = time.monotonic()
+        if self._timer is None:
+            self._dispatch()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            raise
+        waited = time.monotonic() - start
+        self.waits[priority].append(waited)
+        llm_queue_wait_seconds.observe(waited, priority=priority.name.lower())
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+        if self._timer is None:
+            self._dispatch()
+
+    def settle(self, estimated: float, actual: float) -> None:
+        """Correct the tokens/min bucket once a call's real usage is known."""
+        if actual:
+            self.tokens.consume(actual - estimated)
+
+    # --- Retries ---
+
+    def _backoff(self, error: BaseException, attempt: int) -> Optional[float]:
+        """Delay before the next attempt, or None if the error should be raised."""
+        if attempt >= self.max_retries or not is_retryable(error):
+            return None
+        delay = retry_after(error)
+        if delay is None:
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if status_code(error) == 429:
+            self.rate_limited += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        self.retries += 1
+        llm_retries_total.inc(reason=str(status_code(error) or type(error).__name__))
+        logger.warning(f"LLM call failed ({type(error).__name__}); retry {attempt + 1} in {delay:.2f}s")
+        return delay
+
+    async def run(self, call: Callable[[], Awaitable[Any]], priority: Priority = Priority.INTERACTIVE,
+                  tokens: float = 0) -> Any:
+        """Run `call()` once admitted, retrying transient failures."""
+        self.calls += 1
+        attempt = 0
+        while True:
+            await self._acquire(priority, tokens)
+            try:
+                return await call()
+            except Exception as e:
+                delay = self._backoff(e, attempt)
+                if delay is None:
+                    self.failures += 1
+                    raise
+            finally:
+                self._release()
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def stream(self, call: Callable[[], AsyncIterator[Any]], priority: Priority = Priority.INTERACTIVE,
+                     tokens: float = 0) -> AsyncIterator[Any]:
+        """Stream from `call()` once admitted; retries only if nothing was yielded yet."""
+        self.calls += 1
+        attempt = 0
+        while True:
+            await self._acquire(priority, tokens)
+            started = False
+            try:
+                async for chunk in call():
+                    started = True
+                    yield chunk
+                return
+            except Exception as e:
+                delay = None if started else self._backoff(e, attempt)
+                if delay is None:
+                    self.failures += 1
+                    raise
+            finally:
+                self._release()
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    # --- Stats ---
+
+    def queue_depth(self) -> Dict[str, int]:
+        depth = {p.name.lower(): 0 for p in Priority}
+        for priority, _, _, waiter in self._queue:
+            if not waiter.done():
+                depth[Priority(priority).name.lower()] += 1
+        return depth
+
+    def stats(self) -> Dict[str, Any]:
+        def wait_summary(samples: Deque[float]) -> Dict[str, float]:
+            ordered = sorted(samples)
+            if not ordered:
+                return {"p50_ms": 0.0, "p95_ms": 0.0}
+            return {
+                "p50_ms": round(ordered[int(len(ordered) * 0.50)] * 1000, 1),
+                "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 1),
+            }
+
+        return {
+            "in_flight": self._in_flight,
+            "queue_depth": self.queue_depth(),
+            "wait": {p.name.lower(): wait_summary(self.waits[p]) for p in Priority},
+            "calls": self.calls,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "failures": self.failures,
+            "paused_for_s": round(max(0.0, self._paused_until - time.monotonic()), 2),
+        }
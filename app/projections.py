@@ -0,0 +1,62 @@
+import json
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def compact_json(value: Any) -> str:
+    """Minimal, deterministic JSON for prompt inputs (no whitespace, sorted keys)."""
+    return json.dumps(value, separators=(",", ":"), sort_keys=True, ensure_ascii=False)
+
+
+def _unique(values: Iterable[Any]) -> List[str]:
+    seen, result = set(), []
+    for value in values:
+        text = " ".join(str(value).split())
+        if text and text.lower() not in seen:
+            seen.add(text.lower())
+            result.append(text)
+    return result
+
+
+def _as_list(value: Any) -> List[Any]:
+    if not value:
+        return []
+    if isinstance(value, str):
+        return value.split(",")
+    return list(value)
+
+
+def tech_stack_projection(resume: Optional[Dict]) -> Dict[str, List[str]]:
+    """The parts of a parsed resume the question generator uses: skills, project tech and roles."""
+    resume = resume or {}
+    projects = [p for p in _as_list(resume.get("projects")) if isinstance(p, dict)]
+    jobs = [j for j in _as_list(resume.get("work_experience")) if isinstance(j, dict)]
+    projection = {
+        "skills": _unique(_as_list(resume.get("skills"))),
+        "project_tech": _unique(t for p in projects for t in _as_list(p.get("technologies"))),
+        "roles": _unique(j.get("job_title") for j in jobs if j.get("job_title")),
+    }
+    return {key: values for key, values in projection.items() if values}
+
+
+def tech_stack_prompt_input(resume: Optional[Dict]) -> str:
+    """`tech_stack` prompt variable for the questions stage."""
+    return compact_json(tech_stack_projection(resume))
+
+
+def resume_profile(resume: Optional[Dict]) -> Dict[str, Any]:
+    """Short candidate summary derived from a parsed resume (no LLM call): contact, latest role, tech stack."""
+    resume = resume or {}
+    jobs = [j for j in _as_list(resume.get("work_experience")) if isinstance(j, dict)]
+    education = [e for e in _as_list(resume.get("education")) if isinstance(e, dict)]
+    latest = jobs[0] if jobs else {}
+    profile = {
+        "name": resume.get("full_name") or "",
+        "email": resume.get("email") or "",
+        "location": resume.get("location") or "",
+        "current_role": " at ".join(v for v in (latest.get("job_title"), latest.get("company")) if v),
+        "education": " ".join(v for v in (education[0].get("degree"), education[0].get("field_of_study")) if v)
+        if education else "",
+        "positions": len(jobs),
+        **tech_stack_projection(resume),
+    }
+    return {key: value for key, value in profile.items() if value}
@@ -52,6 +52,75 @@ IMPORTANT:
 """
 
 
+resume_parser_with_questions_prompt = """
+You are a professional resume parser and technical interviewer.
+
+Given the resume content below, do two things in a single response:
+1. Extract all relevant candidate details into the "resume" object, using exactly the fields shown.
+2. Generate exactly {num} technical questions into the "questions" object, based only on the candidate's tech stack (skills, project technologies, work experience).
+
+The questions should be:
+- Simple and focused, requiring a short answer (e.g., one sentence or a brief explanation)
+- Designed to evaluate practical knowledge, understanding, or problem-solving skills
+- Neutral and unbiased, avoiding any reference to personal information (e.g., name, gender)
+
+Return strictly the following JSON format:
+
+{{
+  "resume": {{
+    "full_name": "",
+    "email": "",
+    "phone": "",
+    "linkedin": "",
+    "github": "",
+    "portfolio_website": "",
+    "location": "",
+    "education": [
+      {{
+        "degree": "",
+        "field_of_study": "",
+        "university": "",
+        "start_year": "",
+        "end_year": ""
+      }}
+    ],
+    "work_experience": [
+      {{
+        "job_title": "",
+        "company": "",
+        "location": "",
+        "start_date": "",
+        "end_date": "",
+        "description": ""
+      }}
+    ],
+    "skills": [],
+    "certifications": [],
+    "projects": [
+      {{
+        "name": "",
+        "description": "",
+        "technologies": []
+      }}
+    ],
+    "languages": []
+  }},
+  "questions": {{
+    "q1": "",
+    "q2": ""
+  }}
+}}
+
+Resume Content:
+{RESUME}
+
+IMPORTANT:
+- Return ONLY valid JSON (parsable by json.loads()).
+- "questions" keys are simple identifiers ('q1', 'q2', ...) and values are the question strings.
+- Do NOT add commentary, explanations, or extraneous fields.
+- If a resume field is missing, leave it as an empty string "" or empty array [] as appropriate.
+"""
+
 greet_prompt_template = """
 Welcome, {candidate_name}! My name is {agent_name}.
 I'm here to help {hr_manager_name} with the initial screening process.
@@ -91,41 +160,15 @@ Now generate the questions based on the provided tech stack.
 """
 
 
-Evaluator_prompt ='''
-You are an expert evaluator and a ruthless CTO assessing technical answers for AI/ML roles. Your task is to:
-1. Analyze the candidate's answers with brutal honesty
-2. Score them mercilessly (0-5) on:
-   - Technical Correctness (TC)
-   - Architectural Coherence (AC) 
-   - Depth & Completeness (DC)
-
-RULES:
-- Analysis must be concise and critical - highlight flaws without sugarcoating
-- Scoring uses 0-5 scale (0=completely wrong, 5=perfect)
-- Give 0 scores when deserved - no mercy for poor answers
-- Follow the exact output format below
-
-OUTPUT FORMAT:
-### Analysis
-Q1: [Constructive criticism or praise]
-Q2: [Constructive criticism or praise]
-...
-Summary: [Overall technical proficiency assessment]
-
-### Scores
-Q1: TC=<0-5>, AC=<0-5>, DC=<0-5>
-Q2: TC=<0-5>, AC=<0-5>, DC=<0-5>
-...
-Total Score: <sum> out of <max possible>
-
-BE RUTHLESS:
-- Wrong concepts get TC=0 immediately
-- Vague answers get DC=0
-- Incoherent solutions get AC=0
-- No bonus points - make them earn every point
-
-INPUT FORMAT (JSON):
-{qa}
+question_evaluator_prompt ='''
+Grade one AI/ML interview answer as a ruthless CTO. Score 0-5 each: TC (technical correctness), AC (architectural coherence), DC (depth & completeness).
+Wrong concept: TC=0. Vague: DC=0. Incoherent: AC=0. Empty: all 0.
+Reply in two lines:
+Analysis: <concise critique>
+Scores: TC=<0-5>, AC=<0-5>, DC=<0-5>
+
+QUESTION: {question}
+ANSWER: {answer}
 '''
 
 sendoff_node_prompt = """
@@ -0,0 +1,110 @@
+import re
+import time
+import random
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_skill(skill: str) -> str:
+    return re.sub(r"\s+", " ", str(skill)).strip().lower()
+
+
+def skill_signature(resume: Optional[Dict]) -> Optional[str]:
+    """Normalized, sorted, de-duplicated skill list from a parsed resume; None if empty."""
+    skills = (resume or {}).get("skills") or []
+    if isinstance(skills, str):
+        skills = skills.split(",")
+    normalized = sorted({normalize_skill(s) for s in skills if normalize_skill(s)})
+    return "|".join(normalized) or None
+
+
+class _Pool:
+    """Distinct questions for one signature, and how many fills in a row added none."""
+
+    def __init__(self):
+        self.created_at = time.time()
+        self.questions: List[str] = []
+        self.stalled_fills = 0
+
+
+class QuestionBank:
+    """
+    Pools of previously generated questions, shared across candidates with
+    the same skill signature.
+
+    A pool serves random samples once it holds at least `min_pool` distinct
+    questions; until then callers fall back to the LLM and `add` the result.
+    A pool that `max_stalled_fills` fills in a row left unchanged (a
+    deterministic model repeating itself) is closed: it serves what it has
+    rather than paying for more generations that add nothing. Pools expire
+    `ttl` seconds after creation and the least recently used signatures are
+    evicted beyond `max_signatures`.
+    """
+
+    def __init__(self, max_signatures: int = 1000, ttl: float = 7 * 24 * 60 * 60,
+                 min_pool: int = 9, max_pool: int = 50, max_stalled_fills: int = 2):
+        self.max_signatures = max_signatures
+        self.ttl = ttl
+        self.min_pool = min_pool
+        self.max_pool = max_pool
+        self.max_stalled_fills = max_stalled_fills
+        self._pools: "OrderedDict[str, _Pool]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _pool(self, signature: str) -> Optional[_Pool]:
+        pool = self._pools.get(signature)
+        if pool is None:
+            return None
+        if time.time() - pool.created_at > self.ttl:
+            del self._pools[signature]
+            return None
+        self._pools.move_to_end(signature)
+        return pool
+
+    def _ready(self, pool: _Pool, num: int) -> bool:
+        if len(pool.questions) < num:
+            return False
+        return len(pool.questions) >= self.min_pool or pool.stalled_fills >= self.max_stalled_fills
+
+    def sample(self, signature: str, num: int) -> Optional[Dict[str, str]]:
+        """Random `num` questions from the signature's pool, or None if it is still filling."""
+        with self._lock:
+            pool = self._pool(signature)
+            if pool is None or not self._ready(pool, num):
+                self.misses += 1
+                return None
+            self.hits += 1
+            chosen = random.sample(pool.questions, num)
+        return {f"q{i + 1}": question for i, question in enumerate(chosen)}
+
+    def add(self, signature: str, questions: Iterable[str]) -> None:
+        with self._lock:
+            pool = self._pool(signature)
+            if pool is None:
+                pool = self._pools[signature] = _Pool()
+            before = len(pool.questions)
+            for question in questions:
+                if question and question not in pool.questions and len(pool.questions) < self.max_pool:
+                    pool.questions.append(question)
+            pool.stalled_fills = pool.stalled_fills + 1 if len(pool.questions) == before else 0
+            while len(self._pools) > self.max_signatures:
+                self._pools.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "signatures": len(self._pools),
+            "pooled_questions": sum(len(pool.questions) for pool in self._pools.values()),
+            "stalled_pools": sum(
+                1 for pool in self._pools.values() if pool.stalled_fills >= self.max_stalled_fills
+            ),
+        }
@@ -0,0 +1,71 @@
+import os
+import logging
+from typing import TYPE_CHECKING, Iterator, Optional, Union
+
+if TYPE_CHECKING:
+    import pymupdf
+
+logger = logging.getLogger(__name__)
+
+# Extraction budget; text past it is never pulled out of the PDF
+RESUME_CHAR_BUDGET = int(os.getenv("HIREBOT_RESUME_CHAR_BUDGET", "24000"))
+# Optional token budget (0 disables), approximated as CHARS_PER_TOKEN chars per token
+RESUME_TOKEN_BUDGET = int(os.getenv("HIREBOT_RESUME_TOKEN_BUDGET", "0"))
+CHARS_PER_TOKEN = 4
+# Bump when extraction output changes (page coverage, block ordering), so cached parses are not reused
+EXTRACTOR_VERSION = "2"
+
+PdfSource = Union[str, bytes, bytearray, memoryview]
+
+
+def _open(source: PdfSource) -> "pymupdf.Document":
+    # Imported on first extraction, keeping it off the API's startup path
+    import pymupdf
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        # Opened in place; the upload buffer is not copied again
+        return pymupdf.open(stream=source, filetype="pdf")
+    return pymupdf.open(source)
+
+
+def iter_pages(source: PdfSource) -> Iterator[str]:
+    """Lazily yield the text of each page, with blocks in reading order."""
+    with _open(source) as doc:
+        for page in doc:
+            # Sorting text blocks top-to-bottom, left-to-right is much cheaper
+            # than get_text(sort=True), which sorts every line
+            blocks = [b for b in page.get_text("blocks") if b[6] == 0]
+            blocks.sort(key=lambda b: (round(b[1]), b[0]))
+            yield "".join(b[4] for b in blocks)
+
+
+def effective_char_budget(char_budget: Optional[int] = None, token_budget: Optional[int] = None) -> int:
+    """Character budget actually applied: the char budget, capped by the token budget if one is set."""
+    budget = RESUME_CHAR_BUDGET if char_budget is None else char_budget
+    token_budget = RESUME_TOKEN_BUDGET if token_budget is None else token_budget
+    if token_budget:
+        budget = min(budget, token_budget * CHARS_PER_TOKEN)
+    return budget
+
+
+def extract_resume_text(source: PdfSource, char_budget: Optional[int] = None,
+                        token_budget: Optional[int] = None) -> str:
+    """
+    Extract resume text page by page from a path or PDF bytes.
+
+    Stops as soon as the character budget (or token budget, if set) is used
+    up, so pages beyond it are never parsed.
+    """
+    budget = effective_char_budget(char_budget, token_budget)
+    parts = []
+    used = 0
+    pages = 0
+    for text in iter_pages(source):
+        pages += 1
+        remaining = budget - used
+        if len(text) >= remaining:
+            parts.append(text[:remaining])
+            logger.info(f"Resume text budget of {budget} chars reached at page {pages}")
+            break
+        parts.append(text)
+        used += len(text)
+    return "\n".join(parts)
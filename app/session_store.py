@@ -0,0 +1,331 @@
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import logging
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Session = Dict[str, Any]
+Mutator = Callable[[Session], Optional[Dict[str, Any]]]
+
+
+class SessionStore(ABC):
+    """
+    Storage interface for interview sessions.
+
+    Sessions are plain JSON-serializable dicts. Reads return copies, so any
+    change must go through `update`/`mutate`, which apply atomically per
+    session (safe across threads, and across processes for shared backends).
+
+    Async code uses the `a`-prefixed variants. Backends whose calls can block
+    (disk I/O, a lock held by another process) set `blocking`, and those
+    variants then run the call in a thread instead of on the event loop.
+    """
+
+    blocking = False
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[Session]:
+        """Return a copy of the session, or None."""
+
+    @abstractmethod
+    def create(self, session: Session) -> None:
+        """Insert a new session keyed by session["session_id"]."""
+
+    @abstractmethod
+    def mutate(self, session_id: str, fn: Mutator) -> Optional[Session]:
+        """
+        Atomically apply `fn` to the current session and merge the dict it
+        returns. Returns the updated session, or None if it does not exist.
+        """
+
+    @abstractmethod
+    def delete(self, session_id: str) -> Optional[Session]:
+        """Remove a session and return its last state, or None."""
+
+    @abstractmethod
+    def delete_if_idle(self, session_id: str, last_activity: float) -> Optional[Session]:
+        """
+        Remove a session only if it has not been updated since `last_activity`
+        (as reported by `list_idle`); returns its last state, or None if it is
+        gone or was touched in the meantime.
+        """
+
+    @abstractmethod
+    def list(self) -> List[Session]:
+        """Return copies of all sessions."""
+
+    @abstractmethod
+    def count(self) -> int:
+        """Number of stored sessions."""
+
+    @abstractmethod
+    def list_idle(self) -> List[Tuple[float, Session]]:
+        """Return (last_activity_epoch, session) pairs, least recently active first."""
+
+    @abstractmethod
+    def list_updated_since(self, since: float) -> List[Session]:
+        """Return copies of the sessions changed after `since` (epoch seconds)."""
+
+    def count_by_step(self) -> Dict[str, int]:
+        """Number of stored sessions per `current_step`."""
+        counts: Dict[str, int] = {}
+        for session in self.list():
+            step = session.get("current_step", "")
+            counts[step] = counts.get(step, 0) + 1
+        return counts
+
+    def update(self, session_id: str, **changes: Any) -> Optional[Session]:
+        """Atomically merge `changes` into a session."""
+        return self.mutate(session_id, lambda _: changes)
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+
+    # --- Async facade ---
+    async def _offload(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        if self.blocking:
+            return await asyncio.to_thread(fn, *args, **kwargs)
+        return fn(*args, **kwargs)
+
+    async def aget(self, session_id: str) -> Optional[Session]:
+        return await self._offload(self.get, session_id)
+
+    async def acreate(self, session: Session) -> None:
+        await self._offload(self.create, session)
+
+    async def amutate(self, session_id: str, fn: Mutator) -> Optional[Session]:
+        """`mutate` off the event loop; `fn` may then run in a worker thread."""
+        return await self._offload(self.mutate, session_id, fn)
+
+    async def aupdate(self, session_id: str, **changes: Any) -> Optional[Session]:
+        return await self._offload(self.update, session_id, **changes)
+
+    async def adelete(self, session_id: str) -> Optional[Session]:
+        return await self._offload(self.delete, session_id)
+
+    async def acontains(self, session_id: str) -> bool:
+        return await self._offload(self.__contains__, session_id)
+
+    async def alist(self) -> List[Session]:
+        return await self._offload(self.list)
+
+    async def acount(self) -> int:
+        return await self._offload(self.count)
+
+
+class InMemorySessionStore(SessionStore):
+    """Process-local store; sessions are lost on restart and not shared between workers."""
+
+    def __init__(self):
+        self._sessions: Dict[str, Session] = {}
+        self._touched: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Optional[Session]:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            return dict(session) if session is not None else None
+
+    def create(self, session: Session) -> None:
+        with self._lock:
+            self._sessions[session["session_id"]] = dict(session)
+            self._touched[session["session_id"]] = time.time()
+
+    def mutate(self, session_id: str, fn: Mutator) -> Optional[Session]:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            changes = fn(dict(session))
+            if changes:
+                session.update(changes)
+                self._touched[session_id] = time.time()
+            return dict(session)
+
+    def delete(self, session_id: str) -> Optional[Session]:
+        with self._lock:
+            self._touched.pop(session_id, None)
+            return self._sessions.pop(session_id, None)
+
+    def delete_if_idle(self, session_id: str, last_activity: float) -> Optional[Session]:
+        with self._lock:
+            if self._touched.get(session_id, float("inf")) > last_activity:
+                return None
+            self._touched.pop(session_id)
+            return self._sessions.pop(session_id)
+
+    def list(self) -> List[Session]:
+        with self._lock:
+            return [dict(session) for session in self._sessions.values()]
+
+    def count(self) -> int:
+        return len(self._sessions)
+
+    def count_by_step(self) -> Dict[str, int]:
+        with self._lock:
+            steps = [session.get("current_step", "") for session in self._sessions.values()]
+        return {step: steps.count(step) for step in set(steps)}
+
+    def list_idle(self) -> List[Tuple[float, Session]]:
+        with self._lock:
+            idle = [(self._touched[sid], dict(session)) for sid, session in self._sessions.items()]
+        idle.sort(key=lambda item: item[0])
+        return idle
+
+    def list_updated_since(self, since: float) -> List[Session]:
+        with self._lock:
+            return [dict(session) for sid, session in self._sessions.items() if self._touched[sid] > since]
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    SQLite-backed store in WAL mode, shareable by several worker processes.
+
+    Each thread gets its own connection. Updates run inside `BEGIN IMMEDIATE`
+    so read-modify-write cycles on a session are serialized across processes;
+    waiting on another process's write lock blocks, hence `blocking`.
+    """
+
+    blocking = True
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        # The database is created on first use, so constructing the store touches no files
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " session_id TEXT PRIMARY KEY, data TEXT NOT NULL,"
+            " current_step TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_updated_at ON sessions(updated_at)")
+        logger.info(f"SQLite session store at {self.db_path}")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if not self._schema_ready:
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            # isolation_level=None: transactions are managed explicitly
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            with self._schema_lock:
+                if not self._schema_ready:
+                    self._create_schema(conn)
+                    self._schema_ready = True
+            self._local.conn = conn
+        return conn
+
+    def get(self, session_id: str) -> Optional[Session]:
+        row = self._connection().execute(
+            "SELECT data FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def create(self, session: Session) -> None:
+        self._connection().execute(
+            "INSERT OR REPLACE INTO sessions (session_id, data, current_step, updated_at) VALUES (?, ?, ?, ?)",
+            (session["session_id"], json.dumps(session), session.get("current_step", ""), time.time()),
+        )
+
+    def mutate(self, session_id: str, fn: Mutator) -> Optional[Session]:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT data FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if row is None:
+                conn.execute("ROLLBACK")
+                return None
+            session = json.loads(row[0])
+            changes = fn(dict(session))
+            if changes:
+                session.update(changes)
+                conn.execute(
+                    "UPDATE sessions SET data = ?, current_step = ?, updated_at = ? WHERE session_id = ?",
+                    (json.dumps(session), session.get("current_step", ""), time.time(), session_id),
+                )
+            conn.execute("COMMIT")
+            return session
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def delete(self, session_id: str) -> Optional[Session]:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT data FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if row is not None:
+                conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return json.loads(row[0]) if row else None
+
+    def delete_if_idle(self, session_id: str, last_activity: float) -> Optional[Session]:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT data FROM sessions WHERE session_id = ? AND updated_at <= ?", (session_id, last_activity)
+            ).fetchone()
+            if row is not None:
+                conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return json.loads(row[0]) if row else None
+
+    def list(self) -> List[Session]:
+        rows = self._connection().execute("SELECT data FROM sessions").fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def count(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def count_by_step(self) -> Dict[str, int]:
+        rows = self._connection().execute(
+            "SELECT current_step, COUNT(*) FROM sessions GROUP BY current_step"
+        ).fetchall()
+        return {step: count for step, count in rows}
+
+    def list_idle(self) -> List[Tuple[float, Session]]:
+        rows = self._connection().execute(
+            "SELECT updated_at, data FROM sessions ORDER BY updated_at ASC"
+        ).fetchall()
+        return [(updated_at, json.loads(data)) for updated_at, data in rows]
+
+    def list_updated_since(self, since: float) -> List[Session]:
+        # Served by idx_sessions_updated_at; only the changed rows are decoded
+        rows = self._connection().execute(
+            "SELECT data FROM sessions WHERE updated_at > ?", (since,)
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+
+def create_session_store(backend: Optional[str] = None) -> SessionStore:
+    """Build the session store selected by HIREBOT_SESSION_STORE (memory | sqlite)."""
+    backend = (backend or os.getenv("HIREBOT_SESSION_STORE", "memory")).lower()
+    if backend == "memory":
+        return InMemorySessionStore()
+    if backend == "sqlite":
+        return SQLiteSessionStore(os.getenv("HIREBOT_SESSION_DB", "data/sessions.sqlite3"))
+    raise ValueError(f"Unknown session store backend: {backend}")
@@ -0,0 +1,86 @@
+import asyncio
+import logging
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterator, Optional
+
+from app.metrics import singleflight_calls_total
+
+logger = logging.getLogger(__name__)
+
+
+class FlightAbandoned(RuntimeError):
+    """The leader of a flight stopped (e.g. its client disconnected) without producing a result."""
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one in-flight unit of work.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it runs await the same task instead of repeating it. The task is
+    shielded, so a disconnecting caller does not cancel work others are
+    waiting on, and the key is released as soon as the task settles, so
+    later calls start fresh. Streaming endpoints that produce the result
+    themselves can `lead` a flight instead and resolve it when done.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._flights: Dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def _register(self, key: Hashable, future: asyncio.Future) -> None:
+        self._flights[key] = future
+
+        def _done(finished: asyncio.Future) -> None:
+            if self._flights.get(key) is finished:
+                del self._flights[key]
+            # Mark the outcome as retrieved even if every caller went away
+            if not finished.cancelled():
+                finished.exception()
+
+        future.add_done_callback(_done)
+
+    def running(self, key: Hashable) -> Optional[asyncio.Future]:
+        """The in-flight future for `key`, if any."""
+        return self._flights.get(key)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the result of `fn()`, sharing it with concurrent callers for the same key."""
+        self.calls += 1
+        while True:
+            future = self._flights.get(key)
+            if future is None:
+                future = asyncio.ensure_future(fn())
+                self._register(key, future)
+                singleflight_calls_total.inc(flight=self.name, outcome="leader")
+            else:
+                self.coalesced += 1
+                singleflight_calls_total.inc(flight=self.name, outcome="coalesced")
+                logger.info(f"Coalesced duplicate {self.name} call for {key}")
+            try:
+                return await asyncio.shield(future)
+            except FlightAbandoned:
+                # The streaming leader went away; run the work ourselves
+                continue
+
+    @contextmanager
+    def lead(self, key: Hashable) -> Iterator[asyncio.Future]:
+        """Register the caller as the producer for `key`; it must set the yielded future's result."""
+        self.calls += 1
+        future = asyncio.get_running_loop().create_future()
+        self._register(key, future)
+        singleflight_calls_total.inc(flight=self.name, outcome="leader")
+        try:
+            yield future
+        except BaseException as e:
+            if not future.done():
+                future.set_exception(e if isinstance(e, Exception) else FlightAbandoned(self.name))
+            raise
+        finally:
+            if not future.done():
+                future.set_exception(FlightAbandoned(self.name))
+
+    def stats(self) -> Dict[str, int]:
+        return {"in_flight": len(self._flights), "calls": self.calls, "coalesced": self.coalesced}
@@ -1,6 +1,7 @@
 import streamlit as st 
 import requests
 import json
+import hashlib
 from datetime import datetime
 import time
 import os
@@ -247,6 +248,38 @@ def make_api_request(method, endpoint, **kwargs):
     except requests.exceptions.RequestException as e:
         st.error(f"API Error: {str(e)}")
         return None
+
+def stream_api_events(method, endpoint, **kwargs):
+    """Yield (event, data) pairs from a server-sent-events endpoint."""
+    try:
+        url = f"{API_BASE_URL}{endpoint}"
+        with requests.request(method, url, stream=True, **kwargs) as response:
+            response.raise_for_status()
+            event = "message"
+            for line in response.iter_lines(decode_unicode=True):
+                if line.startswith("event:"):
+                    event = line[len("event:"):].strip()
+                elif line.startswith("data:"):
+                    yield event, json.loads(line[len("data:"):].strip())
+                    event = "message"
+    except requests.exceptions.RequestException as e:
+        st.error(f"API Error: {str(e)}")
+
+def stream_to_placeholder(method, endpoint, placeholder, render, **kwargs):
+    """Render streamed tokens into a placeholder and return the final payload."""
+    text = ""
+    for event, data in stream_api_events(method, endpoint, **kwargs):
+        if event == "token":
+            text += data["text"]
+            render(placeholder, text)
+        elif event == "done":
+            placeholder.empty()
+            return data
+        elif event == "error":
+            placeholder.empty()
+            st.error(f"API Error: {data['detail']}")
+            return None
+    return None
     
 def render_header():
     st.markdown("""
@@ -352,14 +385,16 @@ def resume_upload_page():
 
 def tech_questions_page():
     if not st.session_state.questions:
-        with st.spinner("Generating personalized assessments...."):
-            response = make_api_request(
-                "GET",
-                f'/sessions/{st.session_state.session_id}/tech-questions'
-            )
-
-            if response:
-                st.session_state.questions = response["questions"]
+        st.markdown("Generating personalized assessments....")
+        response = stream_to_placeholder(
+            "GET",
+            f'/sessions/{st.session_state.session_id}/tech-questions/stream',
+            st.empty(),
+            lambda placeholder, text: placeholder.code(text, language="json")
+        )
+
+        if response:
+            st.session_state.questions = response["questions"]
     
     if st.session_state.questions:
         st.markdown("<div class='card'>", unsafe_allow_html=True)
@@ -385,25 +420,32 @@ def tech_questions_page():
 
         if st.button("Submit all answers", key="Submit_answers"):
             if all(answer.strip() for answer in answers.values()):
-                with st.spinner("Evaluating answers ..."):
-                    response = make_api_request(
-                        "POST",
-                        f"/sessions/{st.session_state.session_id}/submit-answers",
-                        json={
-                            "session_id": st.session_state.session_id,
-                            "answers":answers
-                            }
-                    )
-
-                    if response:
-                        st.session_state.answers = answers
-                        st.session_state.evaluation = response['evaluation']
-                        st.session_state.completion_message = response["completion_message"]
-                        st.session_state.current_step = "evaluation"
-
-                        st.success("Answers Submitted successfully")
-                        time.sleep(1)
-                        st.rerun()
+                st.markdown("Evaluating answers ...")
+                # Same answers -> same key, so reruns and double clicks are evaluated once
+                idempotency_key = hashlib.sha256(
+                    json.dumps([st.session_state.session_id, answers], sort_keys=True).encode()
+                ).hexdigest()
+                response = stream_to_placeholder(
+                    "POST",
+                    f"/sessions/{st.session_state.session_id}/submit-answers/stream",
+                    st.empty(),
+                    lambda placeholder, text: placeholder.markdown(text),
+                    json={
+                        "session_id": st.session_state.session_id,
+                        "answers":answers
+                        },
+                    headers={"Idempotency-Key": idempotency_key}
+                )
+
+                if response:
+                    st.session_state.answers = answers
+                    st.session_state.evaluation = response['evaluation']
+                    st.session_state.completion_message = response["completion_message"]
+                    st.session_state.current_step = "evaluation"
+
+                    st.success("Answers Submitted successfully")
+                    time.sleep(1)
+                    st.rerun()
             else:
                 st.error("Please answer all the questions")
         
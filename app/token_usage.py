@@ -0,0 +1,95 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from app.resume_text import CHARS_PER_TOKEN
+
+
+class TokenUsageCallback(BaseCallbackHandler):
+    """
+    Collects prompt/completion token counts for one chain invocation.
+
+    Provider-reported `usage_metadata` is used when present; otherwise counts
+    are estimated from the rendered prompt and completion length.
+    """
+
+    def __init__(self):
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.estimated = False
+        self._prompt_chars = 0
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[Any]], **kwargs: Any) -> None:
+        self._prompt_chars += sum(len(str(m.content)) for batch in messages for m in batch)
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], **kwargs: Any) -> None:
+        self._prompt_chars += sum(len(p) for p in prompts)
+
+    def on_llm_end(self, response: Any, **kwargs: Any) -> None:
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None)
+                if usage:
+                    self.prompt_tokens += usage.get("input_tokens", 0)
+                    self.completion_tokens += usage.get("output_tokens", 0)
+                else:
+                    self.estimated = True
+                    self.prompt_tokens += -(-self._prompt_chars // CHARS_PER_TOKEN)
+                    self.completion_tokens += -(-len(generation.text) // CHARS_PER_TOKEN)
+                    self._prompt_chars = 0
+        self._prompt_chars = 0
+
+
+def _empty() -> Dict[str, int]:
+    return {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+
+
+class TokenLedger:
+    """Token totals per stage and per session (most recent `max_sessions` sessions)."""
+
+    def __init__(self, max_sessions: int = 10_000):
+        self.max_sessions = max_sessions
+        self._stages: Dict[str, Dict[str, int]] = {}
+        self._sessions: "OrderedDict[str, Dict[str, Dict[str, int]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, usage: TokenUsageCallback, session_id: Optional[str] = None) -> None:
+        with self._lock:
+            targets = [self._stages.setdefault(stage, _empty())]
+            if session_id:
+                per_session = self._sessions.setdefault(session_id, {})
+                self._sessions.move_to_end(session_id)
+                targets.append(per_session.setdefault(stage, _empty()))
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+            for totals in targets:
+                totals["calls"] += 1
+                totals["prompt_tokens"] += usage.prompt_tokens
+                totals["completion_tokens"] += usage.completion_tokens
+
+    def session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Per-stage and total token counts for a session; None if it made no LLM calls."""
+        with self._lock:
+            stages = self._sessions.get(session_id)
+            if stages is None:
+                return None
+            total = _empty()
+            for totals in stages.values():
+                for key, value in totals.items():
+                    total[key] += value
+            return {"stages": {stage: dict(totals) for stage, totals in stages.items()}, "total": total}
+
+    def discard(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def stage(self, stage: str) -> Dict[str, Any]:
+        with self._lock:
+            totals = dict(self._stages.get(stage) or _empty())
+        calls = totals["calls"]
+        totals["avg_prompt_tokens"] = round(totals["prompt_tokens"] / calls, 1) if calls else 0.0
+        totals["avg_completion_tokens"] = round(totals["completion_tokens"] / calls, 1) if calls else 0.0
+        return totals
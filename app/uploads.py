@@ -0,0 +1,81 @@
+import json
+from typing import Sequence
+
+from fastapi import HTTPException, UploadFile
+
+# Read size per chunk when draining an upload
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# Allowance for multipart boundaries and headers on top of the file itself
+MULTIPART_OVERHEAD = 16 * 1024
+
+
+def _too_large(max_bytes: int) -> str:
+    return f"File exceeds the {max_bytes // 1024} KB upload limit"
+
+
+async def read_upload(file: UploadFile, max_bytes: int, chunk_size: int = UPLOAD_CHUNK_SIZE) -> bytearray:
+    """
+    Read an upload chunk by chunk, failing with 413 as soon as it exceeds `max_bytes`.
+
+    Returns the read buffer itself rather than a `bytes` copy of it, so peak
+    memory per upload stays at one copy of the file.
+    """
+    buffer = bytearray()
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            return buffer
+        buffer += chunk
+        if len(buffer) > max_bytes:
+            raise HTTPException(status_code=413, detail=_too_large(max_bytes))
+
+
+class UploadSizeLimitMiddleware:
+    """
+    ASGI middleware capping the request body of upload routes (paths ending
+    with one of `path_suffixes`).
+
+    Starlette spools the whole multipart body before the endpoint runs, so the
+    cap is enforced here rather than left to `read_upload`: a request whose
+    Content-Length is over the limit is answered with 413 before any of its
+    body is received, and a body sent without one (chunked) is cut off with
+    413 as soon as the bytes streamed so far pass the limit.
+    """
+
+    def __init__(self, app, max_bytes: int, path_suffixes: Sequence[str]):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.path_suffixes = tuple(path_suffixes)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].endswith(self.path_suffixes):
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.max_bytes + MULTIPART_OVERHEAD
+        length = dict(scope["headers"]).get(b"content-length")
+        if length and length.isdigit() and int(length) > limit:
+            body = json.dumps({"detail": _too_large(self.max_bytes)}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 413,
+                "headers": [(b"content-type", b"application/json"),
+                            (b"content-length", str(len(body)).encode()),
+                            (b"connection", b"close")],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        received = 0
+
+        async def limited_receive():
+            # Raised while the form is being parsed; FastAPI turns it into the 413 response
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise HTTPException(status_code=413, detail=_too_large(self.max_bytes))
+            return message
+
+        await self.app(scope, limited_receive, send)
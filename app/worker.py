@@ -0,0 +1,191 @@
+"""
+Job workers: run queued LLM-bound jobs outside the request/response cycle.
+
+The API enqueues work into the shared SQLite job queue and answers 202;
+workers claim jobs, run the same pipeline code as the synchronous
+endpoints and store the result for `GET /jobs/{id}`. Workers can run
+inside the API process (HIREBOT_JOB_INLINE=1, the default) or as separate
+processes, which requires the sqlite session store:
+
+    HIREBOT_SESSION_STORE=sqlite HIREBOT_JOB_INLINE=0 uvicorn app.fastapi_main:app
+    HIREBOT_SESSION_STORE=sqlite python -m app.worker --processes 4 --concurrency 16
+"""
+import os
+import socket
+import signal
+import asyncio
+import logging
+import argparse
+import multiprocessing
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from fastapi import HTTPException
+
+from app.job_queue import JobQueue
+
+logger = logging.getLogger(__name__)
+
+# Runs one claimed job and returns its JSON-serializable result
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+def error_message(error: BaseException) -> str:
+    if isinstance(error, HTTPException):
+        return str(error.detail)
+    return f"{type(error).__name__}: {error}"
+
+
+class JobWorker:
+    """
+    Claims jobs from a `JobQueue` and runs up to `concurrency` of them at once
+    with the handler registered for their kind.
+
+    Leases are renewed while a job runs. On `stop`, no new jobs are claimed
+    and jobs still running after `grace` seconds are handed back to the queue.
+    """
+
+    def __init__(self, queue: JobQueue, handlers: Dict[str, JobHandler], concurrency: int = 16,
+                 poll_interval: float = 0.5, retention: float = 24 * 60 * 60,
+                 worker_id: Optional[str] = None):
+        self.queue = queue
+        self.handlers = handlers
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._running: Set[asyncio.Task] = set()
+        self.completed = 0
+        self.failed = 0
+
+    def notify(self) -> None:
+        """Wake the claim loop now instead of at the next poll (same-process enqueues)."""
+        self._wakeup.set()
+
+    def stop(self) -> None:
+        self._stopping = True
+        self._wakeup.set()
+
+    async def _heartbeat(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.queue.lease_seconds / 3)
+            if not await asyncio.to_thread(self.queue.renew, job_id, self.worker_id):
+                logger.warning(f"Lost the lease on job {job_id}")
+                return
+
+    async def _run(self, job: Dict[str, Any]) -> None:
+        job_id = job["job_id"]
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        try:
+            handler = self.handlers.get(job["kind"])
+            if handler is None:
+                raise ValueError(f"No handler for job kind '{job['kind']}'")
+            result = await handler(job)
+            await asyncio.to_thread(self.queue.complete, job_id, self.worker_id, result)
+            self.completed += 1
+            logger.info(f"Job {job_id} ({job['kind']}) succeeded")
+        except asyncio.CancelledError:
+            await asyncio.to_thread(self.queue.requeue, job_id, self.worker_id)
+            logger.info(f"Job {job_id} handed back to the queue")
+            raise
+        except Exception as e:
+            await asyncio.to_thread(self.queue.fail, job_id, self.worker_id, error_message(e))
+            self.failed += 1
+            logger.error(f"Job {job_id} ({job['kind']}) failed: {e}")
+        finally:
+            heartbeat.cancel()
+
+    async def run_forever(self, grace: float = 30.0) -> None:
+        slots = asyncio.Semaphore(self.concurrency)
+        last_purge = 0.0
+        loop = asyncio.get_running_loop()
+        logger.info(f"Job worker {self.worker_id} started (concurrency {self.concurrency})")
+        try:
+            while not self._stopping:
+                await slots.acquire()
+                if loop.time() - last_purge > 60:
+                    last_purge = loop.time()
+                    await asyncio.to_thread(self.queue.purge, self.retention)
+                self._wakeup.clear()
+                job = await asyncio.to_thread(self.queue.claim, self.worker_id) if not self._stopping else None
+                if job is None:
+                    slots.release()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                task = asyncio.create_task(self._run(job))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+                task.add_done_callback(lambda _: slots.release())
+        finally:
+            if self._running:
+                _, pending = await asyncio.wait(set(self._running), timeout=grace)
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+            logger.info(f"Job worker {self.worker_id} stopped")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "worker_id": self.worker_id,
+            "running": len(self._running),
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+
+async def _serve(concurrency: int) -> None:
+    # Imported here so the parent process stays light; each worker builds its own chains
+    from app import fastapi_main as api
+    from app.session_store import InMemorySessionStore
+
+    if isinstance(api.sessions, InMemorySessionStore):
+        raise SystemExit("Worker processes need a shared session store: set HIREBOT_SESSION_STORE=sqlite")
+    await asyncio.to_thread(api.chains.build)
+    worker = JobWorker(api.job_queue, api.job_handlers, concurrency=concurrency,
+                       poll_interval=api.JOB_POLL_INTERVAL, retention=api.JOB_RETENTION)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, worker.stop)
+    try:
+        async with api.engine_lifetime():
+            await worker.run_forever()
+    finally:
+        await api.close_http_client()
+
+
+def run_worker_process(concurrency: int) -> None:
+    asyncio.run(_serve(concurrency))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run Hirebot job worker processes.")
+    parser.add_argument("--processes", type=int, default=int(os.getenv("HIREBOT_JOB_PROCESSES", "2")))
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("HIREBOT_JOB_CONCURRENCY", "16")),
+                        help="Jobs in flight per process")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    workers = [
+        context.Process(target=run_worker_process, args=(args.concurrency,), name=f"hirebot-worker-{i}")
+        for i in range(args.processes)
+    ]
+    for process in workers:
+        process.start()
+
+    def forward(signum, frame):
+        for process in workers:
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    for process in workers:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark: thread-wrapped `chain.invoke` vs native `ainvoke` with a pooled client.
+
+Starts a local fake Groq-compatible server (fixed latency per completion) and
+drives N concurrent "sessions", each making the questions + evaluation calls.
+
+    python exp/bench_async_llm.py --sessions 500 --latency 0.5
+"""
+import os
+import sys
+import time
+import json
+import socket
+import asyncio
+import argparse
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import uvicorn
+from fastapi import FastAPI, Request
+
+FAKE_LATENCY = 0.5
+
+
+def build_fake_server() -> FastAPI:
+    fake = FastAPI()
+
+    @fake.post("/openai/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        await asyncio.sleep(FAKE_LATENCY)
+        content = json.dumps({"q1": "What is a Python generator?"})
+        return {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 100, "completion_tokens": 20, "total_tokens": 120},
+        }
+
+    return fake
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int) -> uvicorn.Server:
+    config = uvicorn.Config(build_fake_server(), host="127.0.0.1", port=port,
+                            log_level="warning", backlog=4096)
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+async def run_sessions(mode: str, sessions: int) -> float:
+    from langchain_core.prompts import PromptTemplate
+    from langchain_core.output_parsers import JsonOutputParser
+    from app import llm as llm_module
+
+    llm_module.scheduler = llm_module.create_scheduler()
+    llm = llm_module.build_llm()
+    parser = JsonOutputParser()
+    chain = PromptTemplate.from_template("Questions for {tech_stack}") | llm | parser
+
+    async def one_session(i: int):
+        for _ in range(2):
+            if mode == "thread":
+                await asyncio.to_thread(chain.invoke, {"tech_stack": f"python-{i}"})
+            else:
+                await llm_module.run_chain(chain, {"tech_stack": f"python-{i}"})
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_session(i) for i in range(sessions)))
+    elapsed = time.perf_counter() - start
+    await llm_module.close_http_client()
+    return elapsed
+
+
+def main():
+    global FAKE_LATENCY
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.5, help="fake LLM latency (s)")
+    args = parser.parse_args()
+    FAKE_LATENCY = args.latency
+
+    port = free_port()
+    os.environ.setdefault("GROQ_API_KEY", "fake-key")
+    os.environ["GROQ_API_BASE"] = f"http://127.0.0.1:{port}"
+    os.environ.setdefault("HIREBOT_LLM_MAX_CONCURRENCY", str(args.sessions))
+    os.environ.setdefault("HIREBOT_LLM_MAX_CONNECTIONS", str(args.sessions))
+    server = start_server(port)
+
+    print(f"{args.sessions} concurrent sessions, 2 LLM calls each, {args.latency}s fake latency")
+    for mode in ("thread", "async"):
+        elapsed = asyncio.run(run_sessions(mode, args.sessions))
+        print(f"{mode:>7}: {elapsed:7.2f}s  {args.sessions / elapsed:8.1f} sessions/s")
+
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
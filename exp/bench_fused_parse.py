@@ -0,0 +1,65 @@
+"""
+Benchmark: two-call (parse, then questions) vs fused single-call upload path.
+
+Runs both paths on the same resume against the configured models and
+reports wall-clock latency and prompt/completion tokens per path. The
+two-call path builds the questions input with the API's projection
+(`tech_stack_prompt_input`); tokens are counted by `TokenUsageCallback`,
+which falls back to the chars/token estimate when a provider reports no
+usage (e.g. HIREBOT_LLM_BACKEND=fake).
+
+    python exp/bench_fused_parse.py path/to/resume.pdf --runs 5
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.chains import ChainRegistry
+from app.projections import tech_stack_prompt_input
+from app.resume_text import extract_resume_text
+from app.token_usage import TokenUsageCallback
+
+
+async def two_call(chains: ChainRegistry, text: str, usage: TokenUsageCallback):
+    parsed = await chains.run("parse", {"RESUME": text}, usage=usage)
+    inputs = {"num": 3, "tech_stack": tech_stack_prompt_input(parsed)}
+    return await chains.run("questions", inputs, usage=usage)
+
+
+async def fused(chains: ChainRegistry, text: str, usage: TokenUsageCallback):
+    return await chains.run("fused", {"RESUME": text, "num": 3}, usage=usage)
+
+
+async def measure(name, fn, chains, text, runs):
+    latencies, prompt_tokens, completion_tokens = [], [], []
+    for _ in range(runs):
+        usage = TokenUsageCallback()
+        start = time.perf_counter()
+        await fn(chains, text, usage)
+        latencies.append(time.perf_counter() - start)
+        prompt_tokens.append(usage.prompt_tokens)
+        completion_tokens.append(usage.completion_tokens)
+    print(f"{name:>8}: p50={statistics.median(latencies) * 1000:8.0f}ms"
+          f"  prompt_tokens={statistics.fmean(prompt_tokens):7.0f}"
+          f"  completion_tokens={statistics.fmean(completion_tokens):6.0f}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("resume", help="PDF resume to parse")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    text = extract_resume_text(args.resume)
+    chains = ChainRegistry().build()
+    await measure("two-call", two_call, chains, text, args.runs)
+    await measure("fused", fused, chains, text, args.runs)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,125 @@
+"""
+Prompt-size comparison: original prompt inputs vs compact projections.
+
+Renders the questions and evaluation prompts for one candidate both ways
+and reports per-stage and per-session prompt tokens. "before" is the
+original serialization (full parsed resume as `tech_stack`, Python dict
+repr of all answers in one evaluator call); "after" is the projected
+`tech_stack` and the per-question evaluator. Token counts use the same
+chars/token estimate as the ledger when a provider reports no usage.
+
+    python exp/bench_prompt_tokens.py parsed_resume.json
+    python exp/bench_prompt_tokens.py resume.pdf      # parses once via the configured model
+"""
+import os
+import sys
+import json
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.prompts import PromptTemplate
+from langchain_core.output_parsers import JsonOutputParser
+
+from app.prompts import tech_questions, question_evaluator_prompt
+from app.projections import tech_stack_prompt_input
+from app.resume_text import CHARS_PER_TOKEN
+
+# The all-questions evaluator the per-question prompt replaced (no longer in app.prompts)
+ORIGINAL_EVALUATOR_PROMPT = '''
+You are an expert evaluator and a ruthless CTO assessing technical answers for AI/ML roles. Your task is to:
+1. Analyze the candidate's answers with brutal honesty
+2. Score them mercilessly (0-5) on:
+   - Technical Correctness (TC)
+   - Architectural Coherence (AC) 
+   - Depth & Completeness (DC)
+
+RULES:
+- Analysis must be concise and critical - highlight flaws without sugarcoating
+- Scoring uses 0-5 scale (0=completely wrong, 5=perfect)
+- Give 0 scores when deserved - no mercy for poor answers
+- Follow the exact output format below
+
+OUTPUT FORMAT:
+### Analysis
+Q1: [Constructive criticism or praise]
+Q2: [Constructive criticism or praise]
+...
+Summary: [Overall technical proficiency assessment]
+
+### Scores
+Q1: TC=<0-5>, AC=<0-5>, DC=<0-5>
+Q2: TC=<0-5>, AC=<0-5>, DC=<0-5>
+...
+Total Score: <sum> out of <max possible>
+
+BE RUTHLESS:
+- Wrong concepts get TC=0 immediately
+- Vague answers get DC=0
+- Incoherent solutions get AC=0
+- No bonus points - make them earn every point
+
+INPUT FORMAT (JSON):
+{qa}
+'''
+
+SAMPLE_QA = {
+    "What is the purpose of a Django model in a web application?":
+        "It maps a Python class to a database table and handles queries through the ORM.",
+    "How would you optimize a slow SQL query?":
+        "Look at the query plan, add indexes on filtered and joined columns, and avoid SELECT *.",
+    "Explain the use of Python's list comprehension with an example.":
+        "It builds a list from an iterable in one expression, e.g. [x * x for x in range(10)].",
+}
+
+
+def tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+async def load_resume(path: str) -> dict:
+    if path.lower().endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    from app.chains import ChainRegistry
+    from app.resume_text import extract_resume_text
+    return await ChainRegistry().build().run("parse", {"RESUME": extract_resume_text(path)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("resume", help="Parsed resume JSON, or a PDF to parse")
+    args = parser.parse_args()
+    resume = asyncio.run(load_resume(args.resume))
+
+    format_instructions = JsonOutputParser().get_format_instructions()
+    questions = PromptTemplate(
+        template=tech_questions,
+        input_variables=["num", "tech_stack"],
+        partial_variables={"format_instructions": format_instructions},
+    )
+    stages = {
+        "questions": (
+            tokens(questions.format(num=3, tech_stack=resume)),
+            tokens(questions.format(num=3, tech_stack=tech_stack_prompt_input(resume))),
+        ),
+        "evaluation": (
+            tokens(PromptTemplate.from_template(ORIGINAL_EVALUATOR_PROMPT).format(qa=SAMPLE_QA)),
+            sum(
+                tokens(PromptTemplate.from_template(question_evaluator_prompt).format(question=q, answer=a))
+                for q, a in SAMPLE_QA.items()
+            ),
+        ),
+    }
+
+    print(f"{'stage':>12} {'before':>8} {'after':>8} {'change':>8}")
+    for stage, (before, after) in stages.items():
+        print(f"{stage:>12} {before:8d} {after:8d} {(after - before) / before:+8.1%}")
+    before = sum(b for b, _ in stages.values())
+    after = sum(a for _, a in stages.values())
+    print(f"{'session':>12} {before:8d} {after:8d} {(after - before) / before:+8.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark: resume text extraction time and peak memory by page count.
+
+Compares the old PyMuPDFLoader path (loads every page, keeps only page 1)
+with the lazy, budgeted page iterator on synthetic 1-, 5- and 30-page PDFs.
+
+    python exp/bench_resume_extract.py --repeat 20
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pymupdf
+
+from app.resume_text import extract_resume_text
+
+LINE = "Senior engineer: built Python/Django services, tuned PostgreSQL, shipped Kubernetes deployments."
+
+
+def make_pdf(path: str, pages: int) -> None:
+    doc = pymupdf.open()
+    for number in range(pages):
+        page = doc.new_page()
+        y = 50
+        for i in range(45):
+            page.insert_text((40, y), f"p{number + 1} l{i + 1} {LINE}", fontsize=8)
+            y += 16
+    doc.save(path)
+
+
+def old_loader(path: str) -> str:
+    from langchain_community.document_loaders import PyMuPDFLoader
+    return PyMuPDFLoader(path).load()[0].page_content
+
+
+def measure(fn, path: str, repeat: int):
+    fn(path)  # warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        text = fn(path)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / repeat
+    tracemalloc.start()
+    fn(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed_ms, peak / 1024, len(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'pages':>5} {'method':<14} {'ms/doc':>8} {'peak KiB':>9} {'chars':>7}")
+        for pages in (1, 5, 30):
+            path = os.path.join(tmp, f"resume_{pages}.pdf")
+            make_pdf(path, pages)
+            for name, fn in (("loader[0]", old_loader), ("lazy+budget", extract_resume_text)):
+                ms, peak_kib, chars = measure(fn, path, args.repeat)
+                print(f"{pages:>5} {name:<14} {ms:8.2f} {peak_kib:9.1f} {chars:7d}")
+
+
+if __name__ == "__main__":
+    main()
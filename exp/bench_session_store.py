@@ -0,0 +1,80 @@
+"""
+Benchmark: read/write latency per SessionStore backend.
+
+    python exp/bench_session_store.py --sessions 2000 --ops 20000
+"""
+import os
+import sys
+import time
+import uuid
+import random
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.session_store import InMemorySessionStore, SQLiteSessionStore
+
+
+def make_session(session_id: str) -> dict:
+    return {
+        "session_id": session_id,
+        "user_name": "Bench Candidate",
+        "resume_path": None,
+        "resume_parsed": {"full_name": "Bench Candidate", "skills": ["Python", "SQL", "Docker"] * 5},
+        "tech_questions": None,
+        "answers": None,
+        "results": None,
+        "current_step": "tech_questions",
+        "created_at": "2025-01-01T00:00:00",
+    }
+
+
+def percentile(samples, pct):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+
+def report(name, op, samples):
+    us = [s * 1e6 for s in samples]
+    print(f"{name:>7} {op:<7} p50={percentile(us, 50):8.1f}us  p99={percentile(us, 99):8.1f}us"
+          f"  mean={statistics.fmean(us):8.1f}us")
+
+
+def bench(name, store, sessions, ops):
+    ids = [str(uuid.uuid4()) for _ in range(sessions)]
+    writes = []
+    for session_id in ids:
+        start = time.perf_counter()
+        store.create(make_session(session_id))
+        writes.append(time.perf_counter() - start)
+    report(name, "create", writes)
+
+    reads, updates = [], []
+    for _ in range(ops):
+        session_id = random.choice(ids)
+        start = time.perf_counter()
+        store.get(session_id)
+        reads.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        store.update(session_id, current_step="answering_questions", tech_questions={"q1": "?"})
+        updates.append(time.perf_counter() - start)
+    report(name, "get", reads)
+    report(name, "update", updates)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--ops", type=int, default=20000)
+    args = parser.parse_args()
+
+    bench("memory", InMemorySessionStore(), args.sessions, args.ops)
+    with tempfile.TemporaryDirectory() as tmp:
+        bench("sqlite", SQLiteSessionStore(os.path.join(tmp, "sessions.sqlite3")), args.sessions, args.ops)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Import-time regression check for the API module, measured in fresh interpreters.
+
+Fails (exit 1) if:
+- a module that must stay off the startup path (Groq SDK, LangGraph,
+  PyMuPDF) is imported;
+- importing leaves files behind (log file, upload/cache/data directories,
+  SQLite databases), which must only appear on first use;
+- the median import time exceeds `--max-ratio` times the median time to
+  import the framework it is built on (FastAPI + langchain_core prompts,
+  parsers and chat model base), measured the same way on the same machine.
+  The ratio was 1.12 when this check was written; it only grows when the
+  app adds eager work of its own.
+
+`--budget-ms` adds an absolute cap on top (off by default: milliseconds
+depend on the machine).
+
+    python exp/check_import_time.py --runs 5
+"""
+import os
+import sys
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imported on first use only (LLM build, first PDF extraction) or not at all
+DEFERRED_MODULES = ("langchain_groq", "groq", "langgraph", "pymupdf", "fitz")
+
+# What the API cannot avoid importing: its web framework and the LangChain pieces the chains are built from
+REFERENCE_IMPORTS = (
+    "from fastapi import FastAPI\n"
+    "from fastapi.responses import StreamingResponse\n"
+    "from langchain_core.prompts import PromptTemplate\n"
+    "from langchain_core.output_parsers import JsonOutputParser, StrOutputParser\n"
+    "from langchain_core.language_models import BaseChatModel\n"
+)
+
+
+def measure(statement: str) -> tuple:
+    """Wall-clock ms to run `statement` in a fresh interpreter, the modules it loaded and the files it left."""
+    env = dict(os.environ)
+    env.setdefault("GROQ_API_KEY", "import-time-check")
+    env["PYTHONPATH"] = ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    code = (
+        "import time\n"
+        "_start = time.perf_counter()\n"
+        f"{statement}\n"
+        "print((time.perf_counter() - _start) * 1000)\n"
+    )
+    with tempfile.TemporaryDirectory() as workdir:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=workdir, env=env, capture_output=True, text=True,
+        )
+        created = sorted(os.listdir(workdir))
+    if result.returncode != 0:
+        raise SystemExit(f"{statement!r} failed:\n{result.stderr[-2000:]}")
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and line.count("|") == 2:
+            modules.add(line.rsplit("|", 1)[1].strip())
+    return float(result.stdout.strip().splitlines()[-1]), modules, created
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", default="app.fastapi_main")
+    parser.add_argument("--max-ratio", type=float, default=float(os.getenv("HIREBOT_IMPORT_MAX_RATIO", "1.3")))
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("HIREBOT_IMPORT_BUDGET_MS", "0")))
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    samples, reference = [], []
+    loaded, created = set(), set()
+    for _ in range(args.runs):
+        # Interleaved, so both see the same machine load
+        reference.append(measure(REFERENCE_IMPORTS)[0])
+        elapsed, modules, files = measure(f"import {args.target}")
+        samples.append(elapsed)
+        loaded |= modules
+        created |= set(files)
+    median = statistics.median(samples)
+    baseline = statistics.median(reference)
+    ratio = median / baseline
+    eager = sorted({m.split(".")[0] for m in loaded if m.split(".")[0] in DEFERRED_MODULES})
+
+    print(f"import {args.target}: median {median:.0f} ms over {args.runs} runs "
+          f"(min {min(samples):.0f}, max {max(samples):.0f})")
+    print(f"framework imports: median {baseline:.0f} ms; ratio {ratio:.2f} (max {args.max_ratio:.2f})")
+    failed = False
+    if ratio > args.max_ratio:
+        print(f"FAIL: {ratio:.2f}x the framework import time (max {args.max_ratio:.2f}x)")
+        failed = True
+    if args.budget_ms and median > args.budget_ms:
+        print(f"FAIL: over the {args.budget_ms:.0f} ms budget by {median - args.budget_ms:.0f} ms")
+        failed = True
+    if eager:
+        print(f"FAIL: modules that should be deferred were imported: {', '.join(eager)}")
+        failed = True
+    if created:
+        print(f"FAIL: importing created files: {', '.join(sorted(created))}")
+        failed = True
+    if not failed:
+        print("OK")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
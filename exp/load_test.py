@@ -0,0 +1,190 @@
+"""
+End-to-end load test: start -> upload -> questions -> submit, many sessions at once.
+
+By default it launches a local uvicorn with the fake LLM backend in a temp
+directory (no Groq quota is used) and drives the full flow with
+`--concurrency` concurrent candidates. It reports completed sessions/sec
+and p50/p95/p99 latency per endpoint. Pass --url to target a server that
+is already running instead.
+
+    python exp/load_test.py --sessions 200 --concurrency 50 --latency-ms 300
+    python exp/load_test.py --url http://localhost:8000 --sessions 20
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from collections import defaultdict
+
+import httpx
+import pymupdf
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SKILLS = ["Python", "SQL", "Docker", "Kubernetes", "PyTorch", "FastAPI", "Redis", "AWS", "Go", "React"]
+
+
+def make_resume(index: int) -> bytes:
+    rng = random.Random(index)
+    doc = pymupdf.open()
+    page = doc.new_page()
+    lines = [
+        f"Candidate {index}",
+        f"candidate{index}@example.com",
+        "Skills: " + ", ".join(rng.sample(SKILLS, 4)),
+        "Experience: Software Engineer at Example Corp (2019 - Present)",
+    ]
+    for i, line in enumerate(lines):
+        page.insert_text((72, 72 + 18 * i), line)
+    return doc.tobytes()
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))] if ordered else 0.0
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.first_error = {}
+
+    async def call(self, name, request):
+        start = time.perf_counter()
+        try:
+            response = await request
+            response.raise_for_status()
+            return response
+        except Exception as e:
+            self.errors[name] += 1
+            detail = e.response.text[:200] if isinstance(e, httpx.HTTPStatusError) else repr(e)
+            self.first_error.setdefault(name, detail)
+            raise
+        finally:
+            self.latencies[name].append(time.perf_counter() - start)
+
+
+async def run_session(client, recorder, index, resume, stream):
+    start = await recorder.call("POST /sessions/start", client.post(
+        "/sessions/start", json={"user_name": f"Candidate {index}"}))
+    session_id = start.json()["session_id"]
+    await recorder.call("POST /upload-resume", client.post(
+        f"/sessions/{session_id}/upload-resume",
+        files={"file": (f"resume_{index}.pdf", resume, "application/pdf")}))
+
+    if stream:
+        response = await recorder.call("GET /tech-questions/stream", client.get(
+            f"/sessions/{session_id}/tech-questions/stream"))
+        done = [line for line in response.text.splitlines() if line.startswith("data:")][-1]
+        questions = json.loads(done[5:])["questions"]
+    else:
+        response = await recorder.call("GET /tech-questions", client.get(
+            f"/sessions/{session_id}/tech-questions"))
+        questions = response.json()["questions"]
+
+    answers = {key: f"A short answer about {text[:40]} with a concrete example." for key, text in questions.items()}
+    path = "submit-answers/stream" if stream else "submit-answers"
+    await recorder.call(f"POST /{path}", client.post(
+        f"/sessions/{session_id}/{path}", json={"session_id": session_id, "answers": answers}))
+
+
+async def drive(url, args):
+    recorder = Recorder()
+    resumes = [make_resume(i) for i in range(args.unique_resumes)]
+    semaphore = asyncio.Semaphore(args.concurrency)
+    completed = 0
+
+    async def one(index):
+        nonlocal completed
+        async with semaphore:
+            try:
+                await run_session(client, recorder, index, resumes[index % len(resumes)], args.stream)
+                completed += 1
+            except Exception:
+                pass
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=url, timeout=args.timeout, limits=limits) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(args.sessions)))
+        elapsed = time.perf_counter() - start
+
+    print(f"\n{completed}/{args.sessions} sessions completed in {elapsed:.1f}s "
+          f"-> {completed / elapsed:.2f} sessions/sec (concurrency {args.concurrency})\n")
+    print(f"{'endpoint':<32} {'count':>6} {'errors':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, samples in recorder.latencies.items():
+        print(f"{name:<32} {len(samples):6d} {recorder.errors[name]:6d} "
+              f"{percentile(samples, 0.50) * 1000:8.0f} {percentile(samples, 0.95) * 1000:8.0f} "
+              f"{percentile(samples, 0.99) * 1000:8.0f}")
+    for name, detail in recorder.first_error.items():
+        print(f"first error on {name}: {detail}")
+
+
+def start_server(args, workdir):
+    env = dict(os.environ)
+    env.update({
+        "PYTHONPATH": ROOT + os.pathsep + env.get("PYTHONPATH", ""),
+        "HIREBOT_LLM_BACKEND": "fake",
+        "HIREBOT_FAKE_LATENCY_MS": str(args.latency_ms),
+        "HIREBOT_FAKE_FAILURE_RATE": str(args.failure_rate),
+        "HIREBOT_RESUME_CACHE_DB": os.path.join(workdir, "resume_cache.sqlite3"),
+        "HIREBOT_EVAL_CACHE_DB": os.path.join(workdir, "evaluation_cache.sqlite3"),
+    })
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.fastapi_main:app", "--port", str(args.port),
+         "--log-level", "warning",
+         # Longer than any client-side idle gap, so pooled connections are never reused as they close
+         "--timeout-keep-alive", "120"],
+        cwd=workdir, env=env,
+        stdout=None if args.server_logs else subprocess.DEVNULL,
+        stderr=None if args.server_logs else subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{args.port}"
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise SystemExit("uvicorn exited during startup")
+        try:
+            if httpx.get(f"{url}/health", timeout=1).status_code == 200:
+                return server, url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    server.terminate()
+    raise SystemExit("uvicorn did not become healthy within 60s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Existing server to target (skips launching uvicorn)")
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--unique-resumes", type=int, default=50, help="Distinct PDFs (controls cache hits)")
+    parser.add_argument("--stream", action="store_true", help="Use the SSE endpoints")
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=200, help="Fake backend median latency")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fake backend failure rate")
+    parser.add_argument("--server-logs", action="store_true", help="Show the launched server's logs")
+    args = parser.parse_args()
+
+    if args.url:
+        asyncio.run(drive(args.url, args))
+        return
+    with tempfile.TemporaryDirectory() as workdir:
+        server, url = start_server(args, workdir)
+        try:
+            asyncio.run(drive(url, args))
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,12 @@
+import os
+import sys
+import time
+import signal
+import argparse
 import threading
 import subprocess
-import sys
+import urllib.request
+from typing import Dict, List, Optional
 
 
 def run_backend():
@@ -22,13 +28,195 @@ def run_frontend():
     ])
 
 
-if __name__ == '__main__':
+def run_dev():
     # Launch both backend and frontend concurrently
     backend_thread = threading.Thread(target=run_backend, daemon=True)
     frontend_thread = threading.Thread(target=run_frontend, daemon=True)
-    
+
     backend_thread.start()
     frontend_thread.start()
-    
+
     backend_thread.join()
     frontend_thread.join()
+
+
+# --- Production mode ---
+
+class Child:
+    """
+    A supervised subprocess, restarted with exponential backoff when it exits.
+
+    Each child leads its own process group so that processes it forked
+    (uvicorn workers) can be cleaned up with it.
+    """
+
+    def __init__(self, name: str, command: List[str], env: Dict[str, str]):
+        self.name = name
+        self.command = command
+        self.env = env
+        self.process: Optional[subprocess.Popen] = None
+        self.started_at = 0.0
+        self.restarts = 0
+        self.backoff = 1.0
+        self.next_start = 0.0
+
+    def start(self) -> None:
+        self.process = subprocess.Popen(self.command, env=self.env, start_new_session=True)
+        self.started_at = time.monotonic()
+        print(f"[main] started {self.name} (pid {self.process.pid})", flush=True)
+
+    def kill_group(self) -> None:
+        """SIGKILL whatever is left of the child's process group (e.g. orphaned workers still holding the port)."""
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+
+class Supervisor:
+    """
+    Keeps the backend and frontend running in production mode.
+
+    A child that exits is restarted after a delay that doubles on every crash
+    (1 s up to `max_backoff`) and resets once the child has stayed up for
+    `stable_after` seconds. SIGTERM/SIGINT stop all children: SIGTERM first,
+    SIGKILL after `grace` seconds.
+    """
+
+    def __init__(self, max_backoff: float = 30.0, stable_after: float = 60.0, grace: float = 30.0):
+        self.children: List[Child] = []
+        self.max_backoff = max_backoff
+        self.stable_after = stable_after
+        self.grace = grace
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self._on_signal)
+        signal.signal(signal.SIGINT, self._on_signal)
+
+    def _on_signal(self, signum, frame) -> None:
+        print(f"[main] received {signal.Signals(signum).name}, shutting down", flush=True)
+        self.stopping = True
+
+    def add(self, child: Child) -> Child:
+        self.children.append(child)
+        child.start()
+        return child
+
+    def poll(self) -> None:
+        """Restart children that exited, honouring their backoff."""
+        now = time.monotonic()
+        for child in self.children:
+            if child.process is None:
+                if now >= child.next_start:
+                    child.restarts += 1
+                    child.start()
+                continue
+            code = child.process.poll()
+            if code is None:
+                if now - child.started_at >= self.stable_after:
+                    child.backoff = 1.0
+                continue
+            print(f"[main] {child.name} exited with code {code}; restarting in {child.backoff:.0f}s", flush=True)
+            child.kill_group()
+            child.process = None
+            child.next_start = now + child.backoff
+            child.backoff = min(self.max_backoff, child.backoff * 2)
+
+    def sleep(self, seconds: float) -> None:
+        deadline = time.monotonic() + seconds
+        while not self.stopping and time.monotonic() < deadline:
+            time.sleep(min(0.2, deadline - time.monotonic()))
+
+    def run(self) -> None:
+        while not self.stopping:
+            self.poll()
+            self.sleep(0.5)
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        running = [c for c in self.children if c.process is not None and c.process.poll() is None]
+        for child in running:
+            child.process.terminate()
+        deadline = time.monotonic() + self.grace
+        for child in running:
+            try:
+                child.process.wait(timeout=max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                print(f"[main] {child.name} did not stop within {self.grace:.0f}s; killing it", flush=True)
+            child.kill_group()
+            child.process.wait()
+        print("[main] all processes stopped", flush=True)
+
+
+def wait_for_health(url: str, supervisor: Supervisor, timeout: float) -> bool:
+    """Poll the backend's /health until it answers 200 (restarting the backend if it crashes meanwhile)."""
+    deadline = time.monotonic() + timeout
+    while not supervisor.stopping and time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=2) as response:
+                if response.status == 200:
+                    return True
+        except OSError:
+            pass
+        supervisor.poll()
+        supervisor.sleep(0.5)
+    return False
+
+
+def run_prod(args):
+    env = dict(os.environ)
+    # Sessions, jobs and batch progress must be visible to every worker process (README: what stays per worker)
+    env.setdefault("HIREBOT_SESSION_STORE", "sqlite")
+    env.setdefault("HIREBOT_API_URL", f"http://127.0.0.1:{args.port}")
+    if env["HIREBOT_SESSION_STORE"] == "memory" and args.workers > 1:
+        sys.exit("[main] HIREBOT_SESSION_STORE=memory cannot be shared by several workers; use sqlite")
+
+    supervisor = Supervisor(grace=args.grace)
+    supervisor.add(Child("backend", [
+        sys.executable, '-m', 'uvicorn',
+        'app.fastapi_main:app',
+        '--host', args.host,
+        '--port', str(args.port),
+        '--workers', str(args.workers),
+        '--timeout-graceful-shutdown', str(int(args.grace)),
+        '--no-access-log',
+    ], env))
+
+    health_url = f"http://127.0.0.1:{args.port}/health"
+    if not wait_for_health(health_url, supervisor, args.health_timeout):
+        if not supervisor.stopping:
+            print(f"[main] backend not healthy after {args.health_timeout:.0f}s", flush=True)
+        supervisor.shutdown()
+        sys.exit(0 if supervisor.stopping else 1)
+    print(f"[main] backend healthy with {args.workers} workers", flush=True)
+
+    if not args.no_frontend:
+        supervisor.add(Child("frontend", [
+            sys.executable, '-m', 'streamlit',
+            'run', 'app/streamlit_app.py',
+            '--server.port', str(args.frontend_port),
+            '--server.headless', 'true',
+        ], env))
+    supervisor.run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Launch the Hirebot backend and frontend.")
+    parser.add_argument("--prod", action="store_true",
+                        help="Multi-worker backend without --reload, supervised, frontend started once healthy")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("HIREBOT_WORKERS", str(os.cpu_count() or 1))))
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--frontend-port", type=int, default=8501)
+    parser.add_argument("--no-frontend", action="store_true", help="Backend only (--prod)")
+    parser.add_argument("--health-timeout", type=float, default=120.0)
+    parser.add_argument("--grace", type=float, default=30.0, help="Seconds to wait for children on shutdown")
+    args = parser.parse_args()
+
+    if args.prod:
+        run_prod(args)
+    else:
+        run_dev()
+
+
+if __name__ == '__main__':
+    main()